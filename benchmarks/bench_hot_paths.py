@@ -0,0 +1,195 @@
+"""
+Module: bench_hot_paths.py
+
+Description:
+    Times the hot paths of the application against a synthetic database (see make_db.py): dice and stat
+    rolls, AC calculation, class lookup, password hashing and login, reading one character, loading a user's
+    characters, saving a character, and removing a user. Each benchmark runs for a fixed time budget and
+    reports per-call timings (min, median, mean, p95) in microseconds.
+
+    Results are written as JSON so runs can be compared between releases. With --compare, each benchmark's
+    median is checked against a previous run and the script exits with status 1 if any got slower by more
+    than the threshold.
+
+    The database is chosen by setting user_database.DB_PATH, the same file the TTRPG_DATABASE environment
+    variable selects for the app. The write benchmarks clean up after themselves: characters they add and users they create are removed
+    again, so the same database can be reused across runs.
+
+Dependencies:
+    - statistics, time: For the timings.
+    - json, platform, subprocess: For the results file and its metadata.
+    - auth.py, game_logic.py, user_database.py: The code being measured.
+    - make_db.py: To build the database when it doesn't exist yet.
+
+Usage:
+    python benchmarks/bench_hot_paths.py --size 100k --json results.json
+    python benchmarks/bench_hot_paths.py --size 100k --compare results.json [--threshold 0.10]
+"""
+import argparse
+import json
+import os, sys
+import platform
+import random
+import statistics
+import subprocess
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "../src"))
+sys.path.insert(0, BENCH_DIR)
+import auth
+import game_logic as gl
+import make_db
+import user_database as db
+
+DEFAULT_SECONDS = 1.0
+SLOW_SECONDS = 3.0  # For the deliberately slow password key derivation
+MIN_RUNS = 5
+
+def measure(function, seconds=DEFAULT_SECONDS, setup=None, min_runs=MIN_RUNS):
+    """Call function repeatedly for about seconds and return per-call timing statistics in microseconds."""
+    timings = []
+    deadline = time.perf_counter() + seconds
+    while len(timings) < min_runs or time.perf_counter() < deadline:
+        argument = setup() if setup else None
+        start = time.perf_counter()
+        function(argument) if setup else function()
+        timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+    return {
+        "runs": len(timings),
+        "min_us": timings[0],
+        "median_us": statistics.median(timings),
+        "mean_us": statistics.fmean(timings),
+        "p95_us": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def quiet(function):
+    """Run function with its prints (user_database logs every lookup) discarded."""
+    def call(*args):
+        stdout = sys.stdout
+        sys.stdout = open(os.devnull, "w")
+        try:
+            return function(*args)
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+    return call
+
+def run_benchmarks(seconds, only=None):
+    rng = random.Random(1)
+    character_count = db.count_characters()
+    users = db.get_all_users()
+    bench_user = next(user for user in users if user[1].startswith("bench_user_"))
+    fighter = gl.get_class_by_name("Fighter")
+    sample_character = db.get_character(1)
+    get_user = quiet(db.get_user)
+    login = quiet(auth.login)
+    _, password_hash, salt = get_user(bench_user[1])[1:4]
+
+    def load_characters():
+        user = gl.User(bench_user[0], bench_user[1], make_db.PASSWORD, bench_user[2])
+        user.load_characters()
+
+    added = []
+    def add_character():
+        added.append(db.add_character_to_db(bench_user[0], sample_character))
+
+    def make_user_to_remove():
+        # Setup, not timed: a fresh user with a few characters
+        username = f"bench_remove_{time.perf_counter_ns()}"
+        db.register_user(username, password_hash, salt, f"{username}@example.com")
+        user_id = get_user(username)[0]
+        db.add_characters_to_db(user_id, [sample_character] * 5)
+        return username
+
+    benchmarks = [
+        ("roll_stats", lambda: gl.roll_stats(fighter, rng), seconds, None),
+        ("roll_dice_logic", lambda: gl.roll_dice_logic(6, 8), seconds, None),
+        ("calculate_ac", lambda: gl.calculate_ac("Medium Armor", "Halfplate", 3, 2), seconds, None),
+        ("get_class_by_name", lambda: gl.get_class_by_name("Wizard"), seconds, None),
+        ("auth.hash_password", lambda: auth.hash_password(make_db.PASSWORD), SLOW_SECONDS, None),
+        ("auth.login", lambda: login(bench_user[1], make_db.PASSWORD), SLOW_SECONDS, None),
+        ("get_character", lambda: db.get_character(rng.randint(1, character_count)), seconds, None),
+        ("User.load_characters", load_characters, seconds, None),
+        ("add_character_to_db", add_character, seconds, None),
+        ("remove_user", quiet(db.remove_user), seconds, make_user_to_remove),
+    ]
+
+    results = {}
+    try:
+        for name, function, budget, setup in benchmarks:
+            if only and name not in only:
+                continue
+            results[name] = measure(function, budget, setup)
+            print(f"{name:<22} {results[name]['median_us']:>12.1f} us median  ({results[name]['runs']} runs)")
+    finally:
+        db.delete_characters(added)
+    return results, character_count
+
+def compare(results, baseline, threshold):
+    """Print median changes against a previous run. Returns the names that regressed beyond threshold."""
+    regressions = []
+    print(f"\n{'benchmark':<22} {'baseline':>12} {'now':>12} {'change':>8}")
+    for name, result in results.items():
+        previous = baseline["results"].get(name)
+        if not previous:
+            print(f"{name:<22} {'-':>12} {result['median_us']:>12.1f}      new")
+            continue
+        change = result["median_us"] / previous["median_us"] - 1
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{name:<22} {previous['median_us']:>12.1f} {result['median_us']:>12.1f} {change:>+8.1%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the application's hot paths.")
+    parser.add_argument("--size", type=str.lower, choices=sorted(make_db.SIZES), default="1k", help="Synthetic database to run against")
+    parser.add_argument("--db", default=None, help="Database file (default: database/bench_<size>.db, built if missing)")
+    parser.add_argument("--seconds", type=float, default=DEFAULT_SECONDS, help="Time budget per benchmark")
+    parser.add_argument("--only", nargs="*", default=None, help="Only run these benchmarks")
+    parser.add_argument("--json", default=None, help="Write the results to this file")
+    parser.add_argument("--compare", default=None, help="Compare against results from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Slowdown that counts as a regression (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    path = os.path.abspath(args.db or make_db.default_path(args.size))
+    if not os.path.exists(path):
+        print(f"Building {path}...")
+        make_db.build_database(path, make_db.SIZES[args.size])
+    db.DB_PATH = path
+
+    results, character_count = run_benchmarks(args.seconds, args.only)
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": os.path.basename(path),
+            "characters": character_count,
+            "seconds_per_benchmark": args.seconds,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w") as results_file:
+            json.dump(report, results_file, indent=2)
+        print(f"Results written to {args.json}")
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.threshold)
+        if regressions:
+            print(f"\nRegressions: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
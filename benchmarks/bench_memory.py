@@ -0,0 +1,98 @@
+"""
+Module: bench_memory.py
+
+Description:
+    Measures the memory footprint of Character and User objects. The "before" numbers come from
+    DictCharacter/DictUser, which keep the original per-instance __dict__ layout (ability scores as a list,
+    skills as a list of names, classes as a dict). The "after" numbers use the compact game_logic classes.
+
+Dependencies:
+    - tracemalloc: For measuring allocated memory.
+    - game_logic.py: For the compact Character and User classes.
+
+Usage:
+    python benchmarks/bench_memory.py [--count 20000]
+"""
+import argparse
+import os, sys
+import random
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../src"))
+import game_logic as gl
+
+# Original layouts, kept here for comparison
+class DictCharacter:
+    def __init__(self, character_data):
+        self.character_id = character_data.get('character_id')
+        self.name = character_data.get('name', '')
+        self.race = character_data.get('race', '')
+        self.background = character_data.get('background', '')
+        self.ability_scores = character_data.get('ability_scores', [])
+        self.skill_proficiencies = character_data.get('skill_proficiencies', [])
+        self.selected_feats = character_data.get('feats', [])
+        self.inventory = character_data.get('inventory', [])
+        self.is_jack_of_all_trades = character_data.get('is_jack_of_all_trades', False)
+        self.classes = character_data.get('classes', {})
+        self.subclasses = character_data.get('subclasses', {})
+
+class DictUser:
+    def __init__(self, user_id, username, password, email, is_admin=False):
+        self.user_id = user_id
+        self.username = username
+        self.password = password
+        self.encrypted_password = password
+        self.email = email
+        self.characters = []
+        self.is_admin = is_admin
+
+def make_character_data(rng, character_id):
+    """Character data shaped like rows read from the database: every string is a fresh object."""
+    skills = gl.get_skills()
+    class_name = rng.choice(gl.get_class_options())
+    return {
+        'character_id': character_id,
+        'name': f"Character {character_id}",
+        'race': "".join(rng.choice(gl.get_race_options())),
+        'background': "".join(rng.choice(gl.get_background_options())),
+        'ability_scores': [rng.randint(3, 18) for _ in range(6)],
+        'feats': ["".join("Ability Score Increase")],
+        'skill_proficiencies': ["".join(skill) for skill in rng.sample(skills, 4)],
+        'is_jack_of_all_trades': False,
+        'classes': {"".join(class_name): rng.randint(1, 20)},
+    }
+
+def measure(build, count):
+    """Return average bytes still allocated per object built by build(index), including the data it keeps."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [build(index) for index in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    # The list holding the objects isn't part of their footprint
+    allocated -= sys.getsizeof(objects)
+    return allocated / count
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-object memory of dict based and compact models.")
+    parser.add_argument("--count", type=int, default=20000)
+    args = parser.parse_args()
+
+    # Build the shared catalog and skill tables before measuring
+    make_character_data(random.Random(0), 0)
+    gl.get_skill_bits()
+
+    # Each object is built from freshly read data, like load_characters does
+    results = [
+        ("Character (before, __dict__)", measure(lambda i: DictCharacter(make_character_data(random.Random(i), i)), args.count)),
+        ("Character (after, __slots__)", measure(lambda i: gl.Character(make_character_data(random.Random(i), i)), args.count)),
+        ("User (before, __dict__)", measure(lambda i: DictUser(i, f"user{i}", "pw", f"user{i}@mail.com"), args.count)),
+        ("User (after, __slots__)", measure(lambda i: gl.User(i, f"user{i}", "pw", f"user{i}@mail.com"), args.count)),
+    ]
+    print(f"Average bytes per object over {args.count} objects")
+    for label, size in results:
+        print(f"  {label:<32}{size:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Module: make_db.py
+
+Description:
+    Builds synthetic databases for the benchmarks: 1k, 100k, or 1M characters (or any count) spread over
+    users with a fixed number of characters each. A pool of rules-valid characters is made once with the
+    headless generator and then repeated under new names and IDs, and every table is filled with batched
+    executemany inserts with journaling and syncing turned off, so even the 1M database builds in well under
+    a minute.
+
+    Every user's password is "bench", so the login benchmark can log in as any of them.
+
+Dependencies:
+    - sqlite3: For writing the database directly.
+    - auth.py: For the password hash shared by all users.
+    - generator.py: For the pool of valid characters.
+    - user_database.py: For the schema.
+
+Usage:
+    python benchmarks/make_db.py --size 100k [--out database/bench_100k.db] [--per-user 100]
+"""
+import argparse
+import os, sys
+import sqlite3
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../src"))
+import auth
+import generator
+import user_database as db
+
+SIZES = {"1k": 1000, "100k": 100000, "1m": 1000000}
+POOL_SIZE = 2000
+INSERT_BATCH = 20000
+PASSWORD = "bench"
+DATABASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../database")
+
+def default_path(size):
+    return os.path.join(DATABASE_DIR, f"bench_{size}.db")
+
+def character_rows(pool):
+    """Pre-join each pool character's columns once so the insert loop only adds IDs."""
+    rows = []
+    for character_data in pool:
+        subclasses = character_data.get('subclasses', {})
+        rows.append((
+            character_data['name'],
+            character_data['race'],
+            character_data['background'],
+            ','.join(map(str, character_data['ability_scores'])),
+            ','.join(character_data.get('feats', [])),
+            int(character_data.get('is_jack_of_all_trades', False)),
+            [(class_name, level, subclasses.get(class_name)) for class_name, level in character_data['classes'].items()],
+            list(character_data.get('skill_proficiencies', [])),
+        ))
+    return rows
+
+def build_database(path, character_count, per_user=100, seed=1):
+    """Create a new database at path with character_count characters. Returns the number of users."""
+    # user_database resolves relative paths against src/, so make the path mean the same file everywhere
+    path = os.path.abspath(path)
+    if os.path.exists(path):
+        os.remove(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    db.ensure_schema(path)
+    pool = character_rows(generator.generate_chunk(seed, min(POOL_SIZE, character_count)))
+    password_hash, salt = auth.hash_password(PASSWORD)
+    user_count = max(1, -(-character_count // per_user))
+
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.executemany("INSERT INTO Users (UserID, Username, PasswordHash, Salt, Email) VALUES (?, ?, ?, ?, ?)",
+                     [(user_id, f"bench_user_{user_id}", password_hash, salt, f"bench_user_{user_id}@example.com")
+                      for user_id in range(1, user_count + 1)])
+
+    for start in range(0, character_count, INSERT_BATCH):
+        characters, classes, skills = [], [], []
+        for character_id in range(start + 1, min(start + INSERT_BATCH, character_count) + 1):
+            name, race, background, scores, feats, jack, class_rows, skill_names = pool[character_id % len(pool)]
+            user_id = (character_id - 1) // per_user + 1
+            characters.append((character_id, user_id, f"{name} {character_id}", race, background, scores, feats, jack))
+            classes.extend((character_id, class_name, level, subclass) for class_name, level, subclass in class_rows)
+            skills.extend((character_id, skill) for skill in skill_names)
+        conn.executemany("INSERT INTO Characters (CharacterID, UserID, CharacterName, Race, Background, AbilityScores, Feats, IsJackOfAllTrades) "
+                         "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", characters)
+        conn.executemany("INSERT INTO Classes (CharacterID, ClassName, Level, Subclass) VALUES (?, ?, ?, ?)", classes)
+        conn.executemany("INSERT INTO CharacterSkills (CharacterID, SkillName) VALUES (?, ?)", skills)
+    conn.commit()
+    conn.close()
+    return user_count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a synthetic database for the benchmarks.")
+    parser.add_argument("--size", type=str.lower, choices=sorted(SIZES), default="1k", help="Number of characters")
+    parser.add_argument("--characters", type=int, default=None, help="Exact number of characters (overrides --size)")
+    parser.add_argument("--per-user", type=int, default=100, help="Characters per user")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default=None, help="Database file (default: database/bench_<size>.db)")
+    args = parser.parse_args(argv)
+
+    character_count = args.characters or SIZES[args.size]
+    path = args.out or default_path(args.size if args.characters is None else args.characters)
+    start = time.perf_counter()
+    user_count = build_database(path, character_count, args.per_user, args.seed)
+    print(f"Built {path}: {character_count} characters, {user_count} users, "
+          f"{os.path.getsize(path) / 1e6:.1f} MB in {time.perf_counter() - start:.1f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Module: admin_jobs.py
+
+Description:
+    Background jobs for admin bulk operations: deleting many users or characters, exporting characters, and
+    re-validating saved characters against the rules. Jobs are queued and run one at a time on a worker
+    thread, so the admin panel stays responsive. Each job works in batches (one transaction per batch of
+    deletes), reports its progress after every batch, and checks between batches whether it was cancelled.
+    Batches already committed stay committed when a job is cancelled.
+
+    Tk widgets must only be touched from the main thread, so the UI polls the jobs' progress instead of being
+    called back from the worker.
+
+Dependencies:
+    - threading, queue: For the worker thread and the job queue.
+    - json: For exports (one character per line).
+    - user_database.py: For reading and deleting users and characters.
+    - validator.py: For re-validation.
+
+Usage:
+    jobs = get_job_queue()
+    job = jobs.submit(delete_characters_job([12, 13, 14]))
+    job.progress() returns (done, total); job.cancel() stops it after the current batch.
+"""
+import json
+import queue
+import threading
+import time
+import user_database as db
+import validator
+
+BATCH_SIZE = 200
+MAX_REPORTED_VIOLATIONS = 100
+
+_job_queue = None
+
+class JobCancelled(Exception):
+    pass
+
+class Job:
+    def __init__(self, kind, description, run):
+        self.kind = kind
+        self.description = description
+        self.run = run
+        self.status = "queued"
+        self.done = 0
+        self.total = 0
+        self.result = None
+        self.error = None
+        self.started = None
+        self.finished = None
+        self.cancel_requested = threading.Event()
+
+    def cancel(self):
+        self.cancel_requested.set()
+
+    def progress(self):
+        return self.done, self.total
+
+    def advance(self, count):
+        """Record count more items done, then stop here if the job was cancelled."""
+        self.done += count
+        if self.cancel_requested.is_set():
+            raise JobCancelled()
+
+    @property
+    def finished_running(self):
+        return self.status in ("done", "cancelled", "failed")
+
+    def summary(self):
+        if self.status == "failed":
+            return f"{self.description}: failed ({self.error})"
+        if self.status == "done" and self.result:
+            return f"{self.description}: {self.result['message']}"
+        return f"{self.description}: {self.status} {self.done}/{self.total}"
+
+class JobQueue:
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.jobs = []
+        self.worker = threading.Thread(target=self.work, name="admin-jobs", daemon=True)
+        self.worker.start()
+
+    def submit(self, job):
+        self.jobs.append(job)
+        self.queue.put(job)
+        return job
+
+    def work(self):
+        while True:
+            job = self.queue.get()
+            if job.cancel_requested.is_set():
+                job.status = "cancelled"
+                continue
+            job.status = "running"
+            job.started = time.monotonic()
+            try:
+                job.result = job.run(job)
+                job.status = "done"
+            except JobCancelled:
+                job.status = "cancelled"
+            except Exception as e:
+                print(f"Admin job failed: {job.description}: {e!r}")
+                job.error = str(e)
+                job.status = "failed"
+            job.finished = time.monotonic()
+
+    def active(self):
+        return [job for job in self.jobs if not job.finished_running]
+
+    def clear_finished(self):
+        self.jobs = [job for job in self.jobs if not job.finished_running]
+
+def get_job_queue():
+    """Return the shared job queue, starting its worker the first time."""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue()
+    return _job_queue
+
+def batches(items, size=BATCH_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+# Jobs
+def delete_characters_job(character_ids, batch_size=BATCH_SIZE):
+    character_ids = list(character_ids)
+
+    def run(job):
+        job.total = len(character_ids)
+        deleted = 0
+        for batch in batches(character_ids, batch_size):
+            deleted += db.delete_characters(batch)
+            job.advance(len(batch))
+        return {"deleted": deleted, "message": f"deleted {deleted} characters"}
+    return Job("delete_characters", f"Delete {len(character_ids)} characters", run)
+
+def delete_users_job(user_ids, batch_size=BATCH_SIZE):
+    """Delete users with all their characters and rolls. Characters go in batches first, then the users."""
+    user_ids = list(user_ids)
+
+    def run(job):
+        character_ids = [character_id for user_id in user_ids for character_id in db.get_character_ids(user_id)]
+        job.total = len(character_ids) + len(user_ids)
+        characters_deleted = 0
+        for batch in batches(character_ids, batch_size):
+            characters_deleted += db.delete_characters(batch)
+            job.advance(len(batch))
+        users_deleted = 0
+        for batch in batches(user_ids, batch_size):
+            users_deleted += db.delete_users(batch)
+            job.advance(len(batch))
+        return {"users": users_deleted, "characters": characters_deleted,
+                "message": f"deleted {users_deleted} users and {characters_deleted} characters"}
+    return Job("delete_users", f"Delete {len(user_ids)} users", run)
+
+def export_characters_job(path, user_ids=None):
+    """Write characters (of the given users, or everyone's) to path as JSON Lines."""
+    user_ids = list(user_ids) if user_ids else None
+
+    def run(job):
+        job.total = sum(db.count_characters(user_id) for user_id in user_ids) if user_ids else db.count_characters()
+        exported = 0
+        with open(path, "w", encoding="utf-8") as export_file:
+            for user_id in user_ids or [None]:
+                pending = 0
+                for character_data in db.iter_characters(user_id=user_id):
+                    export_file.write(json.dumps(character_data) + "\n")
+                    exported += 1
+                    pending += 1
+                    if pending == BATCH_SIZE:
+                        job.advance(pending)
+                        pending = 0
+                job.advance(pending)
+        return {"exported": exported, "path": path, "message": f"exported {exported} characters to {path}"}
+    who = f"{len(user_ids)} users'" if user_ids else "all"
+    return Job("export", f"Export {who} characters", run)
+
+def revalidate_job(user_ids=None):
+    """Check saved characters against the current rules. Returns counts and the first invalid characters."""
+    user_ids = list(user_ids) if user_ids else None
+
+    def run(job):
+        job.total = sum(db.count_characters(user_id) for user_id in user_ids) if user_ids else db.count_characters()
+        rule_set = validator.get_rule_set()
+        checked = 0
+        invalid = []
+        invalid_count = 0
+        for user_id in user_ids or [None]:
+            pending = 0
+            # Malformed rows are yielded and reported as invalid instead of failing the whole job
+            for character_data in db.iter_characters(user_id=user_id, strict=False):
+                violations = rule_set.validate(character_data)
+                if violations:
+                    invalid_count += 1
+                    if len(invalid) < MAX_REPORTED_VIOLATIONS:
+                        invalid.append((character_data['character_id'], character_data['name'], violations))
+                checked += 1
+                pending += 1
+                if pending == BATCH_SIZE:
+                    job.advance(pending)
+                    pending = 0
+            job.advance(pending)
+        for character_id, name, violations in invalid:
+            print(f"Character {character_id} ({name}): {'; '.join(violations)}")
+        return {"checked": checked, "invalid": invalid_count, "characters": invalid,
+                "message": f"checked {checked} characters, {invalid_count} with rule violations"}
+    who = f"{len(user_ids)} users'" if user_ids else "all"
+    return Job("revalidate", f"Re-validate {who} characters", run)
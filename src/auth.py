@@ -10,9 +10,9 @@ Dependencies:
     - os: For generating a random salt.
     - hashlib: For hashing passwords.
     - user_database.py: For interacting with the user database.
-    - game_logic.py: For creating User objects.
+    - game_logic.py: For creating User objects. Loaded on first use, so showing the login screen doesn't
+      wait for the rules catalog.
     - re: For email validation.
-    - tkinter.messagebox: For displaying messages in the UI.
 
 Usage:
     - Call `register` with user details to create a new user account.
@@ -20,12 +20,11 @@ Usage:
 """
 import os
 import hashlib
-import user_database as db
-import game_logic as gl
-from game_logic import User
-import ui
+import hmac
 import re
-import tkinter.messagebox
+import user_database as db
+import startup
+gl = startup.lazy_import("game_logic")
 
 # Login / Register
 def hash_password(password, salt=None):
@@ -35,6 +34,11 @@ def hash_password(password, salt=None):
     pwdhash = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, 100000)
     return pwdhash.hex(), salt.hex()
 
+def check_password(password, stored_hash, stored_salt):
+    """Check a password against a stored hash and salt. Safe to run in a worker process."""
+    pwdhash, _ = hash_password(password, bytes.fromhex(stored_salt))
+    return hmac.compare_digest(pwdhash, stored_hash)
+
 def is_valid_email(email):
     """Check if the email is valid."""
     email_regex = r"(^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$)"
@@ -65,8 +69,7 @@ def login(username, password):
     user_data = db.get_user(username)
     if user_data:
         user_id, username, stored_hash, stored_salt, email, is_admin = user_data
-        pwdhash, _ = hash_password(password, bytes.fromhex(stored_salt))
-        if pwdhash == stored_hash:
+        if check_password(password, stored_hash, stored_salt):
             user_object = gl.User(user_id=user_id, username=username, password=password, email=email, is_admin=bool(is_admin))
             return True, user_object, "Login successful"
     return False, None, "Invalid username or password"
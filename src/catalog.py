@@ -0,0 +1,220 @@
+"""
+Module: catalog.py
+
+Description:
+    Compiles the rules content in catalog_source.py into a compact indexed file (database/catalog.bin) and
+    reads it back through a memory map. Only the index is touched when the catalog is opened; entries are
+    decoded the first time they are looked up and then kept, so startup and lookup cost stay flat no matter
+    how many races, feats, or backgrounds the catalog holds.
+
+File layout:
+    header    - magic, format version, section count
+    sections  - name, entry count, offset of the records, offset of the sorted key order
+    records   - per entry: key offset/length and value offset/length (in source order)
+    order     - record numbers sorted by key, used for binary search lookups
+    pool      - utf-8 keys and JSON encoded values
+
+Dependencies:
+    - mmap, struct, json: For reading and writing the compiled catalog.
+    - catalog_source.py: Only imported when the catalog needs to be (re)compiled.
+
+Usage:
+    Call get_catalog() and use keys(), get(), or section() to read entries. Run `python catalog.py` to
+    compile the catalog ahead of time.
+"""
+import os, sys
+import json
+import mmap
+import struct
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+CATALOG_PATH = os.path.join(MODULE_DIR, "../database/catalog.bin")
+SOURCE_PATH = os.path.join(MODULE_DIR, "catalog_source.py")
+
+CATALOG_MAGIC = b"RPGCATLG"
+CATALOG_VERSION = 1
+
+HEADER = struct.Struct("<8sHH")
+SECTION = struct.Struct("<16sIII")
+RECORD = struct.Struct("<IHII")
+ORDER = struct.Struct("<I")
+
+_catalog = None
+
+# Compiling
+def compile_catalog_bytes(sections):
+    """Compile a {section: {key: value}} mapping into the binary catalog format."""
+    section_names = list(sections)
+    records_start = HEADER.size + SECTION.size * len(section_names)
+
+    # Work out where each section's records and key order will live
+    layout = []
+    offset = records_start
+    for name in section_names:
+        count = len(sections[name])
+        layout.append((offset, offset + RECORD.size * count))
+        offset += (RECORD.size + ORDER.size) * count
+    pool_start = offset
+
+    pool = bytearray()
+    tables = bytearray()
+    section_table = bytearray()
+    for name, (records_offset, order_offset) in zip(section_names, layout):
+        entries = sections[name]
+        records = bytearray()
+        keys = []
+        for key, value in entries.items():
+            key_bytes = key.encode("utf-8")
+            value_bytes = json.dumps(value, separators=(",", ":")).encode("utf-8")
+            key_offset = pool_start + len(pool)
+            pool += key_bytes
+            value_offset = pool_start + len(pool)
+            pool += value_bytes
+            records += RECORD.pack(key_offset, len(key_bytes), value_offset, len(value_bytes))
+            keys.append(key_bytes)
+
+        order = sorted(range(len(keys)), key=lambda i: keys[i])
+        tables += records
+        tables += b"".join(ORDER.pack(i) for i in order)
+        section_table += SECTION.pack(name.encode("utf-8"), len(keys), records_offset, order_offset)
+
+    header = HEADER.pack(CATALOG_MAGIC, CATALOG_VERSION, len(section_names))
+    return bytes(header + section_table + tables + pool)
+
+def compile_catalog(path=CATALOG_PATH):
+    """Compile catalog_source.py into the catalog file at path and return the compiled bytes."""
+    import catalog_source
+    data = compile_catalog_bytes(catalog_source.SECTIONS)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    # Replace in one step so other processes never see a half written catalog
+    os.replace(temp_path, path)
+    print(f"Compiled rules catalog to {path}")
+    return data
+
+def is_catalog_stale(path=CATALOG_PATH):
+    """Check if the catalog is missing or older than its source."""
+    if not os.path.exists(path):
+        return True
+    # Frozen builds ship without the source, so the compiled catalog always wins
+    if not os.path.exists(SOURCE_PATH):
+        return False
+    return os.path.getmtime(SOURCE_PATH) > os.path.getmtime(path)
+
+# Reading
+class Catalog:
+    def __init__(self, buffer, source_file=None):
+        self._buffer = buffer
+        self._source_file = source_file
+        self._sections = {}
+        self._entries = {}
+        self._keys = {}
+        self._section_dicts = {}
+
+        magic, version, section_count = HEADER.unpack_from(buffer, 0)
+        if magic != CATALOG_MAGIC or version != CATALOG_VERSION:
+            raise ValueError("Unrecognized catalog format")
+        for index in range(section_count):
+            name, count, records_offset, order_offset = SECTION.unpack_from(buffer, HEADER.size + index * SECTION.size)
+            self._sections[name.rstrip(b"\0").decode("utf-8")] = (count, records_offset, order_offset)
+
+    @classmethod
+    def open(cls, path=CATALOG_PATH):
+        """Memory map a compiled catalog file."""
+        f = open(path, "rb")
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return cls(buffer, f)
+        except (ValueError, OSError, struct.error):
+            f.close()
+            raise
+
+    def close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        if self._source_file:
+            self._source_file.close()
+
+    def sections(self):
+        return list(self._sections)
+
+    def _record(self, records_offset, number):
+        return RECORD.unpack_from(self._buffer, records_offset + number * RECORD.size)
+
+    def _read_key(self, key_offset, key_length):
+        return self._buffer[key_offset:key_offset + key_length]
+
+    def keys(self, section):
+        """Return the entry names of a section in source order."""
+        if section not in self._keys:
+            count, records_offset, _ = self._sections[section]
+            keys = []
+            for number in range(count):
+                key_offset, key_length, _, _ = self._record(records_offset, number)
+                keys.append(self._read_key(key_offset, key_length).decode("utf-8"))
+            self._keys[section] = keys
+        return self._keys[section]
+
+    def _find(self, section, key):
+        """Binary search the sorted key order of a section. Returns the record or None."""
+        count, records_offset, order_offset = self._sections[section]
+        target = key.encode("utf-8")
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            number = ORDER.unpack_from(self._buffer, order_offset + middle * ORDER.size)[0]
+            record = self._record(records_offset, number)
+            current = self._read_key(record[0], record[1])
+            if current == target:
+                return record
+            if current < target:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def get(self, section, key, default=None):
+        """Look up one entry, decoding it the first time it is requested."""
+        cache_key = (section, key)
+        if cache_key in self._entries:
+            return self._entries[cache_key]
+        if section not in self._sections:
+            return default
+        record = self._find(section, key)
+        if record is None:
+            return default
+        _, _, value_offset, value_length = record
+        value = json.loads(self._buffer[value_offset:value_offset + value_length])
+        self._entries[cache_key] = value
+        return value
+
+    def section(self, section):
+        """Return a whole section as a {key: value} dict. Built once, callers should not modify it."""
+        if section not in self._section_dicts:
+            self._section_dicts[section] = {key: self.get(section, key) for key in self.keys(section)}
+        return self._section_dicts[section]
+
+def get_catalog():
+    """Return the shared catalog, compiling it first if it is missing or out of date."""
+    global _catalog
+    if _catalog is None:
+        try:
+            if is_catalog_stale():
+                compile_catalog()
+            try:
+                _catalog = Catalog.open()
+            except (ValueError, struct.error):
+                # Written by a different version of the application
+                compile_catalog()
+                _catalog = Catalog.open()
+        except (OSError, ValueError, struct.error) as e:
+            # Read-only installs or a damaged file still get a working catalog, just not a cached one
+            print("Could not use the compiled catalog:", e)
+            import catalog_source
+            _catalog = Catalog(compile_catalog_bytes(catalog_source.SECTIONS))
+    return _catalog
+
+if __name__ == "__main__":
+    compile_catalog(sys.argv[1] if len(sys.argv) > 1 else CATALOG_PATH)
@@ -0,0 +1,165 @@
+"""
+Module: catalog_source.py
+
+Description:
+    Source content for the rules catalog. Races, classes, subclasses, backgrounds, feats, skills, and armor
+    are listed here and compiled by catalog.py into database/catalog.bin. The application never imports this
+    module at runtime; it is only read when the compiled catalog is missing or older than this file.
+
+Dependencies:
+    None.
+
+Usage:
+    Edit the lists below and run `python catalog.py` (or simply start the application) to rebuild the catalog.
+    Each section maps an entry name to its value. Sections keep the order they are written in here.
+"""
+
+# Races
+# Test Sample
+RACES = {race: None for race in sorted([
+    "Half-Orc", "Human", "Tiefling"
+])}
+# Actual Result
+"""RACES = {race: None for race in sorted([
+    "Dragonborn", "Drow", "Dwarf", "Elf", "Gnome", "Half-Elf", "Halfling", "Half-Orc", "Human", "Tiefling",
+    "Aarakocra", "Aasimar", "Air Genasi", "Bugbear", "Centaur", "Changeling", "Deep Gnome", "Duergar", "Earth Genasi",
+    "Eladrin", "Fairy", "Firbolg", "Fire Genasi", "Githyanki", "Githzerai", "Goblin", "Goliath", "Harengon",
+    "Hobgoblin", "Kenku", "Kobold", "Lizardfolk", "Minotaur", "Orc", "Satyr", "Sea Elf", "Shadar-kai", "Shifter",
+    "Tabaxi", "Tortle", "Triton", "Water Genasi", "Yuan-ti", "Kender", "Astral Elf", "Autognome", "Giff", "Hadozee",
+    "Plasmoid", "Thri-kreen", "Owlin", "Lineages", "Leonin", "Satyr (Legacy)", "Changling (Legacy)", "Kalashtar",
+    "Shifter (Legacy)", "Warforged", "Verdan", "Centaur (Legacy)", "Loxodon", "Minotaur (Legacy)", "Simic Hybrid",
+    "Vedalken", "Feral Tiefling", "Tortle (Legacy)", "Locathah", "Grung", "Gith (Legacy)", "Aesimar (Legacy)",
+    "Bugbear (Legacy)", "Firbolg (Legacy)", "Goblin (Legacy)", "Hobgoblin (Legacy)", "Kenku (Legacy)",
+    "Kobold (Legacy)", "Lizardfolk (Legacy)", "Orc (Legacy)", "Tabaxi (Legacy)", "Triton (Legacy)",
+    "Yuan-ti Pureblood (Legacy)", "Aarakocra (Legacy)", "Genasi (Legasy)", "Goliath (Legacy)", "Wood Elf"
+])}"""
+
+# Classes
+# Test Sample
+CLASSES = {dnd_class: None for dnd_class in sorted([
+    "Barbarian", "Bard", "Rogue"
+])}
+# Actual Result
+"""CLASSES = {dnd_class: None for dnd_class in sorted([
+    "Artificer", "Barbarian", "Bard", "Blood Hunter", "Cleric", "Druid", "Fighter", "Monk", "Paladin", "Ranger", "Rogue", "Sorcerer",
+    "Warlock", "Wizard"
+])}"""
+
+# Subclasses
+# Test list
+SUBCLASSES = {
+    "Barbarian": ["Path of the Totem Warrior", "Path of Wild Magic"],
+    "Bard": ["College of Lore", "College of Swords"],
+    "Rogue": ["Assassin", "Thief"]
+}
+# Actual list
+"""SUBCLASSES = {
+    "Artificer": ["Alechemist", "Artillerist", "Battle Smith", "Armorer"],
+    "Barbarian": ["Path of the Totem Warrior", "Path of the Battlerager", "Path of the Ancestral Guardian",
+    "Path of the Storm Herald", "Path of the Zealot", "Path of the Beast", "Path of Wild Magic"],
+    "Bard": ["College of Lore", "College of Valor", "College of Glamour", "College of Swords", "College of Whispers",
+    "College of Eloquence", "College of Creation"],
+    "Blood Hunter": ["Order of the Ghostslayer", "Order of the Lycan", "Order of the Mutant", "Order of the Profane Soul"],
+    "Cleric": ["Knowledge Domain", "Life Domain", "Light Domain", "Nature Domain", "Tempest Domain", "Trickery Domain",
+    "War Domain", "Death Domain", "Arcana Domain", "Solidarity Domain", "Strength Domain", "Ambition Domain", "Zeal Domain",
+    "Grave Domain", "Order Domain", "Peace Domain", "Twilight Domain", "Inevitability Domain"],
+    "Druid": ["Circle of the Land", "Circle of the Moon", "Circle of the Shepherd", "Circle of Spores", "Circle of Stars",
+    "Circle of Wildfire", "Circle of Whispered Harmony"],
+    "Fighter": ["Champion", "Battle Master", "Eldritch Knight", "Purple Dragon Knight", "Arcane Archer", "Cavalier",
+    "Samurai", "Echo Knight", "Psi Warrior", "Rune Knight"],
+    "Monk": ["Way of the Open Hand", "Way of Shadow", "Way of the Four Elements", "Way of the Long Death",
+    "Way of the Sun Soul", "Way of the Drunken Master", "Way of the Kensei", "Way of Mercy", "Way of the Astral Self"],
+    "Paladin": ["Oath of Devotion", "Oath of the Ancients", "Oath of Vengeance", "Oathbreaker", "Oath of the Crown",
+    "Oath of Conquest", "Oath of Redemption", "Oath of Glory", "Oath of the Watchers"],
+    "Ranger": ["Hunter", "Beast Master", "Gloom Stalker", "Horizon Walker", "Monster Slayer", "Fey Wanderer", "Swarmkeeper"],
+    "Rogue": ["Thief", "Assassin", "Arcane Trickster", "Mastermind", "Swashbuckler", "Inquisitive", "Scout", "Phantom",
+    "Soulknife"],
+    "Sorcerer": ["Draconic Bloodline", "Wild Magic", "Storm Sorcery", "Pyromancer", "Divine Soul", "Shadow Magic",
+    "Aberrant Mind", "Clockwork Soul", "Lunar Sorcery"],
+    "Warlock": ["The Archfey", "The Great Old One", "The Undying", "The Celestial", "The Hexblade", "The Fathomless",
+    "The Genie"],
+    "Wizard": ["School of Abjuration", "School of Conjuration", "School of Divination", "School of Enchantment",
+    "School of Evocation", "School of Illusion", "School of Necromancy", "School of Transmutation", "Bladesinging",
+    "War Magic", "Chronurgy Magic", "Graviturgy", "Order of Scribes"]
+}"""
+
+# Backgrounds (from sample)
+BACKGROUNDS = {
+    "Acolyte": "You are devote to a specific god or pantheon. As an acolyte you are respected by others of your faith.\n\nSkill Proficiencies: Insight, Religion.\n\nLanguages: 2 of your choice.\n\nEquipment: A holy symbol, a prayer book/wheel, 5 sticks of incense, vestments, a set of common clothes, and a puch of 15 gold peices.",
+    "Soldier": "War and battle is what you know best. You've trained your whole life and joined a military service when you came of age.\n\nSkill Proficiencies: Athletics, Intimidation.\n\nTool Proficiencies: One type of gaming set, vehicles (land).\n\nEquipment: Insignia of rank, trophy from a fallen foe, set of bone dice/cards, common clothes, and a puch of 10gp",
+    "Spy": "A criminal or perhaps a government official. What ever brought you to the path of stealth and deception has toned your skills of trickery.\n\nSkill Proficiencies: Deception, Stealth.\n\nTool Proficiencies: One type of gaming set, thieves' tools.\n\nEquipment: A crowbar, set of dark common clothes and hood, puch containing 15 gold."
+}
+# Actual Result
+"""BACKGROUNDS = {background: None for background in sorted([
+    "Acolyte", "Anthropologist", "Archaeologist", "Adopted", "Black Fist Double Agent", "Caravan Specialist", "Charlatan",
+    "City Watch", "Clan Crafter", "Cloistered Scholar", "Cormanthor Refugee", "Courtier", "Criminal", "Dissenter",
+    "Dragon Casualty", "Earthspur Miner", "Entertainer", "Faction Agent", "Far Traveler", "Folk Hero", "Gate Urchin",
+    "Gladiator", "Guild Artisan", "Guild Merchant", "Harborfolk", "Haunted One", "Hermit", "Hillsfar Merchant",
+    "Hillsfar Smuggler", "House Agent", "Inheritor", "Initiate", "Inquisitor", "Investigator", "Iron Route Bandit",
+    "Knight of the Order", "Mercenary Veteran", "Mulmaster Aristocrat", "Noble", "Outlander", "Phlan Insurgent",
+    "Phlan Refugee", "Pirate", "Sage", "Sailor", "Secret Identity", "Shade Fanatic", "Soldier", "Spy", "Student Of Magic",
+    "Stojanow Prisoner", "Ticklebelly Nomad", "Trade Sheriff", "Urban Bounty Hunter", "Urchin", "Uthgardt Tribe Member",
+    "Vizier", "Waterdhavian Noble", "D&D Gladiator Arena"
+])}"""
+
+# Skills
+SKILLS = {
+    "Acrobatics": {"ability": "Dexterity", "description": "Acrobatics: Dexterity-based skill used to perform tasks that require finesse and agility, such as flips, rolls, and balancing."},
+    "Animal Handling": {"ability": "Wisdom", "description": "Animal Handling: Wisdom-based skill used to calm, train, or communicate with animals."},
+    "Arcana": {"ability": "Intelligence", "description": "Arcana: Intelligence-based skill used to recall knowledge about spells, magic items, eldritch symbols, magical traditions, and the planes of existence."},
+    "Athletics": {"ability": "Strength", "description": "Athletics: Strength-based skill used to perform tasks requiring physical prowess, such as climbing, jumping, and swimming."},
+    "Deception": {"ability": "Charisma", "description": "Deception: Charisma-based skill used to convincingly lie, disguise intentions, or otherwise mislead others."},
+    "History": {"ability": "Intelligence", "description": "History: Intelligence-based skill used to recall knowledge about historical events, legendary people, ancient kingdoms, and past cultures."},
+    "Insight": {"ability": "Wisdom", "description": "Insight: Wisdom-based skill used to determine the true intentions of a creature, such as detecting lies or predicting someone's next move."},
+    "Intimidation": {"ability": "Charisma", "description": "Intimidation: Charisma-based skill used to influence others through threats, hostile actions, and physical violence."},
+    "Investigation": {"ability": "Intelligence", "description": "Investigation: Intelligence-based skill used to look for clues, make deductions, or discern details about puzzles, objects, or environments."},
+    "Medicine": {"ability": "Wisdom", "description": "Medicine: Wisdom-based skill used to stabilize the dying, diagnose illnesses, and treat wounds."},
+    "Nature": {"ability": "Intelligence", "description": "Nature: Intelligence-based skill used to recall knowledge about terrain, plants and animals, the weather, and natural cycles."},
+    "Perception": {"ability": "Wisdom", "description": "Perception: Wisdom-based skill used to spot, hear, or otherwise detect the presence of something."},
+    "Performance": {"ability": "Charisma", "description": "Performance: Charisma-based skill used to entertain others through music, dance, acting, storytelling, or some other form of entertainment."},
+    "Persuasion": {"ability": "Charisma", "description": "Persuasion: Charisma-based skill used to influence someone or negotiate beneficial agreements."},
+    "Religion": {"ability": "Intelligence", "description": "Religion: Intelligence-based skill used to recall knowledge about deities, rites and prayers, religious hierarchies, holy symbols, and the practices of secret cults."},
+    "Sleight of Hand": {"ability": "Dexterity", "description": "Sleight of Hand: Dexterity-based skill used to perform tasks like pickpocketing, lockpicking, conjuring tricks, or using sleight to prevent being caught."},
+    "Stealth": {"ability": "Dexterity", "description": "Stealth: Dexterity-based skill used to hide or move silently."},
+    "Survival": {"ability": "Wisdom", "description": "Survival: Wisdom-based skill used to follow tracks, hunt wild game, guide your group through wastelands, predict the weather, or avoid quicksand and other natural hazards."}
+}
+
+# Sample Feats
+FEATS = {
+    "Ability Score Increase": "Increase an ability score by 2 points or increase 2 ability scores by 1 point.",
+    "Alert": "You cannot be surprised while conscious, gain a +5 bonus to initiative, and other creatures don't gain advantage on attack rolls against you as a result of being unseen by you.",
+    "Tough": "HP maximum increased by twice your level. Every time you leve your HP max increases by an additional 2 HP.",
+    "Tavern Brawler": "Increase Strength and Constitution by 1 (max of 20), gain proficiency with improvised weapons, unarm strikes use a d4 for damage, and you can attempt to grapple as a bonus action after hitting a creature with an unarmed strike or imporovised weapon.",
+    "War Caster": "You have advantage on Constitution saves for spell concentration, have the abiilty to perform somatic components of a spell while holding weapons and shields, and when a hostile provokes an attack of opportunity from you, you can use your reaction to cast a spell instead of the attack (1 action and single target only)."
+}
+# Actual Feats
+"""FEATS = {feat: None for feat in [
+    "Ability Score Increase", "Actor", "Alert", "Artificer Initiate", "Athlete Feat", "Charger", "Chef",
+    "Crossbow Expert", "Crusher", "Defensive Duelist", "Dual Wielder", "Dungeon Dlver", "Durable",
+    "Eldritch Adept", "Elemental Adept", "Fey Touched", "Fighting Initiate", "Grappler", "Great Weapon Master",
+    "Gunner", "Healer", "Heavily Armored", "Heavy Armor Master", "Inspiring Leader", "Keen Mind",
+    "Lightly Armored", "Linguist", "Lucky", "Mage Slayer", "Magic Initiate", "Martial Adept",
+    "Medium Armor Master", "Metamagic Adept", "Mobile", "Moderately Armored", "Mounted Combatant", "Observant",
+    "Piercer", "Poisoner", "Polearm Master", "Resilient", "Ritual Caster", "Savage Attacker", "Sentinel",
+    "Shadow Touched", "Sharpshooter", "Shield Master", "Skilled", "Skulker", "Slasher", "Spell Sniper",
+    "Tavern Brawler", "Telekinetic", "Telepathic", "Tough", "War Caster", "Weapon Master"
+]}"""
+
+# Armor: armor type -> [(armor name, base AC)]
+ARMOR = {
+    "No Armor": [],
+    "Light Armor": [("Padded", 11), ("Leather", 11), ("Studded Leather", 12)],
+    "Medium Armor": [("Hide", 12), ("Chain Shirt", 13), ("Scale Mail", 14), ("Spiked Armor", 14), ("Breastplate", 14), ("Halfplate", 15)],
+    "Heavy Armor": [("Ring Mail", 14), ("Chain Mail", 16), ("Splint", 17),("Plate", 18)]
+}
+
+# Every section compiled into the catalog
+SECTIONS = {
+    "races": RACES,
+    "classes": CLASSES,
+    "subclasses": SUBCLASSES,
+    "backgrounds": BACKGROUNDS,
+    "skills": SKILLS,
+    "feats": FEATS,
+    "armor": ARMOR,
+}
@@ -0,0 +1,258 @@
+"""
+Module: combat.py
+
+Description:
+    Encounter simulator for estimating difficulty during session prep. Saved characters are turned into
+    combatants (max HP from their class hit dice, AC from the best armor they are proficient with, initiative
+    from Dexterity, and a weapon attack based on their classes) and fought against a group of monsters
+    thousands of times. Each round's attack rolls are made in one batch, and encounters are split into chunks
+    that run across a process pool.
+
+    The report covers the party's win rate, how many rounds fights last, how many characters are left
+    standing, each character's survival rate, and how much of the party's HP is left at the end.
+
+Dependencies:
+    - random: For all dice rolls.
+    - concurrent.futures: For running chunks of encounters across CPU cores.
+    - game_logic.py: For ability modifiers, proficiency bonus, max HP, and armor class.
+    - user_database.py: For loading a user's characters from the command line.
+
+Usage:
+    report = simulate_encounters(user.characters, parse_monsters("Orc:4, Ogre"), count=5000)
+    From the command line:
+        python combat.py --user <username> --monsters "Orc:4, Ogre" --count 5000
+"""
+import argparse
+import os
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import game_logic as gl
+import user_database as db
+
+MAX_ROUNDS = 50
+CHUNK_SIZE = 500
+D20_FACES = range(1, 21)
+
+# Weapon damage die and attack ability per class; the best of a character's classes is used
+CLASS_WEAPONS = {
+    "Barbarian": (12, "Strength"),   # Greataxe
+    "Bard": (8, "Dexterity"),        # Rapier
+    "Rogue": (6, "Dexterity"),       # Shortsword
+}
+DEFAULT_WEAPON = (8, "Strength")
+
+# Simplified stat blocks: HP, AC, initiative modifier, attack bonus, attacks per turn, damage (dice, sides, bonus)
+MONSTERS = {
+    "Goblin": {"hp": 7, "ac": 15, "initiative": 2, "attack_bonus": 4, "attacks": 1, "damage": (1, 6, 2)},
+    "Orc": {"hp": 15, "ac": 13, "initiative": 1, "attack_bonus": 5, "attacks": 1, "damage": (1, 12, 3)},
+    "Bugbear": {"hp": 27, "ac": 16, "initiative": 2, "attack_bonus": 4, "attacks": 1, "damage": (2, 8, 2)},
+    "Ogre": {"hp": 59, "ac": 11, "initiative": -1, "attack_bonus": 6, "attacks": 1, "damage": (2, 8, 4)},
+    "Owlbear": {"hp": 59, "ac": 13, "initiative": 1, "attack_bonus": 7, "attacks": 2, "damage": (1, 10, 5)},
+    "Troll": {"hp": 84, "ac": 15, "initiative": 1, "attack_bonus": 7, "attacks": 3, "damage": (1, 6, 4)},
+    "Young Green Dragon": {"hp": 136, "ac": 18, "initiative": 1, "attack_bonus": 7, "attacks": 3, "damage": (2, 8, 4)},
+}
+
+# Building combatants
+def character_to_combatant(character):
+    """Turn a Character (or character_data dict) into a plain combatant dict that can be sent to workers."""
+    if isinstance(character, dict):
+        character = gl.Character(character)
+    classes = character.classes
+    scores = dict(zip(gl.get_ability_scores(), character.ability_scores))
+    modifiers = {ability: gl.calculate_ability_modifier(score) for ability, score in scores.items()}
+    total_level = sum(classes.values())
+    proficiency_bonus = gl.calculate_proficiency_bonus(total_level)
+
+    # Pick the class weapon that hits hardest with this character's scores
+    weapons = [CLASS_WEAPONS.get(class_name, DEFAULT_WEAPON) for class_name in classes] or [DEFAULT_WEAPON]
+    sides, ability = max(weapons, key=lambda weapon: weapon[0] / 2 + modifiers[weapon[1]])
+    attack_modifier = modifiers[ability]
+
+    armor_proficiencies = gl.get_armor_proficiencies(classes)
+    return {
+        "name": character.name,
+        "hp": max(1, gl.calculate_max_hp(classes, modifiers["Constitution"])),
+        "ac": gl.best_armor_loadout(modifiers["Dexterity"], armor_proficiencies)[3],
+        "initiative": modifiers["Dexterity"],
+        "attack_bonus": proficiency_bonus + attack_modifier,
+        # Barbarians get Extra Attack at 5th level
+        "attacks": 2 if classes.get("Barbarian", 0) >= 5 else 1,
+        "damage": (1, sides, attack_modifier),
+        # Rogues add Sneak Attack (1d6 per two Rogue levels, rounded up) once per turn
+        "sneak_attack": (classes.get("Rogue", 0) + 1) // 2,
+    }
+
+def monster_to_combatant(name, number=None):
+    stat_block = MONSTERS.get(name)
+    if stat_block is None:
+        raise ValueError(f"Unknown monster: {name}. Choose from {', '.join(MONSTERS)}")
+    return dict(stat_block, name=f"{name} {number}" if number else name, sneak_attack=0)
+
+def parse_monsters(text):
+    """Parse "Orc:4, Ogre" into a list of monster combatants."""
+    monsters = []
+    for entry in text.split(","):
+        if not entry.strip():
+            continue
+        name, _, count = entry.partition(":")
+        count = int(count) if count.strip() else 1
+        monsters.extend(monster_to_combatant(name.strip(), number + 1 if count > 1 else None) for number in range(count))
+    return monsters
+
+# Simulation
+def roll_damage(rng, dice, sides, bonus, critical):
+    count = dice * 2 if critical else dice
+    return max(0, sum(rng.choices(range(1, sides + 1), k=count)) + bonus)
+
+def simulate_encounter(party, monsters, rng=random):
+    """
+    Fight one encounter to the end. Returns (party won, rounds, HP left per party member).
+    Each combatant attacks a random standing enemy on its turn.
+    """
+    combatants = party + monsters
+    hp = [combatant["hp"] for combatant in combatants]
+    party_size = len(party)
+    sides = [range(party_size), range(party_size, len(combatants))]
+
+    # Initiative order, highest first
+    initiative_rolls = rng.choices(D20_FACES, k=len(combatants))
+    order = sorted(range(len(combatants)), key=lambda index: initiative_rolls[index] + combatants[index]["initiative"], reverse=True)
+    attacks_per_round = sum(combatant["attacks"] for combatant in combatants)
+
+    rounds = 0
+    while rounds < MAX_ROUNDS:
+        rounds += 1
+        # Roll every attack die for the round in one batch
+        attack_rolls = iter(rng.choices(D20_FACES, k=attacks_per_round))
+        for attacker in order:
+            attacker_stats = combatants[attacker]
+            sneak_attack = attacker_stats["sneak_attack"]
+            for _ in range(attacker_stats["attacks"]):
+                attack_roll = next(attack_rolls)
+                if hp[attacker] <= 0:
+                    continue
+                enemies = [index for index in sides[attacker < party_size] if hp[index] > 0]
+                if not enemies:
+                    break
+                target = rng.choice(enemies)
+                critical = attack_roll == 20
+                if attack_roll == 1 or (not critical and attack_roll + attacker_stats["attack_bonus"] < combatants[target]["ac"]):
+                    continue
+                dice, die_sides, bonus = attacker_stats["damage"]
+                damage = roll_damage(rng, dice, die_sides, bonus, critical)
+                if sneak_attack:
+                    damage += roll_damage(rng, sneak_attack, 6, 0, critical)
+                    sneak_attack = 0
+                hp[target] -= damage
+
+        party_standing = any(hp[index] > 0 for index in sides[0])
+        monsters_standing = any(hp[index] > 0 for index in sides[1])
+        if not party_standing or not monsters_standing:
+            break
+
+    party_won = not any(hp[index] > 0 for index in sides[1]) and any(hp[index] > 0 for index in sides[0])
+    return party_won, rounds, [max(0, hp[index]) for index in sides[0]]
+
+def simulate_chunk(party, monsters, seed, count):
+    """Worker entry point. Runs count encounters and returns summary counts rather than every result."""
+    rng = random.Random(seed)
+    party_max_hp = sum(combatant["hp"] for combatant in party)
+    summary = {"wins": 0, "rounds": Counter(), "survivors": Counter(), "hp_remaining": Counter(),
+               "member_survived": [0] * len(party)}
+    for _ in range(count):
+        party_won, rounds, hp_left = simulate_encounter(party, monsters, rng)
+        summary["wins"] += party_won
+        summary["rounds"][rounds] += 1
+        summary["survivors"][sum(1 for hp in hp_left if hp > 0)] += 1
+        # HP left across the whole party, in 10% buckets
+        summary["hp_remaining"][min(100, sum(hp_left) * 100 // party_max_hp // 10 * 10)] += 1
+        for index, hp in enumerate(hp_left):
+            if hp > 0:
+                summary["member_survived"][index] += 1
+    return summary
+
+def merge_summaries(summaries, party_size):
+    merged = {"wins": 0, "rounds": Counter(), "survivors": Counter(), "hp_remaining": Counter(),
+              "member_survived": [0] * party_size}
+    for summary in summaries:
+        merged["wins"] += summary["wins"]
+        for key in ("rounds", "survivors", "hp_remaining"):
+            merged[key].update(summary[key])
+        merged["member_survived"] = [total + survived for total, survived in zip(merged["member_survived"], summary["member_survived"])]
+    return merged
+
+def simulate_encounters(party, monsters, count=1000, workers=None, chunk_size=CHUNK_SIZE, seed=None):
+    """
+    Simulate count encounters between party (Characters, character_data dicts, or combatant dicts) and
+    monsters (combatant dicts, see parse_monsters) and return a report dict.
+    """
+    party = [member if isinstance(member, dict) and "attack_bonus" in member else character_to_combatant(member) for member in party]
+    if not party or not monsters:
+        raise ValueError("An encounter needs at least one character and one monster")
+    if count < 1:
+        raise ValueError(f"Simulate at least one encounter, not {count}")
+    seeder = random.Random(seed)
+    chunks = [(seeder.getrandbits(64), min(chunk_size, count - start)) for start in range(0, count, chunk_size)]
+    workers = workers or os.cpu_count() or 1
+
+    # Small jobs are not worth starting processes for
+    if workers == 1 or len(chunks) == 1:
+        summaries = [simulate_chunk(party, monsters, chunk_seed, chunk_count) for chunk_seed, chunk_count in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(simulate_chunk, party, monsters, chunk_seed, chunk_count) for chunk_seed, chunk_count in chunks]
+            summaries = [future.result() for future in futures]
+
+    summary = merge_summaries(summaries, len(party))
+    return {
+        "encounters": count,
+        "party_win_rate": summary["wins"] / count,
+        "average_rounds": sum(rounds * times for rounds, times in summary["rounds"].items()) / count,
+        "rounds": dict(sorted(summary["rounds"].items())),
+        "survivors": dict(sorted(summary["survivors"].items())),
+        "party_hp_remaining": dict(sorted(summary["hp_remaining"].items())),
+        "survival_rates": {member["name"]: survived / count for member, survived in zip(party, summary["member_survived"])},
+    }
+
+def format_report(report):
+    lines = [f"Encounters simulated: {report['encounters']}",
+             f"Party win rate: {report['party_win_rate']:.1%}",
+             f"Average rounds: {report['average_rounds']:.1f}",
+             "Rounds: " + ", ".join(f"{rounds}: {times}" for rounds, times in report["rounds"].items()),
+             "Characters standing: " + ", ".join(f"{survivors}: {times}" for survivors, times in report["survivors"].items()),
+             "Party HP left: " + ", ".join(f"{bucket}%+: {times}" for bucket, times in report["party_hp_remaining"].items()),
+             "Survival rates:"]
+    lines.extend(f"    {name}: {rate:.1%}" for name, rate in report["survival_rates"].items())
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate encounters between a user's characters and monsters.")
+    parser.add_argument("--user", required=True, help="Username whose characters make up the party")
+    parser.add_argument("--characters", default=None, help="Comma separated character names (default: all)")
+    parser.add_argument("--monsters", required=True, help=f"Monsters as \"Name:count, Name\". Known: {', '.join(MONSTERS)}")
+    parser.add_argument("--count", type=int, default=1000, help="Number of encounters to simulate")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible results")
+    args = parser.parse_args(argv)
+
+    if args.count < 1:
+        parser.error("--count must be at least 1")
+    user_data = db.get_user(args.user)
+    if not user_data:
+        parser.error(f"No user found with username: {args.user}")
+    party = list(db.iter_characters(user_id=user_data[0]))
+    if args.characters:
+        names = {name.strip() for name in args.characters.split(",")}
+        party = [character_data for character_data in party if character_data['name'] in names]
+    if not party:
+        parser.error("No characters found for the party")
+    try:
+        monsters = parse_monsters(args.monsters)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(format_report(simulate_encounters(party, monsters, args.count, args.workers, seed=args.seed)))
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,10 @@ Description:
 
 Dependencies:
     - random: For generating random numbers to simmulate rolling dice.
+    - catalog.py: For the compiled races, classes, subclasses, backgrounds, feats, skills, and armor.
     - user_database.py: For interacting with the user database.
+    - validator.py: For checking new characters against the rules before they are saved. Imported when first
+      needed, since validator itself imports this module.
     - create_connection from user_database: For establishing database connections.
 
 Usage:
@@ -16,13 +19,15 @@ Usage:
     attributes, and performing various game-specific calculations and interactions.
 """
 import random
-import ui
+import sys
+from array import array
+import catalog
 import user_database as db
 from user_database import create_connection
 
 # Dice Interactions
-def roll_stats(dnd_class=None):
-    rolled_scores = [sum(sorted([random.randint(1, 6) for _ in range(4)])[1:]) for _ in range(6)]
+def roll_stats(dnd_class=None, rng=random):
+    rolled_scores = [sum(sorted([rng.randint(1, 6) for _ in range(4)])[1:]) for _ in range(6)]
     
     if dnd_class and hasattr(dnd_class, 'reorder_ability_scores'):
         reordered_scores = dnd_class.reorder_ability_scores(rolled_scores)
@@ -31,162 +36,34 @@ def roll_stats(dnd_class=None):
     return rolled_scores
 
 def get_race_options():
-    # Test Sample
-    result = [
-        "Half-Orc", "Human", "Tiefling"
-    ]
-    # Actual Result
-    """result = [
-        "Dragonborn", "Drow", "Dwarf", "Elf", "Gnome", "Half-Elf", "Halfling", "Half-Orc", "Human", "Tiefling", 
-        "Aarakocra", "Aasimar", "Air Genasi", "Bugbear", "Centaur", "Changeling", "Deep Gnome", "Duergar", "Earth Genasi", 
-        "Eladrin", "Fairy", "Firbolg", "Fire Genasi", "Githyanki", "Githzerai", "Goblin", "Goliath", "Harengon", 
-        "Hobgoblin", "Kenku", "Kobold", "Lizardfolk", "Minotaur", "Orc", "Satyr", "Sea Elf", "Shadar-kai", "Shifter", 
-        "Tabaxi", "Tortle", "Triton", "Water Genasi", "Yuan-ti", "Kender", "Astral Elf", "Autognome", "Giff", "Hadozee", 
-        "Plasmoid", "Thri-kreen", "Owlin", "Lineages", "Leonin", "Satyr (Legacy)", "Changling (Legacy)", "Kalashtar", 
-        "Shifter (Legacy)", "Warforged", "Verdan", "Centaur (Legacy)", "Loxodon", "Minotaur (Legacy)", "Simic Hybrid", 
-        "Vedalken", "Feral Tiefling", "Tortle (Legacy)", "Locathah", "Grung", "Gith (Legacy)", "Aesimar (Legacy)", 
-        "Bugbear (Legacy)", "Firbolg (Legacy)", "Goblin (Legacy)", "Hobgoblin (Legacy)", "Kenku (Legacy)", 
-        "Kobold (Legacy)", "Lizardfolk (Legacy)", "Orc (Legacy)", "Tabaxi (Legacy)", "Triton (Legacy)", 
-        "Yuan-ti Pureblood (Legacy)", "Aarakocra (Legacy)", "Genasi (Legasy)", "Goliath (Legacy)", "Wood Elf"
-    ]"""
-    result.sort()
-    return result
+    return list(catalog.get_catalog().keys("races"))
 
 def get_class_options():
-    # Test Sample
-    result = [
-        "Barbarian", "Bard","Rogue"
-    ]
-
-    # Actual Result
-    """result = [
-        "Artificer", "Barbarian", "Bard", "Blood Hunter", "Cleric", "Druid", "Fighter", "Monk", "Paladin", "Ranger", "Rogue", "Sorcerer", 
-        "Warlock", "Wizard"
-    ]"""
-
-    result.sort()
-    return result
+    return list(catalog.get_catalog().keys("classes"))
 
 def get_subclass_options():
-    # Test list
-    return {
-        "Barbarian": ["Path of the Totem Warrior", "Path of Wild Magic"],
-        "Bard": ["College of Lore", "College of Swords"],
-        "Rogue": ["Assassin", "Thief"]
-    }
-
-    # Actual list
-    """return {
-        "Artificer": ["Alechemist", "Artillerist", "Battle Smith", "Armorer"],
-        "Barbarian": ["Path of the Totem Warrior", "Path of the Battlerager", "Path of the Ancestral Guardian", 
-        "Path of the Storm Herald", "Path of the Zealot", "Path of the Beast", "Path of Wild Magic"],
-        "Bard": ["College of Lore", "College of Valor", "College of Glamour", "College of Swords", "College of Whispers", 
-        "College of Eloquence", "College of Creation"],
-        "Blood Hunter": ["Order of the Ghostslayer", "Order of the Lycan", "Order of the Mutant", "Order of the Profane Soul"],
-        "Cleric": ["Knowledge Domain", "Life Domain", "Light Domain", "Nature Domain", "Tempest Domain", "Trickery Domain", 
-        "War Domain", "Death Domain", "Arcana Domain", "Solidarity Domain", "Strength Domain", "Ambition Domain", "Zeal Domain", 
-        "Grave Domain", "Order Domain", "Peace Domain", "Twilight Domain", "Inevitability Domain"],
-        "Druid": ["Circle of the Land", "Circle of the Moon", "Circle of the Shepherd", "Circle of Spores", "Circle of Stars", 
-        "Circle of Wildfire", "Circle of Whispered Harmony"],
-        "Fighter": ["Champion", "Battle Master", "Eldritch Knight", "Purple Dragon Knight", "Arcane Archer", "Cavalier", 
-        "Samurai", "Echo Knight", "Psi Warrior", "Rune Knight"],
-        "Monk": ["Way of the Open Hand", "Way of Shadow", "Way of the Four Elements", "Way of the Long Death", 
-        "Way of the Sun Soul", "Way of the Drunken Master", "Way of the Kensei", "Way of Mercy", "Way of the Astral Self"],
-        "Paladin": ["Oath of Devotion", "Oath of the Ancients", "Oath of Vengeance", "Oathbreaker", "Oath of the Crown", 
-        "Oath of Conquest", "Oath of Redemption", "Oath of Glory", "Oath of the Watchers"],
-        "Ranger": ["Hunter", "Beast Master", "Gloom Stalker", "Horizon Walker", "Monster Slayer", "Fey Wanderer", "Swarmkeeper"],
-        "Rogue": ["Thief", "Assassin", "Arcane Trickster", "Mastermind", "Swashbuckler", "Inquisitive", "Scout", "Phantom", 
-        "Soulknife"],
-        "Sorcerer": ["Draconic Bloodline", "Wild Magic", "Storm Sorcery", "Pyromancer", "Divine Soul", "Shadow Magic", 
-        "Aberrant Mind", "Clockwork Soul", "Lunar Sorcery"],
-        "Warlock": ["The Archfey", "The Great Old One", "The Undying", "The Celestial", "The Hexblade", "The Fathomless", 
-        "The Genie"],
-        "Wizard": ["School of Abjuration", "School of Conjuration", "School of Divination", "School of Enchantment", 
-        "School of Evocation", "School of Illusion", "School of Necromancy", "School of Transmutation", "Bladesinging", 
-        "War Magic", "Chronurgy Magic", "Graviturgy", "Order of Scribes"]
-    }"""
+    return catalog.get_catalog().section("subclasses")
 
 def get_background_options():
-    # Test Sample
-    result = [
-        "Acolyte", "Soldier", "Spy"
-    ]
-
-    # Actual Result
-    """result = [
-        "Acolyte", "Anthropologist", "Archaeologist", "Adopted", "Black Fist Double Agent", "Caravan Specialist", "Charlatan", 
-        "City Watch", "Clan Crafter", "Cloistered Scholar", "Cormanthor Refugee", "Courtier", "Criminal", "Dissenter", 
-        "Dragon Casualty", "Earthspur Miner", "Entertainer", "Faction Agent", "Far Traveler", "Folk Hero", "Gate Urchin", 
-        "Gladiator", "Guild Artisan", "Guild Merchant", "Harborfolk", "Haunted One", "Hermit", "Hillsfar Merchant", 
-        "Hillsfar Smuggler", "House Agent", "Inheritor", "Initiate", "Inquisitor", "Investigator", "Iron Route Bandit", 
-        "Knight of the Order", "Mercenary Veteran", "Mulmaster Aristocrat", "Noble", "Outlander", "Phlan Insurgent", 
-        "Phlan Refugee", "Pirate", "Sage", "Sailor", "Secret Identity", "Shade Fanatic", "Soldier", "Spy", "Student Of Magic", 
-        "Stojanow Prisoner", "Ticklebelly Nomad", "Trade Sheriff", "Urban Bounty Hunter", "Urchin", "Uthgardt Tribe Member", 
-        "Vizier", "Waterdhavian Noble", "D&D Gladiator Arena"
-    ]"""
-    result.sort()
-    return result
+    return list(catalog.get_catalog().keys("backgrounds"))
 
 def get_background_descriptions(background):
-    # from sample
-    description = {
-        "Acolyte": "You are devote to a specific god or pantheon. As an acolyte you are respected by others of your faith.\n\nSkill Proficiencies: Insight, Religion.\n\nLanguages: 2 of your choice.\n\nEquipment: A holy symbol, a prayer book/wheel, 5 sticks of incense, vestments, a set of common clothes, and a puch of 15 gold peices.",
-        "Soldier": "War and battle is what you know best. You've trained your whole life and joined a military service when you came of age.\n\nSkill Proficiencies: Athletics, Intimidation.\n\nTool Proficiencies: One type of gaming set, vehicles (land).\n\nEquipment: Insignia of rank, trophy from a fallen foe, set of bone dice/cards, common clothes, and a puch of 10gp",
-        "Spy": "A criminal or perhaps a government official. What ever brought you to the path of stealth and deception has toned your skills of trickery.\n\nSkill Proficiencies: Deception, Stealth.\n\nTool Proficiencies: One type of gaming set, thieves' tools.\n\nEquipment: A crowbar, set of dark common clothes and hood, puch containing 15 gold."
-    }
-    result = description.get(background, "no background found")
+    result = catalog.get_catalog().get("backgrounds", background) or "no background found"
     return result
 
 def get_skills():
-    return [
-        "Acrobatics", "Animal Handling", "Arcana", "Athletics", "Deception", "History", "Insight", "Intimidation", "Investigation", 
-        "Medicine", "Nature", "Perception","Performance", "Persuasion", "Religion", "Sleight of Hand", "Stealth", "Survival"
-    ]
+    return list(catalog.get_catalog().keys("skills"))
 
-def get_skill_mods():
-    skill_modifiers = {
-        "Acrobatics": ability_modifiers["Dexterity"],
-        "Animal Handling": ability_modifiers["Wisdom"],
-        "Arcana": ability_modifiers["Intelligence"],
-        "Athletics": ability_modifiers["Strength"],
-        "Deception": ability_modifiers["Charisma"],
-        "History": ability_modifiers["Intelligence"],
-        "Insight": ability_modifiers["Wisdom"],
-        "Intimidation": ability_modifiers["Charisma"],
-        "Investigation": ability_modifiers["Intelligence"],
-        "Medicine": ability_modifiers["Wisdom"],
-        "Nature": ability_modifiers["Intelligence"],
-        "Perception": ability_modifiers["Wisdom"],
-        "Performance": ability_modifiers["Charisma"],
-        "Persuasion": ability_modifiers["Charisma"],
-        "Religion": ability_modifiers["Intelligence"],
-        "Sleight of Hand": ability_modifiers["Dexterity"],
-        "Stealth": ability_modifiers["Dexterity"],
-        "Survival": ability_modifiers["Wisdom"]
-    }
+def get_skill_abilities():
+    return {skill: skill_entry["ability"] for skill, skill_entry in catalog.get_catalog().section("skills").items()}
+
+def get_skill_mods(ability_modifiers):
+    skill_modifiers = {skill: ability_modifiers[ability] for skill, ability in get_skill_abilities().items()}
+    return skill_modifiers
 
 def get_skill_description(skill):
-    descriptions = {
-        "Acrobatics": "Acrobatics: Dexterity-based skill used to perform tasks that require finesse and agility, such as flips, rolls, and balancing.",
-        "Animal Handling": "Animal Handling: Wisdom-based skill used to calm, train, or communicate with animals.",
-        "Arcana": "Arcana: Intelligence-based skill used to recall knowledge about spells, magic items, eldritch symbols, magical traditions, and the planes of existence.",
-        "Athletics": "Athletics: Strength-based skill used to perform tasks requiring physical prowess, such as climbing, jumping, and swimming.",
-        "Deception": "Deception: Charisma-based skill used to convincingly lie, disguise intentions, or otherwise mislead others.",
-        "History": "History: Intelligence-based skill used to recall knowledge about historical events, legendary people, ancient kingdoms, and past cultures.",
-        "Insight": "Insight: Wisdom-based skill used to determine the true intentions of a creature, such as detecting lies or predicting someone's next move.",
-        "Intimidation": "Intimidation: Charisma-based skill used to influence others through threats, hostile actions, and physical violence.",
-        "Investigation": "Investigation: Intelligence-based skill used to look for clues, make deductions, or discern details about puzzles, objects, or environments.",
-        "Medicine": "Medicine: Wisdom-based skill used to stabilize the dying, diagnose illnesses, and treat wounds.",
-        "Nature": "Nature: Intelligence-based skill used to recall knowledge about terrain, plants and animals, the weather, and natural cycles.",
-        "Perception": "Perception: Wisdom-based skill used to spot, hear, or otherwise detect the presence of something.",
-        "Performance": "Performance: Charisma-based skill used to entertain others through music, dance, acting, storytelling, or some other form of entertainment.",
-        "Persuasion": "Persuasion: Charisma-based skill used to influence someone or negotiate beneficial agreements.",
-        "Religion": "Religion: Intelligence-based skill used to recall knowledge about deities, rites and prayers, religious hierarchies, holy symbols, and the practices of secret cults.",
-        "Sleight of Hand": "Sleight of Hand: Dexterity-based skill used to perform tasks like pickpocketing, lockpicking, conjuring tricks, or using sleight to prevent being caught.",
-        "Stealth": "Stealth: Dexterity-based skill used to hide or move silently.",
-        "Survival": "Survival: Wisdom-based skill used to follow tracks, hunt wild game, guide your group through wastelands, predict the weather, or avoid quicksand and other natural hazards."
-    }
-    result = descriptions.get(skill, "skill not found")
+    skill_entry = catalog.get_catalog().get("skills", skill)
+    result = skill_entry["description"] if skill_entry else "skill not found"
     return result
 
 def get_ability_scores():
@@ -195,33 +72,10 @@ def get_ability_scores():
     ]
 
 def get_feats():
-    # Sample Feats
-    return [
-        "", "Ability Score Increase", "Alert", "Tough", "Tavern Brawler", "War Caster"
-    ]
-    # Actual Feats
-    """return [
-        "Ability Score Increase", "Actor", "Alert", "Artificer Initiate", "Athlete Feat", "Charger", "Chef", 
-        "Crossbow Expert", "Crusher", "Defensive Duelist", "Dual Wielder", "Dungeon Dlver", "Durable", 
-        "Eldritch Adept", "Elemental Adept", "Fey Touched", "Fighting Initiate", "Grappler", "Great Weapon Master", 
-        "Gunner", "Healer", "Heavily Armored", "Heavy Armor Master", "Inspiring Leader", "Keen Mind", 
-        "Lightly Armored", "Linguist", "Lucky", "Mage Slayer", "Magic Initiate", "Martial Adept", 
-        "Medium Armor Master", "Metamagic Adept", "Mobile", "Moderately Armored", "Mounted Combatant", "Observant", 
-        "Piercer", "Poisoner", "Polearm Master", "Resilient", "Ritual Caster", "Savage Attacker", "Sentinel", 
-        "Shadow Touched", "Sharpshooter", "Shield Master", "Skilled", "Skulker", "Slasher", "Spell Sniper", 
-        "Tavern Brawler", "Telekinetic", "Telepathic", "Tough", "War Caster", "Weapon Master"
-    ]"""
+    return [""] + catalog.get_catalog().keys("feats")
 
 def get_feat_descriptions(feat):
-    # From Sample Feats
-    description = {
-        "Ability Score Increase": "Increase an ability score by 2 points or increase 2 ability scores by 1 point.",
-        "Alert": "You cannot be surprised while conscious, gain a +5 bonus to initiative, and other creatures don't gain advantage on attack rolls against you as a result of being unseen by you.",
-        "Tough": "HP maximum increased by twice your level. Every time you leve your HP max increases by an additional 2 HP.", 
-        "Tavern Brawler": "Increase Strength and Constitution by 1 (max of 20), gain proficiency with improvised weapons, unarm strikes use a d4 for damage, and you can attempt to grapple as a bonus action after hitting a creature with an unarmed strike or imporovised weapon.",
-        "War Caster": "You have advantage on Constitution saves for spell concentration, have the abiilty to perform somatic components of a spell while holding weapons and shields, and when a hostile provokes an attack of opportunity from you, you can use your reaction to cast a spell instead of the attack (1 action and single target only)."
-    }
-    result = description.get(feat, "No Feat selected.\n\nUnless your Dungeon Master says otherwise, you man gain a Feat at levels 4, 8, 12, 16, and 19.")
+    result = catalog.get_catalog().get("feats", feat) or "No Feat selected.\n\nUnless your Dungeon Master says otherwise, you man gain a Feat at levels 4, 8, 12, 16, and 19."
     return result
 
 def get_race_map(race):
@@ -239,50 +93,337 @@ def roll_dice_logic(sides, num_dice=1):
     return results, total
 
 def get_armor_data():
-    armor_data = {
-        "No Armor": [],
-        "Light Armor": [("Padded", 11), ("Leather", 11), ("Studded Leather", 12)],
-        "Medium Armor": [("Hide", 12), ("Chain Shirt", 13), ("Scale Mail", 14), ("Spiked Armor", 14), ("Breastplate", 14), ("Halfplate", 15)],
-        "Heavy Armor": [("Ring Mail", 14), ("Chain Mail", 16), ("Splint", 17),("Plate", 18)]
-    }
-    return armor_data
+    return catalog.get_catalog().section("armor")
 
 def get_armor_type_options():
-    armor_type_options = ["No Armor", "Light Armor", "Medium Armor", "Heavy Armor"]
-    return armor_type_options
+    return list(catalog.get_catalog().keys("armor"))
 
 def get_armor_options():
     armor_options = {
-        "No Armor": ["", "No Armor"],
-        "Light Armor": ["", "Padded", "Leather", "Studded Leather"],
-        "Medium Armor": ["", "Hide", "Chain Shirt", "Scale Mail", "Spiked Armor", "Breastplate", "Halfplate"],
-        "Heavy Armor": ["", "Ring Mail", "Chain Mail", "Splint", "Plate"]
+        armor_type: ["", "No Armor"] if not armor_list else [""] + [armor for armor, _ in armor_list]
+        for armor_type, armor_list in get_armor_data().items()
     }
     return armor_options
 
+# Armor lookup tables, built once from the catalog on first use
+SHIELD_BONUS = 2
+DEX_MODIFIER_RANGE = range(-5, 11)  # Modifiers for ability scores 1-30
+armor_index = None
+best_armor_by_type = None
+best_ac_tables = {}
+armor_proficiencies_by_classes = {}
+
+def get_armor_index():
+    """Return {(armor type, armor name): base AC}."""
+    global armor_index, best_armor_by_type
+    if armor_index is None:
+        armor_data = get_armor_data()
+        armor_index = {(armor_type, armor): ac for armor_type, armor_list in armor_data.items() for armor, ac in armor_list}
+        # Only the highest base AC of each armor type can ever be part of the best loadout
+        best_armor_by_type = {"No Armor": ("", 10)}
+        for armor_type, armor_list in armor_data.items():
+            if armor_list:
+                best_armor_by_type[armor_type] = max(armor_list, key=lambda armor: armor[1])
+    return armor_index
+
+def apply_dex_modifier(armor_type, base_ac, dex_modifier):
+    if armor_type == "Medium Armor":
+        return base_ac + min(dex_modifier, 2)
+    if armor_type == "Heavy Armor":
+        return base_ac
+    return base_ac + dex_modifier
+
 def calculate_ac(armor_type, armor_name, dex_modifier, shield_bonus):
-    armor_data = get_armor_data()
     base_ac = 10
-
     if armor_type != "No Armor":
-        for armor, ac in armor_data[armor_type]:
-            if armor == armor_name:
-                base_ac = ac
-                break
-
-    if armor_type == "Light Armor":
-        total_ac = base_ac + dex_modifier + shield_bonus
-    elif armor_type == "Medium Armor":
-        total_ac = base_ac + min(dex_modifier, 2) + shield_bonus
-    elif armor_type == "Heavy Armor":
-        total_ac = base_ac + shield_bonus
-    else:
-        total_ac = base_ac + dex_modifier + shield_bonus
-
-    return total_ac
+        base_ac = get_armor_index().get((armor_type, armor_name), 10)
+    return apply_dex_modifier(armor_type, base_ac, dex_modifier) + shield_bonus
+
+def get_armor_proficiencies(classes):
+    """Return the armor types (and "Shields") a character with the given {class name: level} can use."""
+    class_names = frozenset(classes)
+    if class_names not in armor_proficiencies_by_classes:
+        proficiencies = set()
+        for class_name in class_names:
+            class_object = get_class_by_name(class_name)
+            if class_object:
+                proficiencies.update(class_object.armor_proficiencies)
+        armor_proficiencies_by_classes[class_names] = frozenset(proficiencies)
+    return armor_proficiencies_by_classes[class_names]
+
+def get_best_ac_table(armor_proficiencies=None):
+    """Return {dex modifier: (armor type, armor name, shield bonus, AC)} for one set of proficiencies."""
+    get_armor_index()
+    if armor_proficiencies is None:
+        armor_proficiencies = frozenset(best_armor_by_type) | {"Shields"}
+    armor_proficiencies = frozenset(armor_proficiencies)
+    if armor_proficiencies not in best_ac_tables:
+        shield_bonus = SHIELD_BONUS if "Shields" in armor_proficiencies else 0
+        candidates = [(armor_type, armor, ac) for armor_type, (armor, ac) in best_armor_by_type.items()
+                      if armor_type == "No Armor" or armor_type in armor_proficiencies]
+        table = {}
+        for dex_modifier in DEX_MODIFIER_RANGE:
+            armor_type, armor, ac = max(candidates, key=lambda candidate: apply_dex_modifier(candidate[0], candidate[2], dex_modifier))
+            table[dex_modifier] = (armor_type, armor, shield_bonus, apply_dex_modifier(armor_type, ac, dex_modifier) + shield_bonus)
+        best_ac_tables[armor_proficiencies] = table
+    return best_ac_tables[armor_proficiencies]
+
+def best_armor_loadout(dex_modifier, armor_proficiencies=None):
+    """Return the (armor type, armor name, shield bonus, AC) with the highest AC. No proficiencies given means any armor."""
+    dex_modifier = max(DEX_MODIFIER_RANGE[0], min(dex_modifier, DEX_MODIFIER_RANGE[-1]))
+    return get_best_ac_table(armor_proficiencies)[dex_modifier]
+
+def best_armor_loadouts(dex_modifiers, armor_proficiencies=None):
+    """Batched best_armor_loadout. armor_proficiencies is one set for everyone or one set per dex modifier."""
+    low, high = DEX_MODIFIER_RANGE[0], DEX_MODIFIER_RANGE[-1]
+    if armor_proficiencies is None or isinstance(armor_proficiencies, (set, frozenset)):
+        table = get_best_ac_table(armor_proficiencies)
+        return [table[max(low, min(dex_modifier, high))] for dex_modifier in dex_modifiers]
+    return [get_best_ac_table(proficiencies)[max(low, min(dex_modifier, high))]
+            for dex_modifier, proficiencies in zip(dex_modifiers, armor_proficiencies)]
+
+def best_ac_for_characters(characters):
+    """Return the best possible AC for each Character, using each character's own armor proficiencies."""
+    dex_modifiers = [calculate_ability_modifier(character.ability_scores[1]) for character in characters]
+    proficiencies = [get_armor_proficiencies(character.classes) for character in characters]
+    return [loadout[3] for loadout in best_armor_loadouts(dex_modifiers, proficiencies)]
+
+# Derived Stats
+def calculate_ability_modifier(score):
+    return (score - 10) // 2
+
+def calculate_proficiency_bonus(total_level):
+    return 2 + (total_level - 1) // 4
+
+def calculate_max_hp(classes, constitution_modifier):
+    max_hp = 0
+    for class_name, levels in classes.items():
+        class_object = get_class_by_name(class_name)
+        if class_object is None:
+            continue
+        hit_die_value = int(class_object.hit_die[1:])
+        # Max HP for the first level is max hit die value plus Constitution modifier
+        if levels > 0:
+            max_hp += hit_die_value + constitution_modifier
+        # Every level after that adds the average roll plus Constitution modifier
+        for level in range(2, levels + 1):
+            max_hp += ((hit_die_value // 2) + 1) + constitution_modifier
+    return max_hp
+
+class StatNode:
+    def __init__(self, compute):
+        self.compute = compute
+        self.value = None
+        self.dirty = True
+
+class CharacterStats:
+    """
+    Headless calculator for everything a character sheet derives from a character's data.
+
+    Inputs (ability scores, classes, proficiencies, expertise, armor) and derived values (modifiers,
+    proficiency bonus, skill modifiers, HP, initiative, AC) are nodes in a dependency graph. Derived nodes
+    are memoized, and setting an input only marks the nodes downstream of it as dirty, so they are the only
+    ones recomputed the next time they are read.
+    """
+    def __init__(self, character_data):
+        self.nodes = {}
+        self.dependents = {}
+        self.recompute_count = 0
+        self.abilities = get_ability_scores()
+        self.skill_abilities = get_skill_abilities()
+
+        # Inputs
+        for ability, score in zip(self.abilities, character_data['ability_scores']):
+            self.add_input(ability, score)
+        self.add_input("classes", dict(character_data.get('classes', {})))
+        self.add_input("skill_proficiencies", frozenset(character_data.get('skill_proficiencies', [])))
+        self.add_input("is_jack_of_all_trades", bool(character_data.get('is_jack_of_all_trades', False)))
+        for skill in self.skill_abilities:
+            self.add_input(f"expertise:{skill}", False)
+        self.add_input("armor_type", "No Armor")
+        self.add_input("armor_name", "")
+        self.add_input("shield_bonus", 0)
+
+        # Derived values
+        for ability in self.abilities:
+            self.add_node(f"modifier:{ability}", [ability],
+                          lambda ability=ability: calculate_ability_modifier(self.get(ability)))
+        self.add_node("total_level", ["classes"], lambda: sum(self.get("classes").values()))
+        self.add_node("proficiency_bonus", ["total_level"], lambda: calculate_proficiency_bonus(self.get("total_level")))
+        for skill, ability in self.skill_abilities.items():
+            self.add_node(f"skill:{skill}",
+                          [f"modifier:{ability}", "skill_proficiencies", f"expertise:{skill}", "is_jack_of_all_trades", "proficiency_bonus"],
+                          lambda skill=skill, ability=ability: self.compute_skill_modifier(skill, ability))
+        self.add_node("max_hp", ["classes", "modifier:Constitution"],
+                      lambda: calculate_max_hp(self.get("classes"), self.get("modifier:Constitution")))
+        self.add_node("initiative", ["modifier:Dexterity"], lambda: self.get("modifier:Dexterity"))
+        self.add_node("armor_class", ["armor_type", "armor_name", "shield_bonus", "modifier:Dexterity"],
+                      lambda: calculate_ac(self.get("armor_type"), self.get("armor_name"), self.get("modifier:Dexterity"), self.get("shield_bonus")))
+
+    # Graph helpers
+    def add_input(self, name, value):
+        node = StatNode(None)
+        node.value = value
+        node.dirty = False
+        self.nodes[name] = node
+        self.dependents[name] = []
+
+    def add_node(self, name, dependencies, compute):
+        self.nodes[name] = StatNode(compute)
+        self.dependents[name] = []
+        for dependency in dependencies:
+            self.dependents[dependency].append(name)
+
+    def get(self, name):
+        node = self.nodes[name]
+        if node.dirty:
+            node.value = node.compute()
+            node.dirty = False
+            self.recompute_count += 1
+        return node.value
+
+    def set_input(self, name, value):
+        """Change an input and mark everything that depends on it as dirty."""
+        node = self.nodes[name]
+        if node.value == value:
+            return
+        node.value = value
+        stack = list(self.dependents[name])
+        while stack:
+            dependent = stack.pop()
+            self.nodes[dependent].dirty = True
+            stack.extend(self.dependents[dependent])
+
+    def compute_skill_modifier(self, skill, ability):
+        modifier = self.get(f"modifier:{ability}")
+        proficient = skill in self.get("skill_proficiencies")
+        if proficient:
+            modifier += self.get("proficiency_bonus")
+        if self.get(f"expertise:{skill}"):
+            modifier += self.get("proficiency_bonus")  # Add again for expertise
+        elif self.get("is_jack_of_all_trades") and not proficient:
+            modifier += self.get("proficiency_bonus") // 2  # Add half proficiency for Jack of All Trades
+        return modifier
+
+    # Convenience accessors
+    def ability_modifier(self, ability):
+        return self.get(f"modifier:{ability}")
+
+    def skill_modifier(self, skill):
+        return self.get(f"skill:{skill}")
+
+    def skill_modifiers(self):
+        return {skill: self.skill_modifier(skill) for skill in self.skill_abilities}
+
+    def set_ability_score(self, ability, score):
+        self.set_input(ability, score)
+
+    def set_expertise(self, skill, has_expertise):
+        self.set_input(f"expertise:{skill}", bool(has_expertise))
+
+    def set_armor(self, armor_type, armor_name, shield_bonus):
+        self.set_input("armor_type", armor_type)
+        self.set_input("armor_name", armor_name)
+        self.set_input("shield_bonus", shield_bonus)
+
+    def load_character(self, character_data, expertise=()):
+        """Switch to another character's inputs, so one calculator can be reused for many characters."""
+        for ability, score in zip(self.abilities, character_data['ability_scores']):
+            self.set_input(ability, score)
+        self.set_input("classes", dict(character_data.get('classes', {})))
+        self.set_input("skill_proficiencies", frozenset(character_data.get('skill_proficiencies', [])))
+        self.set_input("is_jack_of_all_trades", bool(character_data.get('is_jack_of_all_trades', False)))
+        for skill in self.skill_abilities:
+            self.set_expertise(skill, skill in expertise)
+
+# Batch Skill Checks
+ROLL_MODES = ["normal", "advantage", "disadvantage"]
+D20_FACES = range(1, 21)
+skill_ability_matrix = None
+
+def get_skill_ability_matrix():
+    """Skill -> row of 0/1 weights over the six abilities, marking the ability each skill is rolled with."""
+    global skill_ability_matrix
+    if skill_ability_matrix is None:
+        abilities = get_ability_scores()
+        skill_ability_matrix = {skill: tuple(int(ability == skill_ability) for ability in abilities)
+                                for skill, skill_ability in get_skill_abilities().items()}
+    return skill_ability_matrix
+
+def get_skill_check_modifiers(characters, skill, expertise=None):
+    """
+    Skill modifiers for many characters at once. characters are Character objects or character_data dicts,
+    expertise is an optional list of booleans lining up with them.
+    """
+    weights = get_skill_ability_matrix().get(skill)
+    if weights is None:
+        raise ValueError(f"Unknown skill: {skill}")
+    # The skill's matrix row has a single 1, so applying it to a character's scores is one index lookup
+    ability_index = weights.index(1)
+    expertise = expertise or [False] * len(characters)
+    skill_bit = get_skill_bits()[skill]
+
+    modifiers = []
+    for character, has_expertise in zip(characters, expertise):
+        if isinstance(character, dict):
+            character = Character(character)
+        proficiency_bonus = calculate_proficiency_bonus(sum(level for _, level in character.class_levels))
+        proficient = character.skill_mask & skill_bit
+        modifier = calculate_ability_modifier(character.scores[ability_index])
+        if proficient:
+            modifier += proficiency_bonus
+        if has_expertise:
+            modifier += proficiency_bonus
+        elif character.is_jack_of_all_trades and not proficient:
+            modifier += proficiency_bonus // 2
+        modifiers.append(modifier)
+    return modifiers
+
+def roll_d20s(modes, rng=random):
+    """Roll one d20 check per mode in a single batch. Returns (kept roll, all rolls) pairs."""
+    # Every check rolls two dice so the whole batch is one call; normal checks keep the first
+    dice = rng.choices(D20_FACES, k=len(modes) * 2)
+    results = []
+    for index, mode in enumerate(modes):
+        first, second = dice[index * 2], dice[index * 2 + 1]
+        if mode == "advantage":
+            results.append((max(first, second), (first, second)))
+        elif mode == "disadvantage":
+            results.append((min(first, second), (first, second)))
+        else:
+            results.append((first, (first,)))
+    return results
+
+def resolve_skill_checks(characters, skill, dc, mode="normal", expertise=None, rng=random):
+    """
+    Roll the same skill check against dc for every character. mode is "normal", "advantage", or
+    "disadvantage", either one for everyone or a list lining up with characters.
+
+    Returns one dict per character with its roll(s), modifier, total, and whether it passed.
+    """
+    modes = [mode] * len(characters) if isinstance(mode, str) else list(mode)
+    for check_mode in set(modes):
+        if check_mode not in ROLL_MODES:
+            raise ValueError(f"Unknown roll mode: {check_mode}. Choose from {', '.join(ROLL_MODES)}")
+    modifiers = get_skill_check_modifiers(characters, skill, expertise)
+    results = []
+    for character, modifier, check_mode, (roll, rolls) in zip(characters, modifiers, modes, roll_d20s(modes, rng)):
+        total = roll + modifier
+        results.append({
+            'name': character['name'] if isinstance(character, dict) else character.name,
+            'mode': check_mode,
+            'rolls': rolls,
+            'roll': roll,
+            'modifier': modifier,
+            'total': total,
+            'success': total >= dc
+        })
+    return results
 
 # Base User class
 class User:
+    __slots__ = ("user_id", "username", "password", "encrypted_password", "email", "characters", "is_admin")
+
     def __init__(self, user_id, username, password, email, is_admin=False):
         self.user_id = user_id
         self.username = username
@@ -309,6 +450,13 @@ class User:
         print("User status: ", admin_status)
 
     def add_character(self, character_data):
+        """Validate and save a new character. Returns the rule violations; nothing is saved if there are any."""
+        import validator
+        violations = validator.validate_character(character_data)
+        if violations:
+            print("Character not saved, it breaks the rules:", "; ".join(violations))
+            return violations
+
         user_data = db.get_user(self.username)
         if user_data:
             user_name = user_data[0]
@@ -319,6 +467,7 @@ class User:
 
             db.add_character_to_db(user_name, character_data)
             self.load_characters()
+        return violations
 
     def remove_character(self, character_id):
         self.characters = [char for char in self.characters if char.character_id != character_id]
@@ -337,32 +486,88 @@ class User:
             print("No characters found.")
 
     def load_characters(self):
-        conn = db.create_connection()
-        if conn is not None:
-            c = conn.cursor()
-            c.execute("SELECT CharacterID FROM Characters WHERE UserID = ?", (self.user_id,))
-            character_ids = c.fetchall()
-            
-            self.characters = []
-            for character_id in character_ids:
-                character_data = db.get_character(character_id[0])
-                if character_data:
-                    self.characters.append(Character(character_data))
-            conn.close()
+        character_ids = db.get_character_ids(self.user_id)
+
+        # Characters can't be edited once saved, so only new ones need to be read and built
+        loaded = {character.character_id: character for character in self.characters}
+        new_ids = [character_id for character_id in character_ids if character_id not in loaded]
+        for character_data in db.iter_characters(character_ids=new_ids):
+            loaded[character_data['character_id']] = Character(character_data)
+        self.characters = [loaded[character_id] for character_id in character_ids if character_id in loaded]
+
+# Skill bitmask helpers. Bit n is set when a character is proficient in get_skills()[n].
+skill_bits = None
+
+def get_skill_bits():
+    global skill_bits
+    if skill_bits is None:
+        skill_bits = {skill: 1 << index for index, skill in enumerate(get_skills())}
+    return skill_bits
+
+def skills_to_mask(skills):
+    bits = get_skill_bits()
+    return sum(bits[skill] for skill in set(skills) if skill in bits)
+
+def mask_to_skills(mask):
+    return [skill for skill, bit in get_skill_bits().items() if mask & bit]
 
 # Base character class
 class Character:
+    # Compact layout: no per-instance __dict__, ability scores in a 6 slot array, skills as a bitmask,
+    # classes as (name, level) pairs, and repeated strings (race, class, background, feats) interned.
+    __slots__ = ("character_id", "name", "race", "background", "scores", "skill_mask", "extra_skills",
+                 "selected_feats", "inventory", "is_jack_of_all_trades", "class_levels", "subclass_names")
+
     def __init__(self, character_data):
         self.character_id = character_data.get('character_id')
         self.name = character_data.get('name', '')
-        self.race = character_data.get('race', '')
-        self.background = character_data.get('background', '')
+        self.race = sys.intern(character_data.get('race', '') or '')
+        self.background = sys.intern(character_data.get('background', '') or '')
         self.ability_scores = character_data.get('ability_scores', [])
         self.skill_proficiencies = character_data.get('skill_proficiencies', [])
-        self.selected_feats = character_data.get('feats', [])
-        self.inventory = character_data.get('inventory', [])
-        self.is_jack_of_all_trades = character_data.get('is_jack_of_all_trades', False)
+        self.selected_feats = tuple(sys.intern(feat) for feat in character_data.get('feats', []))
+        self.inventory = tuple(character_data.get('inventory', ()))
+        self.is_jack_of_all_trades = bool(character_data.get('is_jack_of_all_trades', False))
         self.classes = character_data.get('classes', {})
+        self.subclasses = character_data.get('subclasses', {})
+
+    @property
+    def ability_scores(self):
+        return self.scores
+
+    @ability_scores.setter
+    def ability_scores(self, scores):
+        self.scores = array('h', scores)
+
+    @property
+    def skill_proficiencies(self):
+        return mask_to_skills(self.skill_mask) + list(self.extra_skills)
+
+    @skill_proficiencies.setter
+    def skill_proficiencies(self, skills):
+        self.skill_mask = skills_to_mask(skills)
+        # Skills that aren't in the skills list (old or misspelled data) are kept as they are
+        bits = get_skill_bits()
+        self.extra_skills = tuple(skill for skill in skills if skill not in bits)
+
+    @property
+    def classes(self):
+        return dict(self.class_levels)
+
+    @classes.setter
+    def classes(self, classes):
+        self.class_levels = tuple((sys.intern(class_name), level) for class_name, level in classes.items())
+
+    @property
+    def subclasses(self):
+        return dict(self.subclass_names)
+
+    @subclasses.setter
+    def subclasses(self, subclasses):
+        self.subclass_names = tuple((sys.intern(class_name), sys.intern(subclass)) for class_name, subclass in subclasses.items())
+
+    def has_skill(self, skill):
+        return bool(self.skill_mask & get_skill_bits().get(skill, 0)) or skill in self.extra_skills
 
     def display_character(self):
         print(f"{self.name} - Race: {self.race}, Classes: {self.classes}")
@@ -385,6 +590,9 @@ class DndClass:
         self.skills = skills
         self.equipment = equipment
         self.class_table = class_table
+        self.skill_options = skills
+        self.skill_choices = 2
+        self.armor_proficiencies = []
 
     def __str__(self):
         return f"{self.name} class with hit die {self.hit_die} and primary ability {self.primary_ability}"
@@ -413,6 +621,9 @@ class DndClass:
         }
         return classes.get(class_name)
 
+    def get_asi_levels(self):
+        return [level for level, details in self.class_table.items() if "Ability Score Improvement" in details["Features"]]
+
     def reorder_ability_scores(self, scores):
         sorted_scores = sorted(scores, reverse=True)
         reordered_scores = {ability: score for ability, score in zip(self.ability_priority, sorted_scores)}
@@ -462,6 +673,7 @@ class Barbarian(DndClass):
             "Explorer's Pack", "Four Javelins"], class_table
         )
         self.ability_priority = ["Strength", "Constitution", "Dexterity", "Wisdom", "Charisma", "Intelligence"]
+        self.armor_proficiencies = ["Light Armor", "Medium Armor", "Shields"]
 
 class Bard(DndClass):
     def __init__(self):
@@ -497,6 +709,10 @@ class Bard(DndClass):
              "Leather armor", "a dagger"], class_table
         )
         self.ability_priority = ["Charisma", "Dexterity", "Constitution", "Intelligence", "Wisdom", "Strength"]
+        # Bards choose from the entire skills list
+        self.skill_options = get_skills()
+        self.skill_choices = 3
+        self.armor_proficiencies = ["Light Armor"]
 
     def display_class_table(self):
         print(f"Class Table for {self.name}:")
@@ -536,7 +752,7 @@ class Rogue(DndClass):
         super().__init__(
             'Rogue', description, 'd8', ['Dexterity'], ['Dexterity', 'Intelligence'], 
             ['Acrobatics', 'Athletics', 'Deception', 'Insight', 'Intimidation', 
-            'Investigation', 'Perception', 'Performance', 'Persuasion', 'Slight of Hand', 
+            'Investigation', 'Perception', 'Performance', 'Persuasion', 'Sleight of Hand', 
             'Stealth'], 
             [('Rapier', 'Shortsword'), ('Shortbow', 'Shortsword'), 
             ("Burglar's Pack", "Dungeoneer's Pack", "Explorer's Pack"), 
@@ -544,6 +760,8 @@ class Rogue(DndClass):
             class_table
         )
         self.ability_priority = ["Dexterity", "Intelligence", "Constitution", "Wisdom", "Charisma", "Strength"]
+        self.skill_choices = 4
+        self.armor_proficiencies = ["Light Armor"]
 
 # DnD Subclasses
 # Barbarian Subclasses
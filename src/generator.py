@@ -0,0 +1,172 @@
+"""
+Module: generator.py
+
+Description:
+    Headless random character generator. Builds complete, rules-valid characters (name, race, background,
+    classes and levels, subclasses from level 3, class skills, feats at Ability Score Improvement levels, and
+    rolled ability scores) without any UI. Large batches are generated across a process pool and streamed into
+    the database in batched transactions.
+
+Dependencies:
+    - random: For all random selections and dice rolls.
+    - concurrent.futures: For spreading generation across CPU cores.
+    - game_logic.py: For races, classes, subclasses, skills, feats, and stat rolling.
+    - user_database.py: For saving generated characters.
+
+Usage:
+    Call generate_character() for a single character, generate_characters() to stream many, or
+    generate_into_database() to save them for a user. From the command line:
+        python generator.py --user <username> --count 500
+"""
+import argparse
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import game_logic as gl
+import user_database as db
+
+MULTICLASS_CHANCE = 0.3
+MAX_CLASSES = 3
+CHUNK_SIZE = 50
+BATCH_SIZE = 200
+
+NAME_STARTS = ["Ae", "Bel", "Cor", "Dra", "El", "Fen", "Gar", "Hal", "Is", "Jor", "Kae", "Lor", "Mor", "Nym",
+               "Or", "Pel", "Quin", "Ras", "Syl", "Tor", "Ul", "Val", "Wyn", "Xan", "Yor", "Zan"]
+NAME_ENDS = ["a", "ara", "dor", "dric", "en", "ian", "is", "ith", "on", "or", "ra", "ric", "ryn", "th", "wen", "wyn"]
+SURNAME_STARTS = ["Ash", "Black", "Bright", "Dusk", "Frost", "Gold", "Iron", "Moon", "Oak", "Raven", "Storm",
+                  "Stone", "Thorn", "Wheel", "Wind", "Wolf"]
+SURNAME_ENDS = ["bane", "blade", "brook", "er", "field", "fist", "heart", "hollow", "mane", "shield", "song",
+                "walker", "ward", "wood"]
+
+def generate_name(rng=random):
+    first_name = rng.choice(NAME_STARTS) + rng.choice(NAME_ENDS)
+    surname = rng.choice(SURNAME_STARTS) + rng.choice(SURNAME_ENDS)
+    return f"{first_name} {surname}"
+
+def split_levels(total_level, class_count, rng=random):
+    """Split total_level into class_count parts of at least 1 level each."""
+    cuts = sorted(rng.sample(range(1, total_level), class_count - 1))
+    return [high - low for low, high in zip([0] + cuts, cuts + [total_level])]
+
+def generate_character(rng=random, min_level=1, max_level=20):
+    """Generate one complete character as character_data ready for add_character_to_db."""
+    class_options = gl.get_class_options()
+    subclass_options = gl.get_subclass_options()
+    feat_options = [feat for feat in gl.get_feats() if feat and feat != "Ability Score Increase"]
+
+    total_level = rng.randint(min_level, max_level)
+
+    # Classes and levels. The first class is the starting class.
+    class_count = 1
+    if total_level > 1 and rng.random() < MULTICLASS_CHANCE:
+        class_count = rng.randint(2, min(MAX_CLASSES, total_level, len(class_options)))
+    class_names = rng.sample(class_options, class_count)
+    class_levels = split_levels(total_level, class_count, rng)
+    classes = dict(zip(class_names, class_levels))
+    class_objects = {class_name: gl.get_class_by_name(class_name) for class_name in class_names}
+
+    # Subclasses are chosen at level 3
+    subclasses = {}
+    for class_name, level in classes.items():
+        if level >= 3 and subclass_options.get(class_name):
+            subclasses[class_name] = rng.choice(subclass_options[class_name])
+
+    # Skills come from the starting class
+    starting_class = class_objects[class_names[0]]
+    skill_options = [skill for skill in starting_class.skill_options if skill in gl.get_skills()]
+    skills = rng.sample(skill_options, min(starting_class.skill_choices, len(skill_options)))
+
+    # One feat or Ability Score Increase for every ASI level reached in each class
+    asi_count = sum(1 for class_name, level in classes.items()
+                    for asi_level in class_objects[class_name].get_asi_levels() if asi_level <= level)
+    feats = []
+    for _ in range(asi_count):
+        remaining_feats = [feat for feat in feat_options if feat not in feats]
+        if remaining_feats and rng.random() < 0.5:
+            feats.append(rng.choice(remaining_feats))
+        else:
+            feats.append("Ability Score Increase")
+
+    return {
+        'name': generate_name(rng),
+        'race': rng.choice(gl.get_race_options()),
+        'background': rng.choice(gl.get_background_options()),
+        'ability_scores': gl.roll_stats(starting_class, rng),
+        'feats': feats,
+        'skill_proficiencies': skills,
+        'is_jack_of_all_trades': classes.get("Bard", 0) >= 2,
+        'classes': classes,
+        'subclasses': subclasses
+    }
+
+def generate_chunk(seed, count, min_level=1, max_level=20):
+    """Worker entry point. Each chunk gets its own seed so results are reproducible."""
+    rng = random.Random(seed)
+    return [generate_character(rng, min_level, max_level) for _ in range(count)]
+
+def generate_characters(count, workers=None, chunk_size=CHUNK_SIZE, seed=None, min_level=1, max_level=20):
+    """Yield count generated characters in chunks as the worker processes finish them."""
+    seeder = random.Random(seed)
+    chunks = [min(chunk_size, count - start) for start in range(0, count, chunk_size)]
+    workers = workers or os.cpu_count() or 1
+
+    # Small jobs are not worth starting processes for
+    if workers == 1 or len(chunks) == 1:
+        for chunk in chunks:
+            yield generate_chunk(seeder.getrandbits(64), chunk, min_level, max_level)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        chunks_left = iter(chunks)
+        # Keep a few chunks in flight per worker so memory stays flat for huge counts
+        for chunk in chunks_left:
+            pending.add(executor.submit(generate_chunk, seeder.getrandbits(64), chunk, min_level, max_level))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                next_chunk = next(chunks_left, None)
+                if next_chunk:
+                    pending.add(executor.submit(generate_chunk, seeder.getrandbits(64), next_chunk, min_level, max_level))
+
+def generate_into_database(user_id, count, workers=None, batch_size=BATCH_SIZE, seed=None, min_level=1, max_level=20):
+    """Generate count characters for user_id and save them in batches. Returns how many were saved."""
+    saved = 0
+    batch = []
+    for chunk in generate_characters(count, workers, seed=seed, min_level=min_level, max_level=max_level):
+        batch.extend(chunk)
+        if len(batch) >= batch_size:
+            saved += db.add_characters_to_db(user_id, batch)
+            batch = []
+    if batch:
+        saved += db.add_characters_to_db(user_id, batch)
+    return saved
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate random characters and save them to a user's account.")
+    parser.add_argument("--user", required=True, help="Username that will own the characters")
+    parser.add_argument("--count", type=int, default=100, help="Number of characters to generate")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Characters saved per transaction")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible results")
+    parser.add_argument("--min-level", type=int, default=1)
+    parser.add_argument("--max-level", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if not 1 <= args.min_level <= args.max_level <= 20:
+        parser.error("levels must satisfy 1 <= --min-level <= --max-level <= 20")
+
+    db.ensure_schema()
+    user_data = db.get_user(args.user)
+    if not user_data:
+        parser.error(f"No user found with username: {args.user}")
+
+    saved = generate_into_database(user_data[0], args.count, args.workers, args.batch_size, args.seed,
+                                   args.min_level, args.max_level)
+    print(f"Generated {saved} characters for {args.user}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Module: instrumentation.py
+
+Description:
+    Opt-in latency instrumentation. When enabled (`python main.py --instrument`, or TTRPG_INSTRUMENT=1), every
+    user_database function, auth.login and auth.register, and the MainWindowUI screen-open and event handlers
+    are wrapped so each call's duration goes into a per-function histogram. The histograms give call counts,
+    total and mean time, and p50/p95/p99. They can be viewed in a hidden panel in the app (Ctrl+Alt+P) and
+    are written to a JSON file every DUMP_INTERVAL seconds and when the app exits.
+
+    When instrumentation is off nothing is wrapped, so the functions run exactly as before with no overhead.
+
+    Histograms use logarithmic buckets (each 25% wider than the last, from 1 microsecond to about 10 minutes),
+    so recording a call costs one bisect and the memory used doesn't grow with the number of calls.
+    Percentiles are therefore accurate to within one bucket. Times are inclusive: when one wrapped function
+    calls another, both record the inner call's time. A generator function's time is the time spent inside
+    it while it is iterated, not the time the caller spends on each item.
+
+Dependencies:
+    - bisect: For finding a duration's bucket.
+    - threading: For the periodic dump and a lock, since database calls also come from worker threads.
+    - json, atexit: For the dump file.
+
+Usage:
+    instrumentation.install()                     # Wraps user_database and auth, starts the dump
+    instrumentation.instrument_class(ui.MainWindowUI, ui.INSTRUMENTED_HANDLER_PREFIXES)
+    instrumentation.report_rows() returns one row of statistics per function, slowest total first.
+"""
+import atexit
+import bisect
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+DUMP_PATH = os.environ.get("TTRPG_INSTRUMENT_FILE") or os.path.join(MODULE_DIR, "../database/instrumentation.json")
+DUMP_INTERVAL = 60
+
+BUCKET_GROWTH = 1.25
+BUCKET_BOUNDS = []  # Upper bound of each bucket in seconds, 1 microsecond to about 10 minutes
+bound = 1e-6
+while bound < 600:
+    BUCKET_BOUNDS.append(bound)
+    bound *= BUCKET_GROWTH
+del bound
+
+enabled = False
+histograms = {}
+started = time.time()
+_lock = threading.Lock()
+_dump_thread = None
+
+class Histogram:
+    def __init__(self, name):
+        self.name = name
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)  # The last bucket holds anything slower than the bounds
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        index = bisect.bisect_left(BUCKET_BOUNDS, seconds)
+        with _lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, fraction):
+        """Return the upper bound of the bucket holding the given fraction of calls, capped at the slowest call."""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(BUCKET_BOUNDS[index], self.max) if index < len(BUCKET_BOUNDS) else self.max
+        return self.max
+
+    def summary(self):
+        """Statistics in milliseconds, plus the non-empty buckets keyed by their upper bound in microseconds."""
+        return {
+            "calls": self.count,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(0.50) * 1000,
+            "p95_ms": self.percentile(0.95) * 1000,
+            "p99_ms": self.percentile(0.99) * 1000,
+            "max_ms": self.max * 1000,
+            "buckets_us": {(f"{BUCKET_BOUNDS[index] * 1e6:.0f}" if index < len(BUCKET_BOUNDS) else "inf"): count
+                           for index, count in enumerate(self.counts) if count},
+        }
+
+def get_histogram(name):
+    if name not in histograms:
+        histograms[name] = Histogram(name)
+    return histograms[name]
+
+# Wrapping
+def timed(name, function):
+    """Return function wrapped to record each call's duration under name."""
+    histogram = get_histogram(name)
+    perf_counter = time.perf_counter
+
+    if inspect.isgeneratorfunction(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            iterator = function(*args, **kwargs)
+            elapsed = 0.0
+            try:
+                while True:
+                    start = perf_counter()
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        break
+                    finally:
+                        elapsed += perf_counter() - start
+                    yield item
+            finally:
+                iterator.close()
+                histogram.record(elapsed)
+    else:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                histogram.record(perf_counter() - start)
+    wrapper.instrumented = True
+    return wrapper
+
+def instrument_module(module, names=None):
+    """Wrap the module's public functions (or just names) in place. Does nothing while disabled."""
+    if not enabled:
+        return 0
+    if names is None:
+        names = [name for name, value in vars(module).items()
+                 if inspect.isfunction(value) and value.__module__ == module.__name__ and not name.startswith("_")]
+    wrapped = 0
+    for name in names:
+        function = getattr(module, name)
+        if not getattr(function, "instrumented", False):
+            setattr(module, name, timed(f"{module.__name__}.{name}", function))
+            wrapped += 1
+    return wrapped
+
+def instrument_class(cls, prefixes):
+    """Wrap the class's methods whose names start with one of prefixes. Does nothing while disabled."""
+    if not enabled:
+        return 0
+    wrapped = 0
+    for name, value in list(vars(cls).items()):
+        if inspect.isfunction(value) and name.startswith(tuple(prefixes)) and not getattr(value, "instrumented", False):
+            setattr(cls, name, timed(f"{cls.__name__}.{name}", value))
+            wrapped += 1
+    return wrapped
+
+# Reporting
+def report_rows():
+    """Return (name, summary) for every function called so far, the largest total time first."""
+    rows = [(name, histogram.summary()) for name, histogram in list(histograms.items()) if histogram.count]
+    rows.sort(key=lambda row: -row[1]["total_ms"])
+    return rows
+
+def print_report():
+    print(f"{'Function':<48} {'calls':>8} {'total ms':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, summary in report_rows():
+        print(f"{name:<48} {summary['calls']:>8} {summary['total_ms']:>10.1f} {summary['p50_ms']:>9.2f} "
+              f"{summary['p95_ms']:>9.2f} {summary['p99_ms']:>9.2f} {summary['max_ms']:>9.2f}")
+
+def dump(path=None):
+    """Write every histogram to path as JSON, replacing the previous dump in one step."""
+    path = path or DUMP_PATH
+    snapshot = {
+        "written": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "uptime_seconds": time.time() - started,
+        "functions": dict(report_rows()),
+    }
+    temporary_path = path + ".tmp"
+    try:
+        with open(temporary_path, "w") as dump_file:
+            json.dump(snapshot, dump_file, indent=1)
+        os.replace(temporary_path, path)
+    except OSError as e:
+        print(f"Could not write instrumentation dump to {path}: {e}")
+
+def dump_periodically(path, interval):
+    while True:
+        time.sleep(interval)
+        dump(path)
+
+# Setup
+def enable():
+    global enabled
+    enabled = True
+
+def install(dump_path=None, dump_interval=DUMP_INTERVAL):
+    """Turn instrumentation on, wrap the data layer and auth, and start dumping every dump_interval seconds."""
+    global _dump_thread
+    import auth
+    import user_database
+    enable()
+    instrument_module(user_database)
+    instrument_module(auth, ("login", "register"))
+    if _dump_thread is None:
+        _dump_thread = threading.Thread(target=dump_periodically, args=(dump_path, dump_interval),
+                                        name="instrumentation-dump", daemon=True)
+        _dump_thread.start()
+        atexit.register(dump, dump_path)
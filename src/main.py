@@ -1,16 +1,87 @@
-# main.py
-
-import customtkinter
-import ui
-from ui import LoginRegisterUI
-from ui import MainWindowUI
-import user_database as db
-import auth
-import game_logic as gl
-
-if __name__== "__main__":
-    db.create_users_table()
-    db.create_characters_table()
-    root = customtkinter.CTk()
-    app_ui = ui.LoginRegisterUI(root)
-    root.mainloop()
\ No newline at end of file
+"""
+Module: main.py
+
+Description:
+    Starts the application: makes sure the database schema is current, opens the window, and shows the login
+    screen. Modules only needed after login are imported lazily (see startup.py), so the window appears
+    without waiting for the rules catalog, generator, planner, and so on.
+
+Usage:
+    python main.py
+    python main.py --profile-startup    Print how long each startup phase takes, then exit.
+    python main.py --instrument         Record call latencies: Ctrl+Alt+P shows them, and they are written to
+                                        database/instrumentation.json every minute (see instrumentation.py).
+    python main.py --audit-sql          Time every SQL statement and print them, with the query plans of slow
+                                        ones and any missing indexes, when the app exits (see sql_audit.py).
+    python main.py --serve [--host 127.0.0.1] [--port 8080]
+                                        Run the headless HTTP/JSON service (see service.py) instead of the window.
+"""
+import argparse
+import os
+import sys
+import startup
+
+def instrumentation_requested():
+    return os.environ.get("TTRPG_INSTRUMENT", "") not in ("", "0")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TTRPG character creation application.")
+    parser.add_argument("--profile-startup", action="store_true", help="Print per-phase startup timings and exit")
+    parser.add_argument("--serve", action="store_true", help="Run the headless HTTP/JSON service, no display needed")
+    parser.add_argument("--host", default=None, help="Address for --serve")
+    parser.add_argument("--port", type=int, default=None, help="Port for --serve")
+    parser.add_argument("--instrument", action="store_true", help="Record per-call latencies of the data layer and UI handlers")
+    parser.add_argument("--audit-sql", action="store_true", help="Trace SQL statements and report slow queries and full table scans at exit")
+    args = parser.parse_args(argv)
+    instrument = args.instrument or instrumentation_requested()
+    if args.audit_sql:
+        import sql_audit
+        sql_audit.install(report_at_exit=True)
+
+    if args.serve:
+        if instrument:
+            import instrumentation
+            instrumentation.install()
+        import service
+        service_args = []
+        if args.host:
+            service_args += ["--host", args.host]
+        if args.port:
+            service_args += ["--port", str(args.port)]
+        service.main(service_args)
+        return
+
+    profiler = startup.StartupProfiler()
+    with profiler.phase("import user_database"):
+        import user_database as db
+    with profiler.phase("schema check"):
+        db.ensure_schema()
+    with profiler.phase("import customtkinter"):
+        import customtkinter
+    with profiler.phase("import ui"):
+        import ui
+    if instrument:
+        with profiler.phase("instrumentation"):
+            import instrumentation
+            instrumentation.install()
+            instrumentation.instrument_class(ui.MainWindowUI, ui.INSTRUMENTED_HANDLER_PREFIXES)
+    with profiler.phase("create window"):
+        root = customtkinter.CTk()
+    with profiler.phase("build login screen"):
+        app_ui = ui.LoginRegisterUI(root)
+
+    if not args.profile_startup:
+        root.mainloop()
+        return
+
+    with profiler.phase("first paint"):
+        root.update()
+    # What the deferred imports cost when they are first used after login
+    for name in list(startup.lazy_modules):
+        with profiler.phase(f"deferred: import {name}"):
+            startup.load(name)
+    profiler.report()
+    root.destroy()
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,144 @@
+"""
+Module: planner.py
+
+Description:
+    Multiclass progression planner. Searches every way of splitting a character's total level across the
+    enabled classes and returns the best builds for a chosen objective (HP, Ability Score Improvements,
+    class features, Expertise, or skill bonuses from Jack of All Trades).
+
+    Each class gets a memoized prefix table holding its running totals at levels 0-20, so the value of
+    "N levels in a class" is a single lookup. A top-k knapsack over the classes then combines the tables,
+    which keeps a full search across all 14 classes in the millisecond range.
+
+Dependencies:
+    - functools: For memoizing prefix tables and finished plans.
+    - heapq: For keeping the top-k builds at every step.
+    - game_logic.py: For classes, class tables, hit dice, and proficiency bonus.
+
+Usage:
+    plan_multiclass(10, "hp", top_k=5) returns the five 10th level builds with the most HP.
+    Objectives can be combined with weights, e.g. plan_multiclass(12, {"asi": 3, "features": 1}).
+"""
+import heapq
+from functools import lru_cache
+import game_logic as gl
+
+MAX_LEVEL = 20
+MULTICLASS_MINIMUM_SCORE = 13
+
+OBJECTIVES = ["hp", "asi", "features", "expertise", "skills"]
+
+@lru_cache(maxsize=None)
+def get_prefix_table(class_name):
+    """Return running totals for levels 0-20 of one class: a list of dicts indexed by level."""
+    class_object = gl.get_class_by_name(class_name)
+    hit_die_value = int(class_object.hit_die[1:])
+    table = [{"hp": 0, "asi": 0, "features": 0, "expertise": 0, "jack_of_all_trades": False, "feature_names": ()}]
+    for level in range(1, MAX_LEVEL + 1):
+        previous = table[-1]
+        features = [feature.strip() for feature in class_object.class_table[level]["Features"].split(",") if feature.strip()]
+        table.append({
+            # Same rules as the character sheet: full hit die at a class's first level, average after that.
+            # Constitution is added per level separately since it doesn't depend on the split.
+            "hp": previous["hp"] + (hit_die_value if level == 1 else (hit_die_value // 2) + 1),
+            "asi": previous["asi"] + features.count("Ability Score Improvement"),
+            "features": previous["features"] + len(features),
+            "expertise": previous["expertise"] + features.count("Expertise"),
+            "jack_of_all_trades": previous["jack_of_all_trades"] or "Jack of All Trades" in features,
+            "feature_names": previous["feature_names"] + tuple(features),
+        })
+    return table
+
+def get_class_score(class_name, level, weights, total_level):
+    """Score of taking level levels in one class for the weighted objectives."""
+    row = get_prefix_table(class_name)[level]
+    score = 0
+    for objective, weight in weights:
+        if objective == "skills":
+            # Jack of All Trades adds half proficiency to every skill the character isn't proficient in
+            value = (gl.calculate_proficiency_bonus(total_level) // 2) * len(gl.get_skills()) if row["jack_of_all_trades"] else 0
+        else:
+            value = row[objective]
+        score += weight * value
+    return score
+
+def normalize_objective(objective):
+    """Turn an objective name or {objective: weight} dict into a hashable tuple of (objective, weight)."""
+    weights = {objective: 1} if isinstance(objective, str) else dict(objective)
+    for name in weights:
+        if name not in OBJECTIVES:
+            raise ValueError(f"Unknown objective: {name}. Choose from {', '.join(OBJECTIVES)}")
+    return tuple(sorted(weights.items()))
+
+@lru_cache(maxsize=256)
+def search_builds(total_level, weights, top_k, class_names, max_classes):
+    """
+    Top-k knapsack over classes. best[(levels, count)] holds the top builds using exactly that many levels
+    across that many classes, as (score, ((class, level), ...)) tuples. The class count is only tracked
+    when max_classes actually limits the search.
+    """
+    limit_classes = max_classes < len(class_names)
+    empty = ()
+    best = {(0, 0): [(0, empty)]}
+    for class_name in class_names:
+        scores = [get_class_score(class_name, level, weights, total_level) for level in range(MAX_LEVEL + 1)]
+        next_best = {}
+        for (used_levels, used_classes), builds in best.items():
+            for level in range(0, total_level - used_levels + 1):
+                class_count = used_classes + (1 if level and limit_classes else 0)
+                if class_count > max_classes:
+                    break
+                key = (used_levels + level, class_count)
+                split = ((class_name, level),) if level else empty
+                candidates = next_best.setdefault(key, [])
+                candidates.extend((score + scores[level], build + split) for score, build in builds)
+        best = {key: heapq.nlargest(top_k, candidates) for key, candidates in next_best.items()}
+
+    finished = []
+    for (used_levels, _), builds in best.items():
+        if used_levels == total_level:
+            finished.extend(builds)
+    return tuple(heapq.nlargest(top_k, finished))
+
+def describe_build(classes, score, total_level, constitution_modifier):
+    rows = [get_prefix_table(class_name)[level] for class_name, level in classes.items()]
+    return {
+        "classes": classes,
+        "score": score,
+        "max_hp": sum(row["hp"] for row in rows) + constitution_modifier * total_level,
+        "proficiency_bonus": gl.calculate_proficiency_bonus(total_level),
+        "asi": sum(row["asi"] for row in rows),
+        "features": [feature for row in rows for feature in row["feature_names"]],
+        "expertise": sum(row["expertise"] for row in rows),
+        "jack_of_all_trades": any(row["jack_of_all_trades"] for row in rows),
+    }
+
+def plan_multiclass(total_level, objective="features", top_k=5, class_names=None, ability_scores=None, max_classes=None):
+    """
+    Return the top_k builds for total_level, best first. Each build is a dict with the class split, its score,
+    and the resulting max HP, proficiency bonus, ASIs, features, Expertise count, and Jack of All Trades.
+
+    If ability_scores are given, classes whose primary ability is below 13 are only offered as single-class
+    builds, following the multiclassing prerequisites.
+    """
+    if not 1 <= total_level <= MAX_LEVEL:
+        raise ValueError(f"total_level must be between 1 and {MAX_LEVEL}")
+    weights = normalize_objective(objective)
+    class_names = tuple(name for name in class_names or gl.get_class_options() if gl.get_class_by_name(name))
+    max_classes = max_classes or len(class_names)
+    constitution_modifier = gl.calculate_ability_modifier(ability_scores[2]) if ability_scores else 0
+
+    multiclass_names = class_names
+    single_class_names = ()
+    if ability_scores:
+        scores = dict(zip(gl.get_ability_scores(), ability_scores))
+        meets_prerequisites = lambda name: all(scores[ability] >= MULTICLASS_MINIMUM_SCORE for ability in gl.get_class_by_name(name).primary_ability)
+        multiclass_names = tuple(name for name in class_names if meets_prerequisites(name))
+        single_class_names = tuple(name for name in class_names if not meets_prerequisites(name))
+
+    builds = list(search_builds(total_level, weights, top_k, multiclass_names, max_classes))
+    for class_name in single_class_names:
+        builds.extend(search_builds(total_level, weights, 1, (class_name,), 1))
+    builds = heapq.nlargest(top_k, builds)
+
+    return [describe_build(dict(split), score, total_level, constitution_modifier) for score, split in builds]
@@ -0,0 +1,179 @@
+"""
+Module: roll_history.py
+
+Description:
+    Keeps the dice rolls of a session. The most recent rolls live in a fixed size ring buffer, so memory
+    stays flat however long the session runs, while every roll is saved to the DiceRolls table in batches
+    instead of one write per roll.
+
+    Fairness statistics are kept per die size and updated in constant time as each roll arrives: face
+    counts, the running sum of squared counts, and from those a chi-square statistic and p-value against a
+    fair die. A low p-value over many rolls means the results are unlikely to come from a fair die.
+
+Dependencies:
+    - collections: For the ring buffer.
+    - math: For the chi-square p-value.
+    - time: For roll timestamps and flush timing.
+    - user_database.py: For saving rolls.
+
+Usage:
+    history = RollHistory(user_id)
+    history.record("d20", 20, [14])
+    history.fairness(20) returns counts, chi-square, and p-value for the d20 rolls so far.
+    history.flush() saves any rolls that haven't been written yet. This also happens automatically, once
+    FLUSH_SIZE rolls are waiting, or FLUSH_SECONDS after a roll when a timer is given (the Tk root, for its
+    after/after_cancel). Without a timer the time limit is only checked when the next roll comes in.
+"""
+import math
+import time
+from collections import deque
+import user_database as db
+
+HISTORY_SIZE = 500
+FLUSH_SIZE = 25
+FLUSH_SECONDS = 30
+
+# Chi-square p-value helpers (regularized upper incomplete gamma function)
+def gamma_series(a, x):
+    term = total = 1 / a
+    for n in range(1, 500):
+        term *= x / (a + n)
+        total += term
+        if abs(term) < abs(total) * 1e-12:
+            break
+    return total * math.exp(-x + a * math.log(x) - math.lgamma(a))
+
+def gamma_continued_fraction(a, x):
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for n in range(1, 500):
+        an = -n * (n - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-12:
+            break
+    return math.exp(-x + a * math.log(x) - math.lgamma(a)) * h
+
+def chi_square_p_value(statistic, degrees_of_freedom):
+    """Probability of a chi-square statistic at least this large from a fair die."""
+    if statistic <= 0:
+        return 1.0
+    a = degrees_of_freedom / 2
+    x = statistic / 2
+    if x < a + 1:
+        return max(0.0, 1 - gamma_series(a, x))
+    return min(1.0, gamma_continued_fraction(a, x))
+
+class DieStatistics:
+    """Face counts for one die size, with the chi-square statistic kept up to date incrementally."""
+    def __init__(self, sides):
+        self.sides = sides
+        self.counts = [0] * (sides + 1)  # Index 0 unused so faces index directly
+        self.rolls = 0
+        self.sum_of_squares = 0
+
+    def add(self, face):
+        count = self.counts[face]
+        # (c + 1)^2 - c^2 = 2c + 1
+        self.sum_of_squares += 2 * count + 1
+        self.counts[face] = count + 1
+        self.rolls += 1
+
+    def chi_square(self):
+        # sum((c - n/k)^2 / (n/k)) simplifies to k/n * sum(c^2) - n
+        if not self.rolls:
+            return 0.0
+        return self.sides * self.sum_of_squares / self.rolls - self.rolls
+
+    def summary(self):
+        statistic = self.chi_square()
+        return {
+            "sides": self.sides,
+            "rolls": self.rolls,
+            "counts": {face: self.counts[face] for face in range(1, self.sides + 1)},
+            "chi_square": statistic,
+            "p_value": chi_square_p_value(statistic, self.sides - 1) if self.rolls else 1.0,
+        }
+
+class RollHistory:
+    def __init__(self, user_id=None, size=HISTORY_SIZE, flush_size=FLUSH_SIZE, flush_seconds=FLUSH_SECONDS, timer=None):
+        self.user_id = user_id
+        self.rolls = deque(maxlen=size)
+        self.statistics = {}
+        self.pending = []
+        self.flush_size = flush_size
+        self.flush_seconds = flush_seconds
+        self.last_flush = time.monotonic()
+        self.saved = 0
+        self.timer = timer
+        self.flush_job = None
+
+    def record(self, label, sides, results, modifier=0):
+        """Add a roll of one or more dice of the same size. Returns the roll entry."""
+        total = sum(results) + modifier
+        roll = (self.user_id, time.time(), label, sides, tuple(results), modifier, total)
+        self.rolls.append(roll)
+        statistics = self.statistics.get(sides)
+        if statistics is None:
+            statistics = self.statistics[sides] = DieStatistics(sides)
+        for face in results:
+            statistics.add(face)
+
+        self.pending.append(roll)
+        if len(self.pending) >= self.flush_size or time.monotonic() - self.last_flush >= self.flush_seconds:
+            self.flush()
+        else:
+            # Save this roll even if no other roll follows it
+            self.schedule_flush()
+        return roll
+
+    def schedule_flush(self):
+        if self.timer is not None and self.flush_job is None:
+            self.flush_job = self.timer.after(int(self.flush_seconds * 1000), self.timed_flush)
+
+    def timed_flush(self):
+        self.flush_job = None
+        self.flush()
+
+    def flush(self):
+        """Save every roll that hasn't been written yet in one transaction. Rolls that couldn't be saved are kept."""
+        if self.pending:
+            written = db.add_rolls_to_db(self.pending)
+            self.saved += written
+            del self.pending[:written]
+        self.last_flush = time.monotonic()
+        if self.pending:
+            # The write failed (e.g. the database was locked), so try again on the next tick
+            self.schedule_flush()
+
+    def close(self):
+        """Save what's pending and cancel the flush timer, e.g. on logout."""
+        self.flush()
+        if self.flush_job is not None:
+            self.timer.after_cancel(self.flush_job)
+            self.flush_job = None
+
+    def recent(self, count=None):
+        rolls = list(self.rolls)
+        return rolls if count is None else rolls[-count:]
+
+    def fairness(self, sides=None):
+        """Statistics for one die size, or for every die size rolled so far."""
+        if sides is not None:
+            return self.statistics[sides].summary() if sides in self.statistics else DieStatistics(sides).summary()
+        return {sides: statistics.summary() for sides, statistics in sorted(self.statistics.items())}
+
+def format_fairness(summary):
+    if not summary["rolls"]:
+        return f"d{summary['sides']}: no rolls yet"
+    return (f"d{summary['sides']}: {summary['rolls']} rolls, chi-square {summary['chi_square']:.1f} "
+            f"(p = {summary['p_value']:.2f})")
@@ -0,0 +1,249 @@
+"""
+Module: roster_store.py
+
+Description:
+    Columnar in-memory store of every saved character, for roster-wide questions like "average Dexterity of
+    all Rogues" or "how many characters are proficient in Stealth". The roster is read from the database in
+    one bulk pass and kept as typed arrays: one column per ability score, one level column per class, a skill
+    bitmask column, and dictionary-encoded race and background columns. Filters, group-bys, and aggregates
+    run as tight loops over those columns without building Character objects.
+
+    The store refreshes incrementally: only characters added or deleted since the last refresh are read or
+    dropped, so keeping it up to date costs one ID query plus the changed rows.
+
+Dependencies:
+    - array: For the typed column storage.
+    - game_logic.py: For ability score names and skill bits.
+    - user_database.py: For the bulk character read.
+
+Usage:
+    store = get_roster_store()
+    rogues = store.select(class_name="Rogue")
+    store.aggregate("Dexterity", "mean", rogues)
+    len(store.select(skill="Stealth"))
+    store.group_by("race", "total_level", "mean")
+"""
+from array import array
+import game_logic as gl
+import user_database as db
+
+AGGREGATES = ["count", "sum", "mean", "min", "max"]
+GROUP_KEYS = ["race", "background", "user_id", "class", "skill"]
+
+_store = None
+
+class CategoryColumn:
+    """A column of repeated strings stored as small integer codes."""
+    def __init__(self):
+        self.values = array('H')
+        self.labels = []
+        self.codes = {}
+
+    def code(self, label):
+        if label not in self.codes:
+            self.codes[label] = len(self.labels)
+            self.labels.append(label)
+        return self.codes[label]
+
+    def append(self, label):
+        self.values.append(self.code(label or ""))
+
+    def label(self, row):
+        return self.labels[self.values[row]]
+
+class RosterStore:
+    def __init__(self):
+        self.character_ids = array('q')
+        self.user_ids = array('q')
+        self.abilities = {ability: array('h') for ability in gl.get_ability_scores()}
+        self.skill_masks = array('L')
+        self.total_levels = array('b')
+        self.class_levels = {}
+        self.races = CategoryColumn()
+        self.backgrounds = CategoryColumn()
+        self.rows_by_id = {}
+
+    def __len__(self):
+        return len(self.character_ids)
+
+    # Loading
+    def add(self, character_data):
+        """Append one character_data dict as a new row. Replaces the existing row for the same ID."""
+        character_id = character_data['character_id']
+        if character_id in self.rows_by_id:
+            self.remove(character_id)
+        row = len(self.character_ids)
+        self.rows_by_id[character_id] = row
+
+        self.character_ids.append(character_id)
+        self.user_ids.append(character_data.get('user_id') or 0)
+        for ability, score in zip(self.abilities, character_data['ability_scores']):
+            self.abilities[ability].append(score)
+        self.skill_masks.append(gl.skills_to_mask(character_data['skill_proficiencies']))
+        self.races.append(character_data['race'])
+        self.backgrounds.append(character_data['background'])
+
+        classes = character_data['classes']
+        for class_name in classes:
+            if class_name not in self.class_levels:
+                # New class: backfill zero levels for every existing row
+                self.class_levels[class_name] = array('b', bytes(row))
+        for class_name, levels in self.class_levels.items():
+            levels.append(classes.get(class_name, 0))
+        self.total_levels.append(sum(classes.values()))
+
+    def columns(self):
+        """Every per-row array, for operations that touch whole rows."""
+        return ([self.character_ids, self.user_ids, self.skill_masks, self.total_levels, self.races.values,
+                 self.backgrounds.values] + list(self.abilities.values()) + list(self.class_levels.values()))
+
+    def remove(self, character_id):
+        """Drop a character's row by moving the last row into its place. Returns False if it wasn't stored."""
+        row = self.rows_by_id.pop(character_id, None)
+        if row is None:
+            return False
+        last = len(self.character_ids) - 1
+        for column in self.columns():
+            if row != last:
+                column[row] = column[last]
+            column.pop()
+        if row != last:
+            self.rows_by_id[self.character_ids[row]] = row
+        return True
+
+    def refresh(self):
+        """Bring the store in line with the database. Returns (added, removed) counts."""
+        saved_ids = set(db.get_character_ids())
+        removed = [character_id for character_id in self.rows_by_id if character_id not in saved_ids]
+        for character_id in removed:
+            self.remove(character_id)
+
+        new_ids = saved_ids.difference(self.rows_by_id)
+        added = 0
+        if new_ids:
+            # An empty store reads the whole roster in one pass instead of by ID
+            characters = db.iter_characters() if not self.rows_by_id else db.iter_characters(character_ids=new_ids)
+            for character_data in characters:
+                self.add(character_data)
+                added += 1
+        return added, len(removed)
+
+    # Queries
+    def column(self, name):
+        """Return a column by name: an ability score, "total_level", "user_id", or a class name for its levels."""
+        if name in self.abilities:
+            return self.abilities[name]
+        if name == "total_level":
+            return self.total_levels
+        if name == "user_id":
+            return self.user_ids
+        if name in gl.get_class_options() or name in self.class_levels:
+            return self.class_levels.get(name, array('b', bytes(len(self))))
+        raise ValueError(f"Unknown column: {name}")
+
+    def select(self, class_name=None, race=None, background=None, skill=None, user_id=None, min_level=None,
+               max_level=None, rows=None):
+        """Return the row numbers matching every given condition, optionally narrowing an earlier selection."""
+        conditions = []
+        if class_name is not None:
+            levels = self.class_levels.get(class_name)
+            if levels is None:
+                return []
+            conditions.append((levels, lambda level: level > 0))
+        if race is not None:
+            if race not in self.races.codes:
+                return []
+            race_code = self.races.codes[race]
+            conditions.append((self.races.values, lambda value: value == race_code))
+        if background is not None:
+            if background not in self.backgrounds.codes:
+                return []
+            background_code = self.backgrounds.codes[background]
+            conditions.append((self.backgrounds.values, lambda value: value == background_code))
+        if skill is not None:
+            bit = gl.get_skill_bits().get(skill)
+            if bit is None:
+                return []
+            conditions.append((self.skill_masks, lambda mask: mask & bit))
+        if user_id is not None:
+            conditions.append((self.user_ids, lambda value: value == user_id))
+        if min_level is not None:
+            conditions.append((self.total_levels, lambda level: level >= min_level))
+        if max_level is not None:
+            conditions.append((self.total_levels, lambda level: level <= max_level))
+
+        if rows is None:
+            if not conditions:
+                return list(range(len(self)))
+            # The first condition scans its whole column, the rest only check rows that are still selected
+            column, test = conditions.pop(0)
+            rows = [row for row, value in enumerate(column) if test(value)]
+        for column, test in conditions:
+            rows = [row for row in rows if test(column[row])]
+        return rows
+
+    def aggregate(self, column, func="mean", rows=None):
+        """Aggregate a column over the selected rows (all rows by default). Empty selections give None."""
+        if func not in AGGREGATES:
+            raise ValueError(f"Unknown aggregate: {func}. Choose from {', '.join(AGGREGATES)}")
+        values = self.column(column)
+        if rows is not None:
+            values = [values[row] for row in rows]
+        if func == "count":
+            return len(values)
+        if func == "sum":
+            return sum(values)
+        if not len(values):
+            return None
+        if func == "mean":
+            return sum(values) / len(values)
+        return min(values) if func == "min" else max(values)
+
+    def group_rows(self, key, rows=None):
+        """Split rows into {group: [rows]}. "class" and "skill" put a row in every class or skill it has."""
+        if key not in GROUP_KEYS:
+            raise ValueError(f"Unknown group key: {key}. Choose from {', '.join(GROUP_KEYS)}")
+        rows = range(len(self)) if rows is None else rows
+        groups = {}
+        if key in ("race", "background"):
+            category = self.races if key == "race" else self.backgrounds
+            for row in rows:
+                groups.setdefault(category.values[row], []).append(row)
+            return {category.labels[code]: members for code, members in groups.items()}
+        if key == "user_id":
+            for row in rows:
+                groups.setdefault(self.user_ids[row], []).append(row)
+            return groups
+        if key == "class":
+            for class_name, levels in self.class_levels.items():
+                members = [row for row in rows if levels[row]]
+                if members:
+                    groups[class_name] = members
+            return groups
+        for skill, bit in gl.get_skill_bits().items():
+            members = [row for row in rows if self.skill_masks[row] & bit]
+            if members:
+                groups[skill] = members
+        return groups
+
+    def group_by(self, key, column=None, func="count", rows=None):
+        """Aggregate a column per group, e.g. group_by("class", "Dexterity", "mean"). Counts rows by default."""
+        if column is None:
+            return {group: len(members) for group, members in self.group_rows(key, rows).items()}
+        return {group: self.aggregate(column, func, members) for group, members in self.group_rows(key, rows).items()}
+
+    def skill_counts(self, rows=None):
+        """Number of characters proficient in each skill."""
+        counts = {skill: 0 for skill in gl.get_skills()}
+        counts.update(self.group_by("skill", rows=rows))
+        return counts
+
+def get_roster_store(refresh=True):
+    """Return the shared roster store, loading it on first use and refreshing it from the database."""
+    global _store
+    if _store is None:
+        _store = RosterStore()
+        _store.refresh()
+    elif refresh:
+        _store.refresh()
+    return _store
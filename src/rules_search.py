@@ -0,0 +1,169 @@
+"""
+Module: rules_search.py
+
+Description:
+    Keyword search over every piece of rules text in the application: skill, feat, and background
+    descriptions, race descriptions and traits, class descriptions, the features gained at each class level,
+    and subclass descriptions. Answers questions like "which class gets Expertise?" or "what grants
+    darkvision?".
+
+    All text is tokenized once into an inverted index (term -> documents with a TF-IDF weight, names counted
+    more heavily than body text). A query only touches the postings of its own terms. The last word of a query
+    is treated as a prefix so results show up while the user is still typing, with prefixes found by binary
+    search over the sorted term list. Recent queries are cached.
+
+Dependencies:
+    - bisect: For prefix lookups in the sorted term list.
+    - re, math: For tokenizing and TF-IDF weights.
+    - game_logic.py: For all rules text.
+
+Usage:
+    search("expertise") returns ranked result dicts with the kind, title, and a snippet of each match.
+"""
+import bisect
+import math
+import re
+from functools import lru_cache
+import game_logic as gl
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOP_WORDS = frozenset(["a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of",
+                        "on", "or", "that", "the", "their", "they", "this", "to", "what", "which", "who", "with"])
+TITLE_WEIGHT = 3
+MAX_PREFIX_TERMS = 50
+SNIPPET_LENGTH = 160
+
+_index = None
+
+def normalize_token(token):
+    # Light stemming so "skills" finds "skill" and "proficiencies" finds "proficiency"
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+def tokenize(text):
+    return [normalize_token(token) for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+def collect_documents():
+    """Gather every searchable piece of rules text as (kind, title, body) tuples."""
+    documents = []
+    for skill in gl.get_skills():
+        ability = gl.get_skill_abilities()[skill]
+        documents.append(("Skill", skill, f"{ability}. {gl.get_skill_description(skill)}"))
+    for feat in gl.get_feats():
+        if feat:
+            documents.append(("Feat", feat, gl.get_feat_descriptions(feat)))
+    for background in gl.get_background_options():
+        documents.append(("Background", background, gl.get_background_descriptions(background)))
+    for race_name in gl.get_race_options():
+        race_class = gl.get_race_map(race_name)
+        if isinstance(race_class, str):
+            continue
+        race = race_class()
+        documents.append(("Race", race_name, f"{race.description}\nTraits: {', '.join(race.racial_traits)}"))
+    for class_name in gl.get_class_options():
+        class_object = gl.get_class_by_name(class_name)
+        if class_object is None:
+            continue
+        documents.append(("Class", class_name, f"{class_object.description}\nHit Die: {class_object.hit_die}. "
+                          f"Primary Ability: {', '.join(class_object.primary_ability)}. "
+                          f"Saving Throws: {', '.join(class_object.saving_throws)}."))
+        # One document per level so results say exactly when a feature is gained
+        for level, details in class_object.class_table.items():
+            if details["Features"].strip():
+                documents.append(("Class Feature", f"{class_name} level {level}", details["Features"]))
+    for class_name, subclass_names in gl.get_subclass_options().items():
+        for subclass_name in subclass_names:
+            subclass = gl.get_subclass_by_name(subclass_name)
+            if subclass is not None:
+                documents.append(("Subclass", f"{subclass_name} ({class_name})", subclass.subclass_description))
+    return documents
+
+class SearchIndex:
+    def __init__(self, documents):
+        self.documents = documents
+        term_counts = []
+        document_frequency = {}
+        for kind, title, body in documents:
+            counts = {}
+            for token in tokenize(title):
+                counts[token] = counts.get(token, 0) + TITLE_WEIGHT
+            for token in tokenize(body):
+                counts[token] = counts.get(token, 0) + 1
+            term_counts.append(counts)
+            for token in counts:
+                document_frequency[token] = document_frequency.get(token, 0) + 1
+
+        # Postings: term -> {document number: TF-IDF weight}, normalized by document length
+        self.postings = {}
+        for number, counts in enumerate(term_counts):
+            length = math.sqrt(sum(count * count for count in counts.values())) or 1
+            for token, count in counts.items():
+                idf = math.log(1 + len(documents) / document_frequency[token])
+                self.postings.setdefault(token, {})[number] = count / length * idf
+        self.terms = sorted(self.postings)
+
+    def expand_prefix(self, prefix):
+        """Every indexed term starting with prefix, found by binary search over the sorted terms."""
+        start = bisect.bisect_left(self.terms, prefix)
+        end = bisect.bisect_right(self.terms, prefix + "￿", start)
+        return self.terms[start:min(end, start + MAX_PREFIX_TERMS)]
+
+    def search(self, query, limit=10):
+        """Rank documents for query. Documents matching more of the query's words always rank first."""
+        words = TOKEN_PATTERN.findall(query.lower())
+        if not words:
+            return []
+        # The last word may still be being typed, so it matches as a prefix
+        still_typing = not query[-1:].isspace()
+        term_groups = []
+        for position, word in enumerate(words):
+            if word in STOP_WORDS and position < len(words) - 1:
+                continue
+            terms = {normalize_token(word)} & self.postings.keys()
+            if position == len(words) - 1 and still_typing:
+                terms.update(self.expand_prefix(word))
+            if terms or word not in STOP_WORDS:
+                term_groups.append(terms)
+
+        scores = {}
+        matches = {}
+        for terms in term_groups:
+            group_scores = {}
+            for term in terms:
+                for number, weight in self.postings[term].items():
+                    group_scores[number] = max(group_scores.get(number, 0), weight)
+            for number, weight in group_scores.items():
+                scores[number] = scores.get(number, 0) + weight
+                matches[number] = matches.get(number, 0) + 1
+
+        ranked = sorted(scores, key=lambda number: (matches[number], scores[number]), reverse=True)[:limit]
+        return [self.describe(number, scores[number]) for number in ranked]
+
+    def describe(self, number, score):
+        kind, title, body = self.documents[number]
+        snippet = " ".join(body.split())
+        if len(snippet) > SNIPPET_LENGTH:
+            snippet = snippet[:SNIPPET_LENGTH].rsplit(" ", 1)[0] + "..."
+        return {"kind": kind, "title": title, "snippet": snippet, "score": score}
+
+def get_search_index():
+    """Return the shared index, building it the first time it is needed."""
+    global _index
+    if _index is None:
+        _index = SearchIndex(collect_documents())
+    return _index
+
+@lru_cache(maxsize=256)
+def cached_search(query, limit):
+    return tuple(get_search_index().search(query, limit))
+
+def search(query, limit=10):
+    return list(cached_search(query, limit))
+
+def format_results(results):
+    if not results:
+        return "No rules found."
+    return "\n\n".join(f"{result['title']} ({result['kind']}): {result['snippet']}" for result in results)
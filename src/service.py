@@ -0,0 +1,372 @@
+"""
+Module: service.py
+
+Description:
+    Headless HTTP/JSON service over the character engine, so players can use the app from a web front end
+    without a display server. Built on asyncio: one event loop accepts and parses every connection, database
+    calls run on a thread pool, and the expensive work (password key derivation, character generation) runs on
+    a process pool so it never blocks the loop or the other requests.
+
+    Endpoints (bodies and responses are JSON; all but /health and /login need "Authorization: Bearer <token>"):
+        GET    /health
+        POST   /login                 {"username", "password"} -> {"token", "user"}
+        POST   /logout
+        GET    /characters            ?offset=0&limit=50 -> {"total", "characters"}
+        POST   /characters            character_data -> {"character_id"}, or 422 with the rule violations
+        GET    /characters/<id>
+        PUT    /characters/<id>       character_data
+        DELETE /characters/<id>
+        POST   /characters/generate   {"count", "seed", "min_level", "max_level", "save"}
+        POST   /roll                  {"dice": "2d6+3"} or {"sides", "count", "modifier"}
+
+Dependencies:
+    - asyncio: For the server and request handling.
+    - concurrent.futures: For the database thread pool and the password/generation process pool.
+    - auth.py: For password checks.
+    - game_logic.py: For dice rolls.
+    - generator.py: For generating characters.
+    - user_database.py: For users and characters.
+    - validator.py: For checking characters before they are saved.
+
+Usage:
+    python main.py --serve [--host 127.0.0.1] [--port 8080]
+    python service.py --port 8080
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import re
+import secrets
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+import auth
+import game_logic as gl
+import generator
+import user_database as db
+import validator
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DB_WORKERS = 16
+MAX_BODY_BYTES = 1024 * 1024
+MAX_PAGE_SIZE = 500
+MAX_GENERATE = 500
+MAX_DICE = 100
+MAX_SIDES = 1000
+DICE_PATTERN = re.compile(r"^\s*(\d*)\s*d\s*(\d+)\s*(?:([+-])\s*(\d+))?\s*$", re.IGNORECASE)
+STATUS_TEXT = {200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request", 401: "Unauthorized",
+               403: "Forbidden", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+               422: "Unprocessable Entity", 500: "Internal Server Error"}
+
+class HTTPError(Exception):
+    def __init__(self, status, message, **details):
+        super().__init__(message)
+        self.status = status
+        self.payload = {"error": message, **details}
+
+def parse_dice(body):
+    """Read a roll request as (count, sides, modifier) from {"dice": "2d6+3"} or separate fields."""
+    if "dice" in body:
+        match = DICE_PATTERN.match(str(body["dice"]))
+        if not match:
+            raise HTTPError(400, "dice must look like 2d6, d20, or 4d6+2")
+        count = int(match.group(1) or 1)
+        sides = int(match.group(2))
+        modifier = int(match.group(4) or 0) * (-1 if match.group(3) == "-" else 1)
+    else:
+        try:
+            count = int(body.get("count", 1))
+            sides = int(body.get("sides", 20))
+            modifier = int(body.get("modifier", 0))
+        except (TypeError, ValueError):
+            raise HTTPError(400, "count, sides, and modifier must be integers")
+    if not 1 <= count <= MAX_DICE or not 2 <= sides <= MAX_SIDES:
+        raise HTTPError(400, f"Roll between 1 and {MAX_DICE} dice with 2 to {MAX_SIDES} sides")
+    return count, sides, modifier
+
+def text_field(body, field, default=None):
+    """A string field of a request body; optional when it has a default. Anything but a string is a 400."""
+    value = body[field] if default is None else body.get(field)
+    if value is None and default is not None:
+        return default
+    if not isinstance(value, str):
+        raise HTTPError(400, f"{field} must be a string")
+    return value
+
+def text_list_field(body, field):
+    """A list-of-strings field of a request body, empty when missing."""
+    values = body.get(field) or []
+    if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+        raise HTTPError(400, f"{field} must be a list of strings")
+    return values
+
+class CharacterService:
+    def __init__(self, db_workers=DB_WORKERS, cpu_workers=None):
+        self.db_executor = ThreadPoolExecutor(max_workers=db_workers, thread_name_prefix="db")
+        # Forking a process that already runs the database threads can deadlock the child, so workers start fresh
+        self.cpu_executor = ProcessPoolExecutor(max_workers=cpu_workers or os.cpu_count() or 1,
+                                                mp_context=multiprocessing.get_context("spawn"))
+        self.sessions = {}
+        self.requests = 0
+        self.routes = [
+            ("GET", re.compile(r"^/health$"), self.health, False),
+            ("POST", re.compile(r"^/login$"), self.login, False),
+            ("POST", re.compile(r"^/logout$"), self.logout, True),
+            ("GET", re.compile(r"^/characters$"), self.list_characters, True),
+            ("POST", re.compile(r"^/characters$"), self.create_character, True),
+            ("POST", re.compile(r"^/characters/generate$"), self.generate_characters, True),
+            ("GET", re.compile(r"^/characters/(\d+)$"), self.get_character, True),
+            ("PUT", re.compile(r"^/characters/(\d+)$"), self.update_character, True),
+            ("DELETE", re.compile(r"^/characters/(\d+)$"), self.delete_character, True),
+            ("POST", re.compile(r"^/roll$"), self.roll, True),
+        ]
+
+    # Executors
+    async def run_db(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.db_executor, function, *args)
+
+    async def run_cpu(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.cpu_executor, function, *args)
+
+    def shutdown(self):
+        self.db_executor.shutdown(wait=True)
+        self.cpu_executor.shutdown(wait=True)
+
+    # Connections
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one connection until the client closes it (HTTP/1.1 keep-alive)."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY_BYTES:
+                    await self.respond(writer, 413, {"error": "Request body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self.dispatch(method, target, headers, body)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass  # Malformed request or the client went away
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, payload, keep_alive):
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def dispatch(self, method, target, headers, body):
+        self.requests += 1
+        url = urlsplit(target)
+        try:
+            allowed = False
+            for route_method, pattern, handler, needs_login in self.routes:
+                match = pattern.match(url.path)
+                if not match:
+                    continue
+                allowed = True
+                if route_method != method:
+                    continue
+                session = self.authenticate(headers) if needs_login else None
+                request = {
+                    "session": session,
+                    "query": {key: values[-1] for key, values in parse_qs(url.query).items()},
+                    "body": self.parse_body(body),
+                    "headers": headers,
+                }
+                return await handler(request, *match.groups())
+            raise HTTPError(405 if allowed else 404, "Method not allowed" if allowed else "Not found")
+        except HTTPError as e:
+            return e.status, e.payload
+        except Exception as e:
+            print(f"Error handling {method} {url.path}: {e!r}")
+            return 500, {"error": "Internal server error"}
+
+    def parse_body(self, body):
+        if not body:
+            return {}
+        try:
+            parsed = json.loads(body)
+        except ValueError:
+            raise HTTPError(400, "Body must be JSON")
+        if not isinstance(parsed, dict):
+            raise HTTPError(400, "Body must be a JSON object")
+        return parsed
+
+    def authenticate(self, headers):
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        session = self.sessions.get(token.strip()) if scheme.lower() == "bearer" else None
+        if session is None:
+            raise HTTPError(401, "Log in first and send the token as 'Authorization: Bearer <token>'")
+        return session
+
+    async def load_owned_character(self, session, character_id):
+        character_data = await self.run_db(db.get_character, int(character_id))
+        if not character_data:
+            raise HTTPError(404, f"No character with ID {character_id}")
+        if character_data["user_id"] != session["user_id"] and not session["is_admin"]:
+            raise HTTPError(403, "That character belongs to another user")
+        return character_data
+
+    def read_character(self, body):
+        """Pull the character_data fields out of a request body and check them against the rules."""
+        try:
+            character_data = {
+                "name": str(body["name"]),
+                "race": text_field(body, "race"),
+                "background": text_field(body, "background", ""),
+                "classes": {str(class_name): int(level) for class_name, level in dict(body["classes"]).items()},
+                "subclasses": {str(class_name): str(subclass) for class_name, subclass in dict(body.get("subclasses") or {}).items()},
+                "ability_scores": [int(score) for score in body["ability_scores"]],
+                "skill_proficiencies": text_list_field(body, "skill_proficiencies"),
+                "feats": [feat for feat in text_list_field(body, "feats") if feat],
+                "is_jack_of_all_trades": bool(body.get("is_jack_of_all_trades", False)),
+            }
+        except KeyError as e:
+            raise HTTPError(400, f"Missing field: {e.args[0]}")
+        except (TypeError, ValueError):
+            raise HTTPError(400, "classes must map class names to levels, subclasses class names to subclasses, "
+                                 "and ability_scores must be integers")
+        violations = validator.validate_character(character_data)
+        if violations:
+            raise HTTPError(422, "Character breaks the rules", violations=violations)
+        return character_data
+
+    # Handlers. Each returns (status, payload).
+    async def health(self, request):
+        return 200, {"status": "ok", "sessions": len(self.sessions), "requests": self.requests}
+
+    async def login(self, request):
+        body = request["body"]
+        username = str(body.get("username", ""))
+        password = str(body.get("password", ""))
+        user_data = await self.run_db(db.get_user, username)
+        # The key derivation is deliberately slow, so it runs in a worker process
+        if not user_data or not await self.run_cpu(auth.check_password, password, user_data[2], user_data[3]):
+            raise HTTPError(401, "Invalid username or password")
+        user_id, username, _, _, email, is_admin = user_data
+        token = secrets.token_urlsafe(32)
+        self.sessions[token] = {"token": token, "user_id": user_id, "username": username, "is_admin": bool(is_admin)}
+        return 200, {"token": token, "user": {"user_id": user_id, "username": username, "email": email, "is_admin": bool(is_admin)}}
+
+    async def logout(self, request):
+        self.sessions.pop(request["session"]["token"], None)
+        return 204, None
+
+    async def list_characters(self, request):
+        try:
+            offset = max(0, int(request["query"].get("offset", 0)))
+            limit = min(MAX_PAGE_SIZE, max(1, int(request["query"].get("limit", 50))))
+        except ValueError:
+            raise HTTPError(400, "offset and limit must be integers")
+        user_id = request["session"]["user_id"]
+        total = await self.run_db(db.count_characters, user_id)
+        characters = await self.run_db(db.get_character_page, user_id, offset, limit)
+        return 200, {"total": total, "offset": offset, "characters": characters}
+
+    async def create_character(self, request):
+        character_data = self.read_character(request["body"])
+        character_id = await self.run_db(db.add_character_to_db, request["session"]["user_id"], character_data)
+        if character_id is None:
+            raise HTTPError(500, "Character could not be saved")
+        return 201, {"character_id": character_id}
+
+    async def get_character(self, request, character_id):
+        return 200, await self.load_owned_character(request["session"], character_id)
+
+    async def update_character(self, request, character_id):
+        await self.load_owned_character(request["session"], character_id)
+        character_data = self.read_character(request["body"])
+        if not await self.run_db(db.update_character, int(character_id), character_data):
+            raise HTTPError(404, f"No character with ID {character_id}")
+        return 200, {"character_id": int(character_id)}
+
+    async def delete_character(self, request, character_id):
+        await self.load_owned_character(request["session"], character_id)
+        await self.run_db(db.delete_character_from_db, int(character_id))
+        return 204, None
+
+    async def generate_characters(self, request):
+        body = request["body"]
+        try:
+            count = int(body.get("count", 1))
+            min_level = int(body.get("min_level", 1))
+            max_level = int(body.get("max_level", 20))
+        except (TypeError, ValueError):
+            raise HTTPError(400, "count, min_level, and max_level must be integers")
+        seed = body.get("seed")
+        if seed is not None and (isinstance(seed, bool) or not isinstance(seed, (int, str))):
+            raise HTTPError(400, "seed must be an integer or a string")
+        if not 1 <= count <= MAX_GENERATE:
+            raise HTTPError(400, f"count must be between 1 and {MAX_GENERATE}")
+        if not 1 <= min_level <= max_level <= 20:
+            raise HTTPError(400, "levels must satisfy 1 <= min_level <= max_level <= 20")
+
+        # Chunks are generated in parallel across the process pool, like generator.generate_characters
+        seeder = random.Random(seed)
+        chunks = [min(generator.CHUNK_SIZE, count - start) for start in range(0, count, generator.CHUNK_SIZE)]
+        results = await asyncio.gather(*(self.run_cpu(generator.generate_chunk, seeder.getrandbits(64), chunk, min_level, max_level)
+                                         for chunk in chunks))
+        characters = [character_data for chunk in results for character_data in chunk]
+        if body.get("save"):
+            saved = await self.run_db(db.add_characters_to_db, request["session"]["user_id"], characters)
+            return 201, {"saved": saved, "characters": characters}
+        return 200, {"characters": characters}
+
+    async def roll(self, request):
+        count, sides, modifier = parse_dice(request["body"])
+        results, total = gl.roll_dice_logic(sides, count)
+        return 200, {"dice": f"{count}d{sides}", "results": results, "modifier": modifier, "total": total + modifier}
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, db_workers=DB_WORKERS, cpu_workers=None, ready=None):
+    """Run the service until cancelled. ready, if given, is called with the server once it's listening."""
+    db.ensure_schema()
+    service = CharacterService(db_workers, cpu_workers)
+    # A deep backlog so bursts of hundreds of connections queue instead of being refused
+    server = await asyncio.start_server(service.handle_connection, host, port, backlog=1024)
+    addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"Serving on {addresses}")
+    try:
+        if ready:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.shutdown()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the character engine as an HTTP/JSON API.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--db-workers", type=int, default=DB_WORKERS, help="Threads for database calls")
+    parser.add_argument("--cpu-workers", type=int, default=None, help="Processes for password checks and generation (default: one per CPU)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.db_workers, args.cpu_workers))
+    except KeyboardInterrupt:
+        print("Stopped.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+Module: sheet_export.py
+
+Description:
+    Headless exporter that renders character sheets to a static HTML or Markdown document for printing, without
+    opening the Tk window. Each sheet shows what the in-app sheet derives from the saved character (through
+    game_logic.CharacterStats): ability modifiers, proficiency bonus, every skill's modifier with its
+    proficiency or expertise, max HP, initiative, and AC (unarmored, and with the best armor the character's
+    classes allow).
+
+    Characters are streamed out of the database in chunks and rendered across a process pool, with a few chunks
+    in flight per worker, so memory stays flat and thousands of sheets export in seconds. Sheets are written in
+    CharacterID order. Templates are compiled once per process into Python functions, so rendering a sheet
+    is a few joins instead of parsing the template again.
+
+    Expertise isn't saved with characters; a character_data dict with an 'expertise' list of skills (as the
+    sheet's checkboxes would give) is rendered with it.
+
+Dependencies:
+    - concurrent.futures: For rendering across CPU cores.
+    - html: For escaping names in HTML output.
+    - game_logic.py: For the derived values.
+    - user_database.py: For streaming characters.
+
+Usage:
+    python sheet_export.py --out campaign.html [--user <username>] [--format markdown] [--workers 4]
+    render_sheet(character_data, "html") returns one sheet as a string.
+"""
+import argparse
+import html
+import os
+import string
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import game_logic as gl
+import user_database as db
+
+CHUNK_SIZE = 200
+FORMATS = {"html": ".html", "markdown": ".md"}
+
+# Templates
+HTML_DOCUMENT = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+.sheet {{ page-break-after: always; margin-bottom: 3em; }}
+table {{ border-collapse: collapse; margin: 0.5em 0; }}
+th, td {{ border: 1px solid #999; padding: 2px 8px; text-align: left; }}
+td.number {{ text-align: right; }}
+</style>
+</head>
+<body>
+"""
+HTML_SHEET = """<section class="sheet">
+<h2>{name}</h2>
+<p>{race} {classes} &middot; {background}</p>
+<p><b>Level</b> {level} &middot; <b>Proficiency bonus</b> {proficiency_bonus} &middot; <b>Max HP</b> {max_hp} &middot; <b>Initiative</b> {initiative} &middot; <b>AC</b> {armor_class} ({armor_description})</p>
+<table>
+<tr><th>Ability</th><th>Score</th><th>Modifier</th></tr>
+{ability_rows}</table>
+<table>
+<tr><th>Skill</th><th>Ability</th><th>Modifier</th><th>Proficiency</th></tr>
+{skill_rows}</table>
+<p><b>Feats</b> {feats}</p>
+</section>
+"""
+HTML_ABILITY_ROW = '<tr><td>{ability}</td><td class="number">{score}</td><td class="number">{modifier}</td></tr>\n'
+HTML_SKILL_ROW = '<tr><td>{skill}</td><td>{ability}</td><td class="number">{modifier}</td><td>{proficiency}</td></tr>\n'
+HTML_END = "</body>\n</html>\n"
+
+MARKDOWN_DOCUMENT = "# {title}\n\n"
+MARKDOWN_SHEET = """## {name}
+
+{race} {classes} · {background}
+
+**Level** {level} · **Proficiency bonus** {proficiency_bonus} · **Max HP** {max_hp} · **Initiative** {initiative} · **AC** {armor_class} ({armor_description})
+
+| Ability | Score | Modifier |
+|---|--:|--:|
+{ability_rows}
+| Skill | Ability | Modifier | Proficiency |
+|---|---|--:|---|
+{skill_rows}
+**Feats** {feats}
+
+---
+
+"""
+MARKDOWN_ABILITY_ROW = "| {ability} | {score} | {modifier} |\n"
+MARKDOWN_SKILL_ROW = "| {skill} | {ability} | {modifier} | {proficiency} |\n"
+MARKDOWN_END = ""
+
+def compile_template(text):
+    """
+    Compile a format string into a Python function rendering it from a dict of values: the template is parsed
+    once, and the function is a single join over its literals and str() of its fields.
+    """
+    parts = []
+    for literal, field, _, _ in string.Formatter().parse(text):
+        if literal:
+            parts.append(repr(literal))
+        if field is not None:
+            parts.append(f"str(values[{field!r}])")
+    return eval(f"lambda values: ''.join(({', '.join(parts)},))")
+
+compiled_templates = {}
+
+def get_templates(output_format):
+    """The compiled (document, sheet, ability row, skill row, end) templates for a format, compiled once per process."""
+    if output_format not in compiled_templates:
+        if output_format == "html":
+            texts = (HTML_DOCUMENT, HTML_SHEET, HTML_ABILITY_ROW, HTML_SKILL_ROW)
+            end = HTML_END
+        elif output_format == "markdown":
+            texts = (MARKDOWN_DOCUMENT, MARKDOWN_SHEET, MARKDOWN_ABILITY_ROW, MARKDOWN_SKILL_ROW)
+            end = MARKDOWN_END
+        else:
+            raise ValueError(f"Unknown format: {output_format}. Choose from {', '.join(FORMATS)}")
+        compiled_templates[output_format] = tuple(compile_template(text) for text in texts) + (end,)
+    return compiled_templates[output_format]
+
+def escape_markdown(text):
+    return str(text).replace("|", "\\|").replace("*", "\\*").replace("_", "\\_")
+
+# Derived sheet values
+def signed(value):
+    return f"+{value}" if value >= 0 else str(value)
+
+sheet_stats = None
+
+def load_stats(character_data, expertise):
+    """One CharacterStats per process, switched to each character in turn instead of rebuilt for every sheet."""
+    global sheet_stats
+    if sheet_stats is None:
+        sheet_stats = gl.CharacterStats(character_data)
+    sheet_stats.load_character(character_data, expertise)
+    return sheet_stats
+
+def derive_sheet(character_data):
+    """Everything a sheet shows, as display strings (not yet escaped)."""
+    expertise = set(character_data.get('expertise', []))
+    stats = load_stats(character_data, expertise)
+    proficiencies = set(character_data.get('skill_proficiencies', []))
+    is_jack_of_all_trades = character_data.get('is_jack_of_all_trades', False)
+
+    abilities = []
+    for ability, score in zip(stats.abilities, character_data['ability_scores']):
+        abilities.append({"ability": ability, "score": score, "modifier": signed(stats.ability_modifier(ability))})
+
+    skills = []
+    for skill, ability in sorted(stats.skill_abilities.items()):
+        if skill in expertise:
+            proficiency = "Expertise"
+        elif skill in proficiencies:
+            proficiency = "Proficient"
+        elif is_jack_of_all_trades:
+            proficiency = "Jack of All Trades"
+        else:
+            proficiency = ""
+        skills.append({"skill": skill, "ability": ability[:3], "modifier": signed(stats.skill_modifier(skill)),
+                       "proficiency": proficiency})
+
+    classes = character_data.get('classes', {})
+    subclasses = character_data.get('subclasses', {})
+    dex_modifier = stats.ability_modifier("Dexterity")
+    armor_type, armor_name, shield_bonus, best_ac = gl.best_armor_loadout(dex_modifier, gl.get_armor_proficiencies(classes))
+    unarmored_ac = stats.get("armor_class")
+    if best_ac > unarmored_ac:
+        armor = armor_name + (" and shield" if shield_bonus else "")
+        armor_description = f"{best_ac} with {armor}"
+    else:
+        armor_description = "unarmored"
+
+    return {
+        "name": character_data['name'],
+        "race": character_data.get('race', ""),
+        "background": character_data.get('background') or "No background",
+        "classes": " / ".join(f"{class_name} {level}" + (f" ({subclasses[class_name]})" if subclasses.get(class_name) else "")
+                              for class_name, level in classes.items()),
+        "level": stats.get("total_level"),
+        "proficiency_bonus": signed(stats.get("proficiency_bonus")),
+        "max_hp": stats.get("max_hp"),
+        "initiative": signed(stats.get("initiative")),
+        "armor_class": unarmored_ac,
+        "armor_description": armor_description,
+        "feats": ", ".join(character_data.get('feats', [])) or "None",
+        "abilities": abilities,
+        "skills": skills,
+    }
+
+# Rendering
+def render_sheet(character_data, output_format="html"):
+    _, sheet_template, ability_row, skill_row, _ = get_templates(output_format)
+    escape = html.escape if output_format == "html" else escape_markdown
+    sheet = derive_sheet(character_data)
+    values = {key: escape(value) if isinstance(value, str) else value for key, value in sheet.items()}
+    values["ability_rows"] = "".join(ability_row(row) for row in sheet["abilities"])
+    values["skill_rows"] = "".join(skill_row(row) for row in sheet["skills"])
+    return sheet_template(values)
+
+def render_chunk(characters, output_format):
+    """Worker entry point: render a chunk of characters into one string."""
+    return "".join(render_sheet(character_data, output_format) for character_data in characters)
+
+def chunked(characters, chunk_size):
+    chunk = []
+    for character_data in characters:
+        chunk.append(character_data)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def render_chunks(characters, output_format="html", workers=None, chunk_size=CHUNK_SIZE):
+    """Yield (sheet count, rendered text) per chunk of characters, in order, rendering across a process pool."""
+    workers = workers or os.cpu_count() or 1
+    chunks = chunked(characters, chunk_size)
+
+    if workers == 1:
+        for chunk in chunks:
+            yield len(chunk), render_chunk(chunk, output_format)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        # Keep a few chunks in flight per worker so memory stays flat for huge exports
+        for chunk in chunks:
+            pending.append((len(chunk), executor.submit(render_chunk, chunk, output_format)))
+            if len(pending) >= workers * 2:
+                count, future = pending.popleft()
+                yield count, future.result()
+        while pending:
+            count, future = pending.popleft()
+            yield count, future.result()
+
+def export_sheets(path, output_format="html", user_id=None, character_ids=None, workers=None, chunk_size=CHUNK_SIZE,
+                  title="Character Sheets"):
+    """Write the sheets of a user's characters (or the given IDs, or everyone's) to path. Returns how many were written."""
+    document_template, _, _, _, end = get_templates(output_format)
+    escape = html.escape if output_format == "html" else escape_markdown
+    characters = db.iter_characters(user_id=user_id, character_ids=character_ids)
+    exported = 0
+    with open(path, "w", encoding="utf-8") as export_file:
+        export_file.write(document_template({"title": escape(title)}))
+        for count, text in render_chunks(characters, output_format, workers, chunk_size):
+            export_file.write(text)
+            exported += count
+        export_file.write(end)
+    return exported
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render character sheets to a static HTML or Markdown document.")
+    parser.add_argument("--out", required=True, help="Output file")
+    parser.add_argument("--format", choices=sorted(FORMATS), default=None, help="Output format (default: from the --out extension, else html)")
+    parser.add_argument("--user", default=None, help="Only this user's characters (default: everyone's)")
+    parser.add_argument("--ids", type=int, nargs="*", default=None, help="Only these CharacterIDs")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Characters per worker task")
+    parser.add_argument("--title", default="Character Sheets")
+    args = parser.parse_args(argv)
+
+    output_format = args.format or ("markdown" if args.out.endswith(FORMATS["markdown"]) else "html")
+    user_id = None
+    if args.user:
+        user_data = db.get_user(args.user)
+        if not user_data:
+            parser.error(f"No user found with username: {args.user}")
+        user_id = user_data[0]
+
+    start = time.perf_counter()
+    exported = export_sheets(args.out, output_format, user_id, args.ids, args.workers, args.chunk_size, args.title)
+    print(f"Exported {exported} sheets to {args.out} in {time.perf_counter() - start:.1f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Module: sql_audit.py
+
+Description:
+    Traces the SQL run through user_database connections to show why queries are slow. When installed, every
+    connection made by create_connection() uses AuditedConnection, whose cursors time each statement
+    (executing it and fetching its rows). Each distinct statement gets a call count, total and slowest time.
+    Statements count as the same when they differ only in the length of an IN (?, ?, ...) list.
+
+    The first time a statement takes longer than the slow-query threshold, its EXPLAIN QUERY PLAN is captured
+    with the same parameters. Plans are checked for full table scans: a filtered statement (one with a WHERE
+    clause) that scans a whole table, or has SQLite build a temporary automatic index, is missing an index.
+    A threshold of 0 explains every statement once.
+
+    Auditing is off unless installed, either with `python main.py --audit-sql` (the report is printed when
+    the app exits) or by running this module, which runs the data layer's lookups against a database:
+    python sql_audit.py [--db database/users.db]
+
+Dependencies:
+    - sqlite3: For the connection and cursor subclasses.
+    - threading: For a lock, since database calls also come from worker threads.
+    - user_database.py: The connections being audited.
+
+Usage:
+    sql_audit.install(threshold_ms=5)
+    ... use the app ...
+    sql_audit.print_report()
+"""
+import argparse
+import atexit
+import re
+import sqlite3
+import threading
+import time
+import user_database as db
+
+SLOW_QUERY_MS = 5
+REPORT_SQL_WIDTH = 110
+
+threshold = SLOW_QUERY_MS / 1000
+statements = {}
+_lock = threading.Lock()
+
+class StatementStats:
+    def __init__(self, sql):
+        self.sql = sql
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.slow_calls = 0
+        self.plan = None
+        self.full_scans = []
+
+    @property
+    def flagged(self):
+        return bool(self.full_scans)
+
+def normalize(sql):
+    """Collapse whitespace and IN (?, ?, ...) lists so one statement with different list lengths is counted once."""
+    sql = " ".join(sql.split())
+    return re.sub(r"\?(\s*,\s*\?)+", "?, ...", sql)
+
+def get_stats(sql):
+    key = normalize(sql)
+    with _lock:
+        if key not in statements:
+            statements[key] = StatementStats(key)
+        return statements[key]
+
+# Query plans
+def explain(conn, sql, parameters=()):
+    """Return the EXPLAIN QUERY PLAN rows (id, parent, detail) for sql, or None if it can't be explained."""
+    try:
+        # A plain cursor, so explaining isn't itself audited
+        rows = sqlite3.Cursor(conn).execute("EXPLAIN QUERY PLAN " + sql, parameters).fetchall()
+    except sqlite3.Error:
+        return None  # e.g. DDL and PRAGMAs
+    return [(row[0], row[1], row[-1]) for row in rows]
+
+def find_full_scans(sql, plan):
+    """Return the plan steps that show a missing index in a filtered statement."""
+    if not plan or " WHERE " not in f" {sql.upper()} ":
+        return []
+    full_scans = []
+    for _, _, detail in plan:
+        # SQLite before 3.36 says "SCAN TABLE Characters", later versions "SCAN Characters"
+        scan = re.match(r"SCAN (?:TABLE )?(\w+)", detail)
+        if scan and scan.group(1) not in ("CONSTANT", "SUBQUERY") and " USING " not in detail:
+            full_scans.append(detail)
+        elif "AUTOMATIC" in detail:
+            full_scans.append(detail)
+    return full_scans
+
+def record(cursor, elapsed):
+    """Add elapsed to the cursor's current statement, explaining it the first time it runs slow."""
+    stats = cursor.audit_stats
+    cursor.audit_elapsed += elapsed
+    with _lock:
+        stats.total += elapsed
+        if cursor.audit_elapsed > stats.max:
+            stats.max = cursor.audit_elapsed
+    if cursor.audit_elapsed >= threshold and not cursor.audit_counted_slow:
+        cursor.audit_counted_slow = True
+        with _lock:
+            stats.slow_calls += 1
+        if stats.plan is None and cursor.audit_parameters is not None:
+            stats.plan = explain(cursor.connection, cursor.audit_sql, cursor.audit_parameters) or []
+            stats.full_scans = find_full_scans(stats.sql, stats.plan)
+
+# Audited connection
+class AuditedCursor(sqlite3.Cursor):
+    audit_stats = None
+
+    def start_statement(self, sql, parameters):
+        self.audit_stats = get_stats(sql)
+        self.audit_sql = sql
+        self.audit_parameters = parameters
+        self.audit_elapsed = 0.0
+        self.audit_counted_slow = False
+        with _lock:
+            self.audit_stats.calls += 1
+
+    def execute(self, sql, parameters=()):
+        self.start_statement(sql, parameters)
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            record(self, time.perf_counter() - start)
+
+    def executemany(self, sql, seq_of_parameters):
+        self.start_statement(sql, None)  # There's no single set of parameters to explain with
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            record(self, time.perf_counter() - start)
+
+    def timed_fetch(self, fetch, *args):
+        if self.audit_stats is None:
+            return fetch(*args)
+        start = time.perf_counter()
+        try:
+            return fetch(*args)
+        finally:
+            record(self, time.perf_counter() - start)
+
+    def fetchone(self):
+        return self.timed_fetch(super().fetchone)
+
+    def fetchmany(self, *args):
+        return self.timed_fetch(super().fetchmany, *args)
+
+    def fetchall(self):
+        return self.timed_fetch(super().fetchall)
+
+    def __next__(self):
+        return self.timed_fetch(super().__next__)
+
+class AuditedConnection(sqlite3.Connection):
+    def cursor(self, factory=AuditedCursor):
+        return super().cursor(factory)
+
+    # Connection.execute would run the statement on the C cursor directly, skipping AuditedCursor.execute
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+def install(threshold_ms=SLOW_QUERY_MS, report_at_exit=False):
+    """Audit every connection user_database makes from now on."""
+    global threshold
+    threshold = threshold_ms / 1000
+    db.connection_factory = AuditedConnection
+    if report_at_exit:
+        atexit.register(print_report)
+
+def uninstall():
+    db.connection_factory = sqlite3.Connection
+
+# Reporting
+def report_rows():
+    """Return the StatementStats of every statement run so far, the largest total time first."""
+    with _lock:
+        rows = list(statements.values())
+    rows.sort(key=lambda stats: -stats.total)
+    return rows
+
+def print_report():
+    rows = report_rows()
+    print(f"{'calls':>7} {'total ms':>10} {'max ms':>9} {'slow':>5}  statement (slow = over {threshold * 1000:g} ms)")
+    for stats in rows:
+        flag = "SCAN " if stats.flagged else "     "
+        sql = stats.sql if len(stats.sql) <= REPORT_SQL_WIDTH else stats.sql[:REPORT_SQL_WIDTH - 3] + "..."
+        print(f"{stats.calls:>7} {stats.total * 1000:>10.2f} {stats.max * 1000:>9.2f} {stats.slow_calls:>5}  {flag}{sql}")
+
+    flagged = [stats for stats in rows if stats.flagged]
+    if flagged:
+        print(f"\n{len(flagged)} filtered statements scan a whole table (missing index):")
+    for stats in flagged:
+        print(f"  {stats.sql}")
+        for _, _, detail in stats.plan:
+            print(f"      {detail}{'   <-- full scan' if detail in stats.full_scans else ''}")
+
+# Running the data layer's lookups
+def audit_lookups(user_id=None):
+    """Run each read path of user_database once, for user_id (or the user with the most characters)."""
+    users = db.get_all_users()
+    if not users:
+        print("The database has no users to audit lookups for.")
+        return
+    if user_id is None:
+        user_id = max(users, key=lambda user: db.count_characters(user[0]))[0]
+    user = db.get_user_by_id(user_id)
+    character_ids = db.get_character_ids(user_id)
+    db.get_user(user[1])
+    db.get_user_characters(user)
+    db.count_characters(user_id)
+    db.get_character_name_page(user_id, 0, 50)
+    db.get_character_page(user_id, 0, 50)
+    list(db.iter_characters(user_id=user_id))
+    list(db.iter_characters(character_ids=character_ids[:50]))
+    if character_ids:
+        db.get_character(character_ids[-1])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Trace user_database's queries and flag missing indexes.")
+    parser.add_argument("--db", default=None, help="Database file (default: the app's database)")
+    parser.add_argument("--user-id", type=int, default=None, help="User whose lookups to run (default: the one with the most characters)")
+    parser.add_argument("--threshold-ms", type=float, default=0, help="Explain statements slower than this (default: explain all)")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        db.DB_PATH = args.db
+    install(args.threshold_ms)
+    audit_lookups(args.user_id)
+    print_report()
+
+if __name__ == "__main__":
+    main()
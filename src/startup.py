@@ -0,0 +1,67 @@
+"""
+Module: startup.py
+
+Description:
+    Helpers for a fast cold start. lazy_import() returns a module object whose code only runs the first time
+    one of its attributes is used, so the modules behind later screens (game rules, generator, planner, rules
+    search, ...) aren't loaded before the login window is drawn. StartupProfiler times each phase of startup
+    for `python main.py --profile-startup`.
+
+Dependencies:
+    - importlib: For the lazy module loader.
+    - time: For phase timings.
+
+Usage:
+    gl = startup.lazy_import("game_logic")   # Loaded on the first gl.<attribute>
+    profiler = StartupProfiler()
+    with profiler.phase("import ui"):
+        import ui
+    profiler.report()
+"""
+import importlib.util
+import sys
+import time
+from contextlib import contextmanager
+
+lazy_modules = []
+
+def lazy_import(name):
+    """Return the module called name, deferring its import until one of its attributes is first used."""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named {name!r}")
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    lazy_modules.append(name)
+    return module
+
+def load(name):
+    """Finish loading a lazily imported module now."""
+    return getattr(sys.modules[name], "__file__", None)
+
+class StartupProfiler:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name):
+        modules_before = len(sys.modules)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, (time.perf_counter() - start) * 1000, len(sys.modules) - modules_before))
+
+    def report(self):
+        total = (time.perf_counter() - self.start) * 1000
+        width = max([len(name) for name, _, _ in self.phases] + [5])
+        print(f"{'Phase':<{width}}  {'ms':>8}  {'modules':>7}")
+        for name, milliseconds, modules in self.phases:
+            print(f"{name:<{width}}  {milliseconds:8.1f}  {modules:7d}")
+        print(f"{'Total':<{width}}  {total:8.1f}  {len(sys.modules):7d}")
@@ -0,0 +1,97 @@
+"""
+Module: typeahead.py
+
+Description:
+    Type-to-select for the read-only comboboxes. While a combobox has focus, the keys typed are collected
+    into a buffer (reset after a short pause) and the first option starting with the buffer is selected,
+    ignoring case, as if the user had picked it from the dropdown.
+
+    Every option list is indexed once: its case-folded names are sorted so a prefix is found by binary search
+    in O(log n), however long the list. Indexes are cached per list, so the comboboxes sharing a list (every
+    multiclass row, every feat row) share one index.
+
+Dependencies:
+    - bisect: For prefix lookups in the sorted options.
+    - time: For resetting the typed buffer after a pause.
+
+Usage:
+    typeahead.attach(combobox) indexes the combobox's current values and handles typing.
+    typeahead.set_options(combobox, options) changes the values and the index together.
+"""
+import bisect
+import time
+from functools import lru_cache
+
+TYPING_TIMEOUT = 1.0
+
+class TypeaheadIndex:
+    def __init__(self, options):
+        # Ties keep the original order, so duplicates complete to the one listed first
+        entries = sorted((str(option).casefold(), position, option) for position, option in enumerate(options))
+        self.keys = [key for key, _, _ in entries]
+        self.options = [option for _, _, option in entries]
+
+    def complete(self, prefix):
+        """First option (alphabetically) that starts with prefix, or None."""
+        key = prefix.casefold()
+        position = bisect.bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position].startswith(key):
+            return self.options[position]
+        return None
+
+@lru_cache(maxsize=64)
+def get_index(options):
+    """Return the index for a tuple of options, building it the first time that list is seen."""
+    return TypeaheadIndex(options)
+
+class Typeahead:
+    def __init__(self, combobox, options):
+        self.combobox = combobox
+        self.index = get_index(tuple(options))
+        self.typed = ""
+        self.last_key = 0.0
+
+    def set_options(self, options):
+        self.index = get_index(tuple(options))
+        self.typed = ""
+
+    def on_key(self, event):
+        if event.keysym == "BackSpace":
+            self.typed = self.typed[:-1]
+        elif event.keysym == "Escape":
+            self.typed = ""
+            return None
+        elif len(event.char) == 1 and event.char.isprintable():
+            now = time.monotonic()
+            if now - self.last_key > TYPING_TIMEOUT:
+                self.typed = ""
+            self.last_key = now
+            self.typed += event.char
+        else:
+            return None  # Arrow keys, Return, Tab, ... keep their usual behavior
+
+        if not self.typed:
+            return "break"
+        match = self.index.complete(self.typed)
+        if match is None and len(self.typed) > 1:
+            # Nothing starts with the whole buffer, so start over from this key
+            self.typed = self.typed[-1]
+            match = self.index.complete(self.typed)
+        if match is not None and str(match) != self.combobox.get():
+            self.combobox.set(match)
+            self.combobox.event_generate("<<ComboboxSelected>>")
+        return "break"
+
+def attach(combobox, options=None):
+    """Add typeahead to a combobox, indexing options (default: its current values)."""
+    handler = Typeahead(combobox, combobox.cget("values") if options is None else options)
+    combobox.bind("<KeyPress>", handler.on_key, add="+")
+    combobox.typeahead = handler
+    return handler
+
+def set_options(combobox, options):
+    """Replace a combobox's values, re-indexing them if it has typeahead."""
+    combobox['values'] = options
+    handler = getattr(combobox, "typeahead", None)
+    if handler is not None:
+        handler.set_options(options)
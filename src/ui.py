@@ -3,7 +3,9 @@ Module: ui.py
 
 Description:
     This module manages the application GUI by maintaining a root window and creating or destroying
-    frames within that window as required for different UI displays. 
+    frames within that window as required for different UI displays. The main menu, character creation,
+    dice roller, and character list screens are built once and then kept hidden while other screens are
+    shown, and every screen's widgets are torn down by ScreenManager when they are no longer needed.
 
 Dependencies:
     - tkinter: to display messages and some GUI displays
@@ -14,12 +16,27 @@ Dependencies:
     - user_database.py: Database module used to manage all database-related functionality.
 """
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import customtkinter
 import auth
-import game_logic as gl
 import user_database as db
+import startup
+# Everything past the login screen is loaded the first time it's used
+gl = startup.lazy_import("game_logic")
+admin_jobs = startup.lazy_import("admin_jobs")
+generator = startup.lazy_import("generator")
+planner = startup.lazy_import("planner")
+roll_history = startup.lazy_import("roll_history")
+rules_search = startup.lazy_import("rules_search")
+typeahead = startup.lazy_import("typeahead")
+virtual_list = startup.lazy_import("virtual_list")
+validator = startup.lazy_import("validator")
+instrumentation = startup.lazy_import("instrumentation")
+import atexit
+import gc
 import random
+import time
+from collections import OrderedDict
 
 class LoginRegisterUI:
     def __init__(self, root):
@@ -140,6 +157,340 @@ class LoginRegisterUI:
         back_button = customtkinter.CTkButton(master=register_frame, text="Back", command=self.open_login_frame)
         back_button.pack(pady=10)
     
+MAX_CACHED_SCREENS = 3
+SCREEN_IDLE_SECONDS = 600
+
+MAX_VISIBLE_ROLLS = 100
+LEVEL_OPTIONS = list(range(1, 21))
+JOB_POLL_MILLISECONDS = 200
+PERFORMANCE_PANEL_MILLISECONDS = 1000
+# MainWindowUI methods timed by --instrument: opening screens and handling events
+INSTRUMENTED_HANDLER_PREFIXES = ("open_", "on_", "roll_", "add_", "remove_", "delete_", "create_character", "auto_generate_",
+                                 "suggest_", "search_", "update_", "increase_", "decrease_", "refresh_", "logout")
+
+class Screen:
+    def __init__(self, name, cached):
+        self.name = name
+        self.cached = cached
+        self.frames = []
+        self.attributes = {}
+        self.variables = []
+        self.builds = 0
+        self.shows = 0
+        self.last_shown = time.monotonic()
+        self.build_milliseconds = 0.0
+        self.section_milliseconds = {}
+
+class LazySections:
+    """
+    Parts of a screen that are only built the first time they are viewed. Each section's builder fills a
+    container that the screen created empty, so building later doesn't change the layout.
+    """
+    def __init__(self, screens, screen_name):
+        self.screens = screens
+        self.screen_name = screen_name
+        self.builders = {}
+
+    def add(self, section, build):
+        self.builders[section] = build
+
+    def ensure(self, section):
+        """Build the section if it hasn't been built yet. Returns True if it was built now."""
+        build = self.builders.pop(section, None)
+        if build is None:
+            return False
+        return self.screens.build_section(self.screen_name, section, build)
+
+    def ensure_later(self, section, widget):
+        """Build the section once Tk is idle, i.e. after the rest of the screen has been drawn."""
+        widget.after_idle(lambda: widget.winfo_exists() and self.ensure(section))
+
+class ScreenManager:
+    """
+    Owns the widgets of every screen and decides when they are built, hidden, and torn down.
+
+    Cached screens are built once and kept alive, hidden, while other screens are shown. Screen builders store
+    their widgets as attributes of the owning UI object (self.tooltip, self.dice_result_text, ...), and
+    different screens reuse the same names. The manager records which attributes a screen set while it was
+    built and rebinds them whenever the screen is shown again, so handlers always see the widgets of the
+    visible screen.
+
+    Screens that aren't cached (the character sheet, the admin panel) are torn down as soon as another screen
+    is shown, as are cached screens that haven't been shown for SCREEN_IDLE_SECONDS or the least recently used
+    one once more than MAX_CACHED_SCREENS are cached. Teardown destroys the screen's frames, unsets the Tk
+    variables it created, and drops the attributes that still point at its objects. Anything else found in the
+    root window is destroyed and counted as untracked.
+    """
+    def __init__(self, root, owner, max_screens=MAX_CACHED_SCREENS, idle_seconds=SCREEN_IDLE_SECONDS):
+        self.root = root
+        self.owner = owner
+        self.max_screens = max_screens
+        self.idle_seconds = idle_seconds
+        self.screens = OrderedDict()
+        self.current = None
+        self.build_count = 0
+        self.show_count = 0
+        self.teardown_count = 0
+        self.untracked_destroyed = 0
+
+    def show(self, name, build, refresh=None, cached=True):
+        """Show the named screen, building it with build() if needed. refresh() rebinds its data."""
+        self.hide_all()
+        screen = self.screens.get(name)
+        if screen is not None and not all(frame.winfo_exists() for frame, _ in screen.frames):
+            # Something outside the manager destroyed it
+            self.teardown(name)
+            screen = None
+
+        if screen is None:
+            screen = self.build(name, build, cached)
+        else:
+            vars(self.owner).update(screen.attributes)
+            for frame, pack_options in screen.frames:
+                frame.pack(**pack_options)
+            screen.shows += 1
+            self.show_count += 1
+
+        screen.last_shown = time.monotonic()
+        self.screens.move_to_end(name)
+        self.current = name
+        self.evict()
+        if refresh:
+            refresh()
+
+    def build(self, name, build, cached):
+        screen = Screen(name, cached)
+        children_before = set(self.root.winfo_children())
+        attributes_before = dict(vars(self.owner))
+        variables_before = set(self.tk_variable_names())
+        start = time.perf_counter()
+
+        build()
+
+        screen.build_milliseconds = (time.perf_counter() - start) * 1000
+
+        for frame in self.root.winfo_children():
+            if frame not in children_before and frame.winfo_manager() == "pack":
+                pack_options = frame.pack_info()
+                pack_options.pop("in", None)
+                screen.frames.append((frame, pack_options))
+        screen.attributes = {key: value for key, value in vars(self.owner).items()
+                             if attributes_before.get(key, self) is not value}
+        screen.variables = [variable for variable in self.tk_variable_names() if variable not in variables_before]
+        screen.builds += 1
+        self.build_count += 1
+        self.screens[name] = screen
+        return screen
+
+    def build_section(self, name, section, build):
+        """Build part of a screen after the screen itself, tracking its attributes and Tk variables as the screen's."""
+        screen = self.screens.get(name)
+        if screen is None or name != self.current:
+            return False
+        attributes_before = dict(vars(self.owner))
+        variables_before = set(self.tk_variable_names())
+        start = time.perf_counter()
+
+        build()
+
+        screen.section_milliseconds[section] = (time.perf_counter() - start) * 1000
+        screen.attributes.update({key: value for key, value in vars(self.owner).items()
+                                  if attributes_before.get(key, self) is not value})
+        screen.variables.extend(variable for variable in self.tk_variable_names() if variable not in variables_before)
+        return True
+
+    def hide_all(self):
+        """Hide cached screens, tear down the others, and destroy anything left in the root window."""
+        screen = self.screens.get(self.current)
+        if screen is not None:
+            # Handlers may have replaced some attributes (e.g. a rebuilt list) since the screen was shown
+            screen.attributes = {key: getattr(self.owner, key) for key in screen.attributes if hasattr(self.owner, key)}
+        self.current = None
+
+        for name in [name for name, screen in self.screens.items() if not screen.cached]:
+            self.teardown(name)
+        cached_frames = {frame for screen in self.screens.values() for frame, _ in screen.frames}
+        for widget in self.root.winfo_children():
+            if widget in cached_frames:
+                widget.pack_forget()
+            elif isinstance(widget, tk.Toplevel):
+                continue
+            else:
+                widget.destroy()
+                self.untracked_destroyed += 1
+
+    def teardown(self, name):
+        screen = self.screens.pop(name)
+        for frame, _ in screen.frames:
+            frame.destroy()
+        # Tk variables outlive their widgets while Python still holds them (e.g. in expertise_vars)
+        for variable in screen.variables:
+            if self.root.getboolean(self.root.tk.call("info", "exists", variable)):
+                self.root.tk.globalunsetvar(variable)
+        owner_attributes = vars(self.owner)
+        for key, value in screen.attributes.items():
+            if owner_attributes.get(key, self) is value:
+                del owner_attributes[key]
+        self.teardown_count += 1
+
+    def evict(self):
+        now = time.monotonic()
+        for name in list(self.screens):
+            screen = self.screens[name]
+            too_many = len(self.screens) > self.max_screens
+            idle = now - screen.last_shown > self.idle_seconds
+            if name != self.current and (too_many or idle):
+                self.teardown(name)
+
+    # Leak accounting
+    def tk_variable_names(self):
+        return [name for name in self.root.tk.splitlist(self.root.tk.call("info", "globals")) if name.startswith("PY_VAR")]
+
+    def count_widgets(self, widget):
+        return 1 + sum(self.count_widgets(child) for child in widget.winfo_children())
+
+    def counters(self):
+        """Live counts per screen and for the whole window. Growth in the totals between visits means a leak."""
+        screens = {}
+        for name, screen in self.screens.items():
+            screens[name] = {
+                "visible": name == self.current,
+                "widgets": sum(self.count_widgets(frame) for frame, _ in screen.frames if frame.winfo_exists()),
+                "tk_variables": sum(1 for variable in screen.variables if self.root.getboolean(self.root.tk.call("info", "exists", variable))),
+                "builds": screen.builds,
+                "shows": screen.shows,
+                "build_milliseconds": screen.build_milliseconds,
+                "section_milliseconds": dict(screen.section_milliseconds),
+            }
+        return {
+            "screens": screens,
+            "widgets": self.count_widgets(self.root) - 1,
+            "tk_variables": len(self.tk_variable_names()),
+            # Walks the whole heap, so it is only counted here, when the counters are asked for
+            "python_objects": len(gc.get_objects()),
+            "builds": self.build_count,
+            "shows": self.show_count,
+            "teardowns": self.teardown_count,
+            "untracked_destroyed": self.untracked_destroyed,
+        }
+
+    def print_counters(self, event=None):
+        counters = self.counters()
+        print(f"Widgets: {counters['widgets']}, Tk variables: {counters['tk_variables']}, Python objects: {counters['python_objects']}")
+        print(f"Builds: {counters['builds']}, shows: {counters['shows']}, teardowns: {counters['teardowns']}, "
+              f"untracked widgets destroyed: {counters['untracked_destroyed']}")
+        for name, screen in counters["screens"].items():
+            state = "visible" if screen["visible"] else "hidden"
+            print(f"    {name} ({state}): {screen['widgets']} widgets, {screen['tk_variables']} Tk variables, "
+                  f"{screen['builds']} builds, {screen['shows']} shows")
+            sections = "".join(f", {section} {milliseconds:.1f} ms" for section, milliseconds in screen["section_milliseconds"].items())
+            print(f"        built in {screen['build_milliseconds']:.1f} ms{sections}")
+
+class UpdateScheduler:
+    """
+    Coalesces widget updates. Handlers mark an update as due under a key instead of running it; all due updates
+    run once, in a single after_idle flush at the end of the event-loop turn. If the same key is marked again
+    before the flush (several events in one turn, or two handlers redrawing the same widget) only the last
+    update runs, and the earlier ones are counted as dropped.
+    """
+    def __init__(self, root):
+        self.root = root
+        self.pending = OrderedDict()
+        self.scheduled = None
+        self.marked = 0
+        self.run = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+        self.dropped_by_key = {}
+
+    def mark(self, key, update):
+        self.marked += 1
+        if key in self.pending:
+            self.dropped += 1
+            self.dropped_by_key[key] = self.dropped_by_key.get(key, 0) + 1
+        self.pending[key] = update
+        if self.scheduled is None:
+            self.scheduled = self.root.after_idle(self.flush)
+
+    def flush(self):
+        self.scheduled = None
+        pending = self.pending
+        self.pending = OrderedDict()
+        for update in pending.values():
+            try:
+                update()
+                self.run += 1
+            except tk.TclError:
+                # The widget was destroyed (e.g. the screen closed) before the update ran
+                self.failed += 1
+        self.flushes += 1
+
+    def counters(self):
+        return {"marked": self.marked, "run": self.run, "dropped": self.dropped, "failed": self.failed,
+                "flushes": self.flushes, "dropped_by_key": dict(self.dropped_by_key)}
+
+    def print_counters(self):
+        counters = self.counters()
+        print(f"UI updates: {counters['marked']} marked, {counters['run']} run in {counters['flushes']} flushes, "
+              f"{counters['dropped']} redundant dropped, {counters['failed']} for destroyed widgets")
+        for key, dropped in sorted(counters["dropped_by_key"].items(), key=lambda item: -item[1]):
+            print(f"    {key}: {dropped} dropped")
+
+class PerformancePanel:
+    """
+    Hidden window (Ctrl+Alt+P) listing the latency statistics collected by instrumentation.py, refreshed every
+    PERFORMANCE_PANEL_MILLISECONDS while it is open. Shows how to turn instrumentation on when it is off.
+    """
+    COLUMNS = ("calls", "total_ms", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+
+    def __init__(self, root):
+        self.root = root
+        self.window = None
+        self.refresh_job = None
+
+    def toggle(self, event=None):
+        if self.window is not None and self.window.winfo_exists():
+            self.close()
+        else:
+            self.open()
+
+    def open(self):
+        self.window = customtkinter.CTkToplevel(self.root)
+        self.window.title("Performance")
+        self.window.geometry("900x400")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        if not instrumentation.enabled:
+            label = customtkinter.CTkLabel(master=self.window, text="Instrumentation is off. Start the app with --instrument (or TTRPG_INSTRUMENT=1).")
+            label.pack(padx=20, pady=20)
+            return
+        self.tree = ttk.Treeview(self.window, columns=self.COLUMNS)
+        self.tree.heading("#0", text="Function")
+        self.tree.column("#0", width=320)
+        for column in self.COLUMNS:
+            self.tree.heading(column, text=column.replace("_ms", " ms"))
+            self.tree.column(column, width=80, anchor="e")
+        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
+        self.refresh()
+
+    def refresh(self):
+        self.refresh_job = None
+        if self.window is None or not self.window.winfo_exists():
+            return
+        self.tree.delete(*self.tree.get_children())
+        for name, summary in instrumentation.report_rows():
+            values = [summary["calls"]] + [f"{summary[column]:.2f}" for column in self.COLUMNS[1:]]
+            self.tree.insert("", "end", text=name, values=values)
+        self.refresh_job = self.root.after(PERFORMANCE_PANEL_MILLISECONDS, self.refresh)
+
+    def close(self):
+        if self.refresh_job is not None:
+            self.root.after_cancel(self.refresh_job)
+            self.refresh_job = None
+        if self.window is not None:
+            self.window.destroy()
+            self.window = None
+
 class MainWindowUI:
     def __init__(self, root, on_logout_callback, current_user=None):
         self.root = root
@@ -149,14 +500,23 @@ class MainWindowUI:
         self.class_selections = []
         self.expertise_vars = {}
         self.skill_buttons = {}
+        self.screens = ScreenManager(root, self)
+        self.roll_history = roll_history.RollHistory(current_user.user_id if current_user else None, timer=root)
+        # Rolls still waiting for a batch write are saved when the app closes
+        atexit.register(self.roll_history.flush)
+        self.updates = UpdateScheduler(root)
+        # Hidden shortcut for checking widget and memory growth in long sessions
+        self.root.bind("<Control-Alt-w>", self.print_counters)
+        self.performance_panel = PerformancePanel(root)
+        self.root.bind("<Control-Alt-p>", self.performance_panel.toggle)
 
     def set_current_user(self, username):
         self.current_user = username 
 
     def open_main_window(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.screens.show("main", self.build_main_window)
 
+    def build_main_window(self):
         self.main_frame = customtkinter.CTkFrame(master=self.root)
         self.main_frame.pack(padx=10, pady=10, fill="both", expand=True)
         self.header_frame = customtkinter.CTkFrame(master=self.main_frame)
@@ -199,17 +559,17 @@ class MainWindowUI:
         self.admin_button.pack(pady=10)
 
     def open_admin_panel(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
-        
-        main_ui_instance = MainWindowUI(self.root, self.on_logout_callback, self.current_user)
-        admin_ui = AdminUI(self.root, self.current_user, self.open_main_window, self)
-        admin_ui.initialize_ui()
+        self.screens.show("admin_panel", self.build_admin_panel, cached=False)
+
+    def build_admin_panel(self):
+        self.admin_ui = AdminUI(self.root, self.current_user, self.open_main_window, self)
+        self.admin_ui.initialize_ui()
         
     def open_character_creation_frame(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.screens.show("character_creation", self.build_character_creation_frame)
 
+    def build_character_creation_frame(self):
+        self.class_selections = []
         self.main_frame = customtkinter.CTkFrame(master=self.root)
         self.main_frame.pack(fill="both", expand=True, padx=10, pady=10)
         self.main_frame.grid_columnconfigure(0, weight=1)
@@ -279,7 +639,7 @@ class MainWindowUI:
 
         self.levels_label = customtkinter.CTkLabel(master=self.selection_frame, text="Levels:")
         self.levels_label.grid(row=1, column=2, pady=10)
-        self.levels_combobox = ttk.Combobox(master=self.selection_frame, values=list(range(1, 21)), state="readonly")
+        self.levels_combobox = ttk.Combobox(master=self.selection_frame, values=LEVEL_OPTIONS, state="readonly")
         self.levels_combobox.grid(row=1, column=3, padx=5, pady=10)
 
         self.subclass_label = customtkinter.CTkLabel(master=self.selection_frame, text="Select Subclass:")
@@ -290,6 +650,8 @@ class MainWindowUI:
 
         add_class_button = customtkinter.CTkButton(master=self.selection_frame, text="Add Multiclass", command=self.add_multiclass)
         add_class_button.grid(row=1, column=6, padx=5, pady=10)
+        plan_class_button = customtkinter.CTkButton(master=self.selection_frame, text="Suggest Multiclass", command=self.suggest_multiclass)
+        plan_class_button.grid(row=1, column=7, padx=5, pady=10)
 
         # setting defaults to Aeva
         self.race_combobox.set("Human")
@@ -297,28 +659,18 @@ class MainWindowUI:
         self.levels_combobox.set(1)
         self.background_combobox.set("Spy")
 
-        # Bind to key release event to handle the input and prevent user from editing the value
-        def handle_keyrelease_event(event):
-            # Check if the Combobox is focused
-            if self.race_combobox == self.selection_frame.focus_get():
-                # Get the current text in the Combobox
-                typed = self.race_combobox.get()
-                
-                if typed:  # If something is typed
-                    # Find the closest match in the options
-                    match = next((s for s in race_options if s.lower().startswith(typed.lower())), None)
-                    if match:
-                        self.race_combobox.set(match)  # Set the Combobox value to the matched option
-                    return "break"  # Stop further propagation of the key release event
-
-                self.race_combobox.set(typed)
-        
-        self.race_combobox.bind('<KeyRelease>', handle_keyrelease_event)
-        self.race_combobox.bind("<<ComboboxSelected>>", self.on_race_selection_change)
-        self.background_combobox.bind("<<ComboboxSelected>>", self.on_background_selection_change)
+        # Typing while a combobox has focus selects the first option starting with what was typed
+        typeahead.attach(self.race_combobox, race_options)
+        typeahead.attach(self.background_combobox, background_options)
+        typeahead.attach(self.class_combobox, self.class_options)
+        typeahead.attach(self.levels_combobox, LEVEL_OPTIONS)
+        typeahead.attach(self.subclass_combobox, [])
+        # Everything shown in the tooltip goes through one "description" update, so only the last one per turn is drawn
+        self.race_combobox.bind("<<ComboboxSelected>>", lambda event: self.updates.mark("description", self.on_race_selection_change))
+        self.background_combobox.bind("<<ComboboxSelected>>", lambda event: self.updates.mark("description", self.on_background_selection_change))
         self.class_combobox.bind("<<ComboboxSelected>>", self.on_combobox_selected)
         self.levels_combobox.bind("<<ComboboxSelected>>", self.on_combobox_selected)
-        self.subclass_combobox.bind("<<ComboboxSelected>>", self.update_subclass_description)
+        self.subclass_combobox.bind("<<ComboboxSelected>>", lambda event: self.updates.mark("description", self.update_subclass_description))
         
         # Skills
         skills_label = customtkinter.CTkLabel(master=self.skills_frame, text="Select Skills")
@@ -327,11 +679,14 @@ class MainWindowUI:
         def update_selected_skills(skill_index, value):
             if value == 1:
                 self.selected_skills.append(gl.get_skills()[skill_index])
-                for skill in self.selected_skills:
-                    self.change_description_text(self.tooltip, gl.get_skill_description(skill))
             else:
-                selected_skills.remove(gl.get_skills()[skill_index])
-                for skill in self.selected_skills:
+                self.selected_skills.remove(gl.get_skills()[skill_index])
+            self.updates.mark("description", show_selected_skill_description)
+
+        def show_selected_skill_description():
+            # The description shown is the one of the most recently selected skill
+            if self.selected_skills:
+                self.change_description_text(self.tooltip, gl.get_skill_description(self.selected_skills[-1]))
 
         skills = []
         for index, skill in enumerate(gl.get_skills()):
@@ -374,9 +729,17 @@ class MainWindowUI:
         # Create Tooltip Desctiptions / cheatsheet
         tooltip_label = customtkinter.CTkLabel(self.tooltip_frame, text="Description", font=("Impact", 16))
         tooltip_label.pack(padx=10, pady=(10, 0))
+        self.rules_search_entry = customtkinter.CTkEntry(self.tooltip_frame, width=500, placeholder_text="Search the rules (e.g. Expertise, darkvision)")
+        self.rules_search_entry.pack(padx=10, pady=(5, 0))
+        self.rules_search_entry.bind("<KeyRelease>", self.search_rules)
+        # Build the index now so the first keystroke doesn't wait for it
+        rules_search.get_search_index()
 
         self.decription_text = "As you build your character keen an eye over here for more information. Select stuff to see what they do!\n\nSelect a Race, Background, and Class. If you are starting at level 3 or higher, select a Subclass as well."
         self.tooltip = customtkinter.CTkLabel(self.tooltip_frame, width=500, height=100, wraplength=500, text=self.decription_text)
+        self.text = self.decription_text
+        self.text_before_search = self.decription_text
+        self.search_results_text = None
         self.tooltip.pack(padx=10, pady=(0, 10))  
 
         # Feats
@@ -387,6 +750,7 @@ class MainWindowUI:
 
         self.feats = gl.get_feats()
         self.feat_combobox = ttk.Combobox(self.feats_frame, values=self.feats, state="readonly")
+        typeahead.attach(self.feat_combobox, self.feats)
         self.feat_combobox.grid(row=2, column=0, padx=10, pady=10)
 
         self.feat_selections = []
@@ -409,9 +773,9 @@ class MainWindowUI:
         back_button.pack(pady=10)
 
     def open_dice_roller_frame(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.screens.show("dice_roller", self.build_dice_roller_frame)
 
+    def build_dice_roller_frame(self):
         self.main_frame = customtkinter.CTkFrame(master=self.root)
         self.main_frame.pack(padx=10, pady=10, fill="both", expand=True)
         self.header_frame = customtkinter.CTkFrame(master=self.main_frame)
@@ -484,15 +848,19 @@ class MainWindowUI:
 
         clear_button = customtkinter.CTkButton(master=self.results_frame, text="Clear", command=self.clear_totals)
         clear_button.pack(pady=10)
+
+        # Fairness of every die rolled this session
+        self.fairness_label = customtkinter.CTkLabel(master=self.results_frame, text="", justify="left")
+        self.fairness_label.pack(pady=10)
+        self.update_fairness_label()
+
         back_button = customtkinter.CTkButton(master=self.footer_frame, text="Back", command=self.open_main_window)
         back_button.pack(pady=10)
 
     def open_character_lists_frame(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
-
-        self.current_user.load_characters()
+        self.screens.show("character_lists", self.build_character_lists_frame, self.refresh_character_list)
 
+    def build_character_lists_frame(self):
         self.main_frame = customtkinter.CTkFrame(master=self.root)
         self.main_frame.pack(padx=10, pady=10, fill="both", expand=True)
         self.header_frame = customtkinter.CTkFrame(master=self.main_frame)
@@ -508,39 +876,80 @@ class MainWindowUI:
         label = customtkinter.CTkLabel(master=self.header_frame, text="Character List", font=("Roboto", 18))
         label.pack(fill="both", expand=True, pady=(0, 10), padx=10)
 
-        if hasattr(self, 'current_user') and self.current_user:
-            character_list = self.current_user.get_characters()
-        else:
-            print("No current user set or user has no characters.")
-            character_list = []
-
         self.create_character_button = customtkinter.CTkButton(master=self.body_frame, text="New Character", command=self.open_character_creation_frame)
         self.create_character_button.pack(padx=10, pady=10)
-        self.character_list_frame = customtkinter.CTkScrollableFrame(master=self.body_frame, bg_color="transparent")
-        self.character_list_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
-        # Create buttons for each character
-        for idx, character in enumerate(character_list):
-            character_button = customtkinter.CTkButton(
-                master=self.character_list_frame,
-                text=(character),
-                fg_color="transparent",
-                bg_color="transparent",
-                width=800,
-                height=60,
-                command=lambda c=character: self.open_character_sheet(c))
-            character_button.grid(row=idx, column=0, sticky="w", pady=5)
-
-            delete_character_button = customtkinter.CTkButton(
-                master=self.character_list_frame, 
-                text="Delete Character", 
-                hover_color="red",
-                command=lambda c=character: self.delete_character(c.character_id))
-            delete_character_button.grid(row=idx, column=1, sticky="e", padx=50, pady=5)
+        # Group skill check for the whole roster
+        self.group_check_frame = customtkinter.CTkFrame(master=self.body_frame)
+        self.group_check_frame.pack(fill="x", padx=10, pady=(0, 10))
+        group_check_label = customtkinter.CTkLabel(master=self.group_check_frame, text="Group Skill Check:")
+        group_check_label.grid(row=0, column=0, padx=10, pady=10)
+        self.group_skill_combobox = ttk.Combobox(master=self.group_check_frame, values=gl.get_skills(), state="readonly")
+        self.group_skill_combobox.grid(row=0, column=1, padx=5, pady=10)
+        self.group_skill_combobox.set("Perception")
+        dc_label = customtkinter.CTkLabel(master=self.group_check_frame, text="DC:")
+        dc_label.grid(row=0, column=2, padx=5, pady=10)
+        self.group_dc_entry = customtkinter.CTkEntry(master=self.group_check_frame, width=50)
+        self.group_dc_entry.grid(row=0, column=3, padx=5, pady=10)
+        self.group_dc_entry.insert(0, "15")
+        self.group_mode_combobox = ttk.Combobox(master=self.group_check_frame, values=gl.ROLL_MODES, state="readonly")
+        self.group_mode_combobox.grid(row=0, column=4, padx=5, pady=10)
+        self.group_mode_combobox.set("normal")
+        group_roll_button = customtkinter.CTkButton(master=self.group_check_frame, text="Roll for All",
+                                                    command=self.roll_group_check_for_roster)
+        group_roll_button.grid(row=0, column=5, padx=10, pady=10)
+        self.group_result_text = customtkinter.CTkTextbox(master=self.group_check_frame, height=80)
+        self.group_result_text.grid(row=1, column=0, columnspan=6, sticky="ew", padx=10, pady=(0, 10))
+
+        # Only the rows in view exist; characters are read from the database a page at a time
+        self.character_source = virtual_list.PagedSource(self.count_characters, self.load_character_page)
+        self.character_list_frame = virtual_list.VirtualList(self.body_frame, self.character_source, self.create_character_row,
+                                                             self.update_character_row, row_height=70, bg_color="transparent")
+        self.character_list_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
         back_button = customtkinter.CTkButton(master=self.footer_frame, text="Back", command=self.open_main_window)
         back_button.pack(padx=10, pady=10)
 
+    def refresh_character_list(self):
+        """Re-read the character rows; the rest of the screen is kept between visits."""
+        self.character_source.invalidate()
+        self.character_list_frame.refresh()
+
+    def count_characters(self):
+        if hasattr(self, 'current_user') and self.current_user:
+            return db.count_characters(self.current_user.user_id)
+        print("No current user set or user has no characters.")
+        return 0
+
+    def load_character_page(self, offset, limit):
+        characters = [gl.Character(character_data) for character_data in db.get_character_page(self.current_user.user_id, offset, limit)]
+        # Best possible AC for the whole page comes from one batched lookup
+        return list(zip(characters, gl.best_ac_for_characters(characters)))
+
+    def create_character_row(self, parent):
+        row = customtkinter.CTkFrame(master=parent, fg_color="transparent")
+        row.character_button = customtkinter.CTkButton(
+            master=row,
+            text="",
+            fg_color="transparent",
+            bg_color="transparent",
+            width=800,
+            height=60)
+        row.character_button.grid(row=0, column=0, sticky="w", pady=5)
+
+        row.delete_button = customtkinter.CTkButton(
+            master=row, 
+            text="Delete Character", 
+            hover_color="red")
+        row.delete_button.grid(row=0, column=1, sticky="e", padx=50, pady=5)
+        return row
+
+    def update_character_row(self, row, item, index):
+        character, best_ac = item
+        row.character_button.configure(text=f"{character} - Best AC: {best_ac}",
+                                       command=lambda c=character: self.open_character_sheet(c))
+        row.delete_button.configure(command=lambda c=character: self.delete_character(c.character_id))
+
     def open_character_sheet(self, character):
         self.character_name = character.name
         self.selected_race = character.race
@@ -561,11 +970,32 @@ class MainWindowUI:
             'feats': self.selected_feats,
             'skill_proficiencies': self.selected_skills,  # Make sure this is set correctly
             'is_jack_of_all_trades': self.is_jack_of_all_trades,
-            'classes': {cls.name: level for cls, level, _ in class_objects}
+            'classes': {cls.name: level for cls, level, _ in class_objects},
+            'subclasses': character.subclasses
         }
     
         self.create_character_sheet(self.character_data)
 
+    def roll_group_check_for_roster(self):
+        self.current_user.load_characters()
+        self.roll_group_check(self.current_user.get_characters())
+
+    def roll_group_check(self, character_list):
+        skill = self.group_skill_combobox.get()
+        try:
+            dc = int(self.group_dc_entry.get())
+        except ValueError:
+            messagebox.showerror("Group Skill Check", "DC must be a whole number.")
+            return
+        results = gl.resolve_skill_checks(character_list, skill, dc, self.group_mode_combobox.get())
+        passed = sum(1 for result in results if result['success'])
+
+        self.group_result_text.delete("1.0", "end")
+        self.group_result_text.insert("end", f"{skill} DC {dc}: {passed}/{len(results)} passed\n")
+        for result in results:
+            outcome = "Pass" if result['success'] else "Fail"
+            self.group_result_text.insert("end", f"{result['name']}: {result['rolls']} + {result['modifier']} = {result['total']} ({outcome})\n")
+
     def delete_character(self, character_id):
         response = messagebox.askyesno("Delete Character", "Are you sure you want to delete this character? This action cannot be undone.")
         if response:
@@ -573,9 +1003,31 @@ class MainWindowUI:
             db.delete_character_from_db(character_id)
             self.open_character_lists_frame() 
 
+    def print_counters(self, event=None):
+        self.screens.print_counters()
+        self.updates.print_counters()
+
     def logout(self):
+        self.performance_panel.close()
+        self.roll_history.close()
+        atexit.unregister(self.roll_history.flush)
         self.on_logout_callback()
 
+    def show_roll(self, text):
+        """Add a line to the roll results, keeping only the last MAX_VISIBLE_ROLLS lines in the widget."""
+        self.dice_result_text.insert("end", text + "\n")
+        line_count = int(self.dice_result_text.index("end-1c").split(".")[0])
+        if line_count > MAX_VISIBLE_ROLLS + 1:
+            self.dice_result_text.delete("1.0", f"{line_count - MAX_VISIBLE_ROLLS}.0")
+        self.dice_result_text.see("end")
+        self.update_fairness_label()
+
+    def update_fairness_label(self):
+        fairness_label = getattr(self, "fairness_label", None)
+        if fairness_label is not None and fairness_label.winfo_exists():
+            lines = [roll_history.format_fairness(summary) for summary in self.roll_history.fairness().values()]
+            fairness_label.configure(text="Fairness (chi-square vs. a fair die):\n" + "\n".join(lines) if lines else "")
+
     def display_dice_results(self, results):
         self.dice_result_text.delete("1.0", "end")
         self.total_text.delete("1.0", "end")
@@ -589,8 +1041,8 @@ class MainWindowUI:
         self.total_text.delete("1.0", "end")
 
     def on_combobox_selected(self, event):
-        self.update_subclass_options(self.class_combobox, self.levels_combobox, self.subclass_combobox)
-        self.update_class_description()
+        self.updates.mark("starting_subclass_options", lambda: self.update_subclass_options(self.class_combobox, self.levels_combobox, self.subclass_combobox))
+        self.updates.mark("description", self.update_class_description)
         self.starter_class = self.class_combobox.get()
 
     def update_subclass_options(self, class_combobox, levels_combobox, subclass_combobox):
@@ -599,22 +1051,26 @@ class MainWindowUI:
 
         if selected_class and selected_level and int(selected_level) >= 3:
             new_subclass_options = gl.get_subclass_options().get(selected_class, [])
-            subclass_combobox['values'] = new_subclass_options
+            typeahead.set_options(subclass_combobox, new_subclass_options)
             subclass_combobox.set('')
         else:
             subclass_combobox.set('')
-            subclass_combobox['values'] = []
+            typeahead.set_options(subclass_combobox, [])
 
     # Dynamically adds multiclass comboboxes on button press during character creation.
     def add_multiclass(self, event=None):
         new_row = len(self.class_selections) + 2
 
-        new_class_combobox = ttk.Combobox(master=self.selection_frame, values=gl.get_class_options(), state="readonly")
+        class_options = gl.get_class_options()
+        new_class_combobox = ttk.Combobox(master=self.selection_frame, values=class_options, state="readonly")
         new_class_combobox.grid(row=new_row, column=1, padx=5, pady=10)
-        new_levels_combobox = ttk.Combobox(master=self.selection_frame, values=list(range(1, 21)), state="readonly")
+        new_levels_combobox = ttk.Combobox(master=self.selection_frame, values=LEVEL_OPTIONS, state="readonly")
         new_levels_combobox.grid(row=new_row, column=3, padx=5, pady=10)
         new_subclass_combobox = ttk.Combobox(master=self.selection_frame, values=[], state="readonly")
         new_subclass_combobox.grid(row=new_row, column=5, padx=5, pady=10)
+        typeahead.attach(new_class_combobox, class_options)
+        typeahead.attach(new_levels_combobox, LEVEL_OPTIONS)
+        typeahead.attach(new_subclass_combobox, [])
 
         new_class_combobox.bind("<<ComboboxSelected>>", lambda event, c=new_class_combobox, l=new_levels_combobox, s=new_subclass_combobox: self.update_subclass_options(c, l, s))
         new_levels_combobox.bind("<<ComboboxSelected>>", lambda event, c=new_class_combobox, l=new_levels_combobox, s=new_subclass_combobox: self.update_subclass_options(c, l, s))
@@ -628,6 +1084,25 @@ class MainWindowUI:
 
         self.class_selections.append((new_class_combobox, new_levels_combobox, new_subclass_combobox, remove_button))
 
+    # Shows the best ways to split the currently selected total level across classes.
+    def suggest_multiclass(self, event=None):
+        class_selections = [(self.class_combobox, self.levels_combobox, self.subclass_combobox, None)]
+        class_selections.extend(self.class_selections)
+        total_level = sum(int(levels_combobox.get() or 0) for _, levels_combobox, _, _ in class_selections)
+        total_level = max(1, min(total_level, planner.MAX_LEVEL))
+        try:
+            ability_scores = [int(entry.get()) for entry in self.ability_entries]
+        except ValueError:
+            ability_scores = None
+
+        builds = planner.plan_multiclass(total_level, "features", top_k=3, ability_scores=ability_scores)
+        lines = [f"Suggested builds for level {total_level} (most class features):"]
+        for build in builds:
+            class_str = ', '.join(f"{class_name} {level}" for class_name, level in build['classes'].items())
+            jack_of_all_trades = ", Jack of All Trades" if build['jack_of_all_trades'] else ""
+            lines.append(f"\n{class_str}\nHP: {build['max_hp']}, ASIs: {build['asi']}, Features: {len(build['features'])}{jack_of_all_trades}")
+        self.change_description_text(self.tooltip, "\n".join(lines))
+
     def remove_multiclass(self, row, class_combobox, levels_combobox, subclass_combobox, remove_button):
         class_combobox.destroy()
         levels_combobox.destroy()
@@ -660,8 +1135,8 @@ class MainWindowUI:
                 entry.insert(0, str(score))
 
     def on_class_combobox_selected(self, event):
-        self.update_class_description()
-        self.update_subclass_options(self.class_combobox, self.levels_combobox, self.subclass_combobox)
+        self.updates.mark("description", self.update_class_description)
+        self.updates.mark("starting_subclass_options", lambda: self.update_subclass_options(self.class_combobox, self.levels_combobox, self.subclass_combobox))
 
     def on_subclass_combobox_selected(self, event):
         self.update_subclass_description()
@@ -687,6 +1162,20 @@ class MainWindowUI:
                 description = f"{selected_subclass_obj.subclass_description}"
                 self.change_description_text(self.tooltip, description)
 
+    # Shows the best rules matches for the search box, and puts back the description it replaced when it's cleared
+    def search_rules(self, event=None):
+        query = self.rules_search_entry.get()
+        showing_results = self.search_results_text is not None and self.text == self.search_results_text
+        if query.strip():
+            if not showing_results:
+                self.text_before_search = self.text
+            self.search_results_text = rules_search.format_results(rules_search.search(query, limit=5))
+            self.change_description_text(self.tooltip, self.search_results_text)
+        elif showing_results:
+            # Unless a selection has replaced the results since
+            self.search_results_text = None
+            self.change_description_text(self.tooltip, self.text_before_search)
+
     # Called when user selects new options. Replaces descriptiosn and recommendations accordingly.
     def change_description_text(self, tooltip, text):
         self.text = text
@@ -698,6 +1187,7 @@ class MainWindowUI:
 
         new_feat_combobox = ttk.Combobox(master=self.feats_frame, values=self.feats, state="readonly")
         new_feat_combobox.grid(row=new_row, column=0, padx=10, pady=5)
+        typeahead.attach(new_feat_combobox, self.feats)
 
         remove_feat_button = customtkinter.CTkButton(
             master=self.feats_frame,
@@ -734,7 +1224,7 @@ class MainWindowUI:
     # Generate a random character with random values.
     def auto_generate_character(self):
         self.character_name_entry.delete(0, "end")
-        self.character_name_entry.insert(0, "Rand Oman")
+        self.character_name_entry.insert(0, generator.generate_name())
 
         # Randomly select race, class, and background
         random_race = random.choice(gl.get_race_options())
@@ -790,7 +1280,8 @@ class MainWindowUI:
         self.selected_race = self.race_combobox.get()
         self.selected_background = self.background_combobox.get()
         self.ability_scores = [int(entry.get()) for entry in self.ability_entries]
-        self.selected_feats = self.feat_selections
+        feat_comboboxes = [self.feat_combobox] + [feat_combobox for feat_combobox, _ in self.feat_selections]
+        self.selected_feats = [feat_combobox.get() for feat_combobox in feat_comboboxes if feat_combobox.get()]
         self.is_jack_of_all_trades = False
 
         # Prepare class selections data for calculate_class_levels_and_info method
@@ -815,9 +1306,16 @@ class MainWindowUI:
             'feats': self.selected_feats,
             'skill_proficiencies': self.selected_skills,  # Assuming selected_skills contains skill proficiencies
             'is_jack_of_all_trades': self.is_jack_of_all_trades,
-            'classes': {cls.name: level for cls, level, _ in class_objects}
+            'classes': {cls.name: level for cls, level, _ in class_objects},
+            'subclasses': {cls.name: subclass for cls, _, subclass in class_objects if subclass}
         }
 
+        # Characters that break the rules would fail to load later, so they are neither saved nor shown
+        violations = validator.validate_character(self.character_data)
+        if violations:
+            messagebox.showerror("Invalid Character", "\n".join(violations))
+            return
+
         self.create_character_sheet(self.character_data)
 
         # Save the character data to the current user
@@ -828,6 +1326,9 @@ class MainWindowUI:
             print("Current user is not set.")
 
     def create_character_sheet(self, character_data):
+        self.screens.show("character_sheet", lambda: self.build_character_sheet(character_data), cached=False)
+
+    def build_character_sheet(self, character_data):
         character_name = character_data['name']
         total_level = sum(character_data['classes'].values())
         selected_race = character_data['race']
@@ -837,9 +1338,6 @@ class MainWindowUI:
         class_objects = [(gl.get_class_by_name(cls_name), level, None) for cls_name, level in character_data['classes'].items()]
         class_info_str = ', '.join([f"{cls} {level}" for cls, level in character_data['classes'].items()])
 
-        for widget in self.root.winfo_children():
-            widget.pack_forget()
-
         self.current_ability_scores = ability_scores
 
         def increase_hp():
@@ -889,8 +1387,9 @@ class MainWindowUI:
         character_info_label = customtkinter.CTkLabel(master=self.character_info_subframe, text=display_text, font=("Roboto", 16))
         character_info_label.pack(padx=10, pady=(10, 0))
 
-        # Calculate proficiency bonus inside the method where total_level is accessible
-        self.proficiency_bonus = (2 + (total_level - 1) // 4)
+        # Derived values (modifiers, proficiency, HP, AC) come from the stats engine
+        self.stats = gl.CharacterStats(character_data)
+        self.proficiency_bonus = self.stats.get("proficiency_bonus")
 
         # Ability scores section
         ability_scores_frame = customtkinter.CTkFrame(master=self.character_info_frame, border_width=0)
@@ -899,48 +1398,23 @@ class MainWindowUI:
         ability_scores_label.grid(row=0, column=0, sticky="nsw")  # Span across multiple columns
 
         # Loop through ability scores to display them along with their modifiers
-        mods = []
         for index, score in enumerate(ability_scores):
             ability_name = ["Strength", "Dexterity", "Constitution", "Intelligence", "Wisdom", "Charisma"][index]
             col_position = index * 2  # Each ability takes up two columns
             label_score = customtkinter.CTkLabel(master=ability_scores_frame, text=f"{ability_name}: {score}", font=("Roboto", 14))
             label_score.grid(row=1, column=col_position, sticky="w", padx=5, pady=5)
 
-            # Calculate and display the modifier for each ability score
-            mod = self.calculate_ability_modifier(score)
-            mods.append((ability_name, mod))
+            # Display the modifier for each ability score
+            mod = self.stats.ability_modifier(ability_name)
             operator = '+' if mod >= 0 else '-'
             modifier_score = customtkinter.CTkLabel(master=ability_scores_frame, text=f"({operator}{abs(mod)})", font=("Roboto", 18))
             modifier_score.grid(row=1, column=col_position + 1, sticky="w", padx=5, pady=5)
 
-
-        # Armor Class
-        dexterity_modifier = 0
-        for mod_name, mod_value in mods:
-            if "Dexterity_modifier" in mod_name:
-                dexterity_modifier = mod_value
-
-        base_ac = 10 + dexterity_modifier
-
         # HP
         self.hp_frame = customtkinter.CTkFrame(master=self.character_info_frame, border_width=0)
         self.hp_frame.grid(row=2, column=1, rowspan=2, sticky="nse")
-        self.curr_hp = 0
-        self.max_hp = 0
-        self.constitution_modifier = next((mod_value for mod_name, mod_value in mods if mod_name == "Constitution"), 0)
-
-        # Loop through each class to calculate HP
-        for class_object, levels, subclass in class_objects:
-            hit_die_value = int(class_object.hit_die[1:])
-            # Max HP for the first level is max hit die value plus Constitution modifier
-            if levels > 0:
-                first_level_hp = hit_die_value + self.constitution_modifier
-                self.max_hp += first_level_hp
-            # Calculate HP for each level
-            for level in range(2, levels + 1):
-                subsequent_level_hp = ((hit_die_value // 2) + 1) + self.constitution_modifier
-                self.max_hp += subsequent_level_hp
-
+        self.constitution_modifier = self.stats.ability_modifier("Constitution")
+        self.max_hp = self.stats.get("max_hp")
         self.curr_hp = self.max_hp
 
         # HP display
@@ -955,24 +1429,47 @@ class MainWindowUI:
 
         self.misc_frame = customtkinter.CTkFrame(master=self.character_info_frame, border_width=0)
         self.misc_frame.grid(row=2, column=0, sticky="ew")
-        proficiency_bonus = (2 + (total_level - 1) // 4)
-        self.label_proficiency_bonus = customtkinter.CTkLabel(master=self.misc_frame, text=f"(Proficiency Bonus: +{proficiency_bonus})", font=("Roboto", 18))
+        self.label_proficiency_bonus = customtkinter.CTkLabel(master=self.misc_frame, text=f"(Proficiency Bonus: +{self.proficiency_bonus})", font=("Roboto", 18))
         self.label_proficiency_bonus.grid(row=0, column=0, sticky="w", padx=10)
 
         walk_speed = 30
         self.label_walk_speed = customtkinter.CTkLabel(master=self.misc_frame, text=f"(Speed: {walk_speed})", font=("Roboto", 18))
         self.label_walk_speed.grid(row=0, column=1, sticky="w", padx=10)
 
-        initiative_bonus = self.calculate_ability_modifier(ability_scores[1])
+        initiative_bonus = self.stats.get("initiative")
         self.label_initiative_bonus = customtkinter.CTkLabel(master=self.misc_frame, text=f"(Initiative: +{initiative_bonus})", font=("Roboto", 18))
         self.label_initiative_bonus.grid(row=0, column=2, sticky="w", padx=10)
 
-        self.armor_class_label = customtkinter.CTkLabel(master=self.misc_frame, text="", font=("Roboto", 18))
+        self.armor_class_label = customtkinter.CTkLabel(master=self.misc_frame, text=f"Armor Class: {self.stats.get('armor_class')}", font=("Roboto", 18))
         self.armor_class_label.grid(row=0, column=3, sticky="w", padx=10)
 
-        # Skills display section
-        skills_frame = customtkinter.CTkFrame(master=self.inner_frame, fg_color="transparent")
-        skills_frame.pack(side="left", padx=10, pady=10)
+        # Empty containers for the sections built later, so the layout is the same whichever is built first
+        self.sheet_sections = LazySections(self.screens, "character_sheet")
+        self.skills_frame = customtkinter.CTkFrame(master=self.inner_frame, fg_color="transparent")
+        self.skills_frame.pack(side="left", padx=10, pady=10, anchor="n")
+
+        # Tabs for Dice Roller/Inventory/actions/notes/etc
+        self.tabcontrol = customtkinter.CTkTabview(master=self.inner_frame, border_width=2, fg_color="transparent", command=self.on_sheet_tab_change)
+        self.tabcontrol.pack(fill="both", expand=True, side="left", pady=10)
+        self.dice_tab = self.tabcontrol.add("Dice Roller")
+        self.inventory_tab = self.tabcontrol.add("Inventory")
+
+        # Footer
+        back_button = customtkinter.CTkButton(master=self.footer_frame, text="Back", command=self.open_main_window)
+        back_button.pack(pady=10)
+
+        # The skills and the open tab are built right after the first paint, other tabs when first opened
+        self.sheet_sections.add("Skills", lambda: self.build_sheet_skills(selected_skills))
+        self.sheet_sections.add("Dice Roller", self.build_sheet_dice_roller)
+        self.sheet_sections.add("Inventory", self.build_sheet_inventory)
+        self.sheet_sections.ensure_later("Skills", self.skills_frame)
+        self.sheet_sections.ensure_later(self.tabcontrol.get(), self.tabcontrol)
+
+    def on_sheet_tab_change(self):
+        self.sheet_sections.ensure(self.tabcontrol.get())
+
+    def build_sheet_skills(self, selected_skills):
+        skills_frame = self.skills_frame
         skills_label_frame = customtkinter.CTkFrame(master=skills_frame, fg_color="transparent")
         skills_label_frame.pack(padx=10, pady=(10,5))
 
@@ -982,47 +1479,13 @@ class MainWindowUI:
         label_expertise = customtkinter.CTkLabel(master=skills_label_frame, text="Expertise", font=("Roboto", 14))
         label_expertise.pack(side="right", padx=(20, 10), pady=10)
 
-        # Calculate skill modifiers
-        ability_modifiers = {
-            "Strength": self.calculate_ability_modifier(ability_scores[0]),
-            "Dexterity": self.calculate_ability_modifier(ability_scores[1]),
-            "Constitution": self.calculate_ability_modifier(ability_scores[2]),
-            "Intelligence": self.calculate_ability_modifier(ability_scores[3]),
-            "Wisdom": self.calculate_ability_modifier(ability_scores[4]),
-            "Charisma": self.calculate_ability_modifier(ability_scores[5])
-        }
-
-        self.skill_modifiers = {
-            "Acrobatics": ability_modifiers["Dexterity"],
-            "Animal Handling": ability_modifiers["Wisdom"],
-            "Arcana": ability_modifiers["Intelligence"],
-            "Athletics": ability_modifiers["Strength"],
-            "Deception": ability_modifiers["Charisma"],
-            "History": ability_modifiers["Intelligence"],
-            "Insight": ability_modifiers["Wisdom"],
-            "Intimidation": ability_modifiers["Charisma"],
-            "Investigation": ability_modifiers["Intelligence"],
-            "Medicine": ability_modifiers["Wisdom"],
-            "Nature": ability_modifiers["Intelligence"],
-            "Perception": ability_modifiers["Wisdom"],
-            "Performance": ability_modifiers["Charisma"],
-            "Persuasion": ability_modifiers["Charisma"],
-            "Religion": ability_modifiers["Intelligence"],
-            "Sleight of Hand": ability_modifiers["Dexterity"],
-            "Stealth": ability_modifiers["Dexterity"],
-            "Survival": ability_modifiers["Wisdom"]
-        }
-
         # Create buttons for each skill with their modifier
-        for skill, modifier in self.skill_modifiers.items():
+        for skill in gl.get_skills():
             skill_frame = customtkinter.CTkFrame(master=skills_frame, fg_color="transparent")
             skill_frame.pack(anchor="w", padx=(10, 0), pady=1, fill='x')
 
-            # Determine the modifier, including proficiency and expertise
-            if skill in selected_skills:
-                modifier += self.proficiency_bonus
-            elif is_jack_of_all_trades:
-                modifier += self.proficiency_bonus // 2
+            # The modifier includes proficiency and Jack of All Trades
+            modifier = self.stats.skill_modifier(skill)
             modifier_sign = "+" if modifier >= 0 else ""
             if skill in selected_skills:
                 skill_button_text = f"*{skill}: {modifier_sign}{modifier}"
@@ -1050,9 +1513,9 @@ class MainWindowUI:
                 )
             expertise_checkbox.pack(side="right", padx=5)
 
-        # Dice roller section
-        self.dice_frame = customtkinter.CTkFrame(master=self.inner_frame, fg_color="transparent")
-        self.dice_frame.pack(side="left", padx=10, pady=10, anchor="n")
+    def build_sheet_dice_roller(self):
+        self.dice_frame = customtkinter.CTkFrame(master=self.dice_tab, fg_color="transparent")
+        self.dice_frame.pack(padx=10, pady=10, anchor="n")
 
         dice_button_frame = customtkinter.CTkFrame(master=self.dice_frame)
         dice_button_frame.pack(side="left", padx=10, pady=10)
@@ -1091,12 +1554,7 @@ class MainWindowUI:
         self.clear_button = customtkinter.CTkButton(master=self.results_frame, text="Clear", command=self.clear_totals)
         self.clear_button.pack(pady=10)
 
-        # Tabs for Inventory/actions/notes/etc
-        self.tabcontrol = customtkinter.CTkTabview(master=self.inner_frame, border_width=2, fg_color="transparent")
-        self.tabcontrol.pack(fill="both", expand=True, side="left", pady=10)
-        self.inventory_tab = self.tabcontrol.add("Inventory")
-                             
-        # Inventory
+    def build_sheet_inventory(self):
         self.scrollable_inventory_frame = customtkinter.CTkScrollableFrame(master=self.inventory_tab)
         self.scrollable_inventory_frame.pack(fill="both", expand=True)
 
@@ -1106,27 +1564,21 @@ class MainWindowUI:
         # Armor Type Selection
         self.initialize_inventory_section()
 
-        # Footer
-        back_button = customtkinter.CTkButton(master=self.footer_frame, text="Back", command=self.open_main_window)
-        back_button.pack(pady=10)
-
     # Helpers for create_character_sheet
     def calculate_skill_modifier(self, skill_name, selected_skills, expertise_vars):
-        base_modifier = self.skill_modifiers[skill_name]
-        if skill_name in selected_skills:
-            base_modifier += self.proficiency_bonus
-        if expertise_vars[skill_name].get() == 1:
-            base_modifier += self.proficiency_bonus  # Add again for expertise
-        elif self.is_jack_of_all_trades and skill_name not in selected_skills:
-            base_modifier += self.proficiency_bonus // 2  # Add half proficiency for Jack of All Trades
-        return base_modifier
+        # Only the toggled skill is recomputed by the stats engine
+        self.stats.set_expertise(skill_name, expertise_vars[skill_name].get() == 1)
+        return self.stats.skill_modifier(skill_name)
 
     def roll_skill(self, skill_name, selected_skills, expertise_vars):
+        # The results are shown in the dice roller tab
+        self.sheet_sections.ensure("Dice Roller")
+        self.tabcontrol.set("Dice Roller")
         modifier = self.calculate_skill_modifier(skill_name, selected_skills, expertise_vars)
         roll_result = random.randint(1, 20)
         total = roll_result + modifier
-        self.dice_result_text.insert("end", f"{skill_name} Roll: {roll_result} + Modifier: {modifier} = Total: {total}\n")
-        self.dice_result_text.see("end")
+        self.roll_history.record(skill_name, 20, [roll_result], modifier)
+        self.show_roll(f"{skill_name} Roll: {roll_result} + Modifier: {modifier} = Total: {total}")
 
     def update_skill_modifier(self, skill_name, selected_skills, expertise_vars):
         modifier = self.calculate_skill_modifier(skill_name, selected_skills, expertise_vars)
@@ -1145,13 +1597,13 @@ class MainWindowUI:
     def roll_dice(self, sides):
         num_dice = int(self.num_dice_combobox.get())
         results, total = gl.roll_dice_logic(sides, num_dice)
-        self.dice_result_text.insert("end", f"Rolled {num_dice}d{sides}: {results} (Total: {total})\n")
+        self.roll_history.record(f"{num_dice}d{sides}", sides, results)
         self.total_text.delete("1.0", "end")
         self.total_text.insert("1.0", f"{total}\n")
-        self.dice_result_text.see("end")
+        self.show_roll(f"Rolled {num_dice}d{sides}: {results} (Total: {total})")
 
     def calculate_ability_modifier(self, score):
-        return (score - 10) // 2
+        return gl.calculate_ability_modifier(score)
 
     def initialize_inventory_section(self):
         # Inventory setup...
@@ -1176,20 +1628,22 @@ class MainWindowUI:
         self.shield_combobox.set(0)
 
         self.armor_type_combobox.bind("<<ComboboxSelected>>", self.on_armor_type_select)
-        self.armor_options_combobox.bind("<<ComboboxSelected>>", self.update_ac_display)
-        self.shield_combobox.bind("<<ComboboxSelected>>", self.update_ac_display)
+        self.armor_options_combobox.bind("<<ComboboxSelected>>", self.schedule_ac_display)
+        self.shield_combobox.bind("<<ComboboxSelected>>", self.schedule_ac_display)
         self.update_ac_display()  # Initial AC calculation
 
     def on_armor_type_select(self, event):
-        self.update_ac_display()
         self.update_armor_options(event)
 
+    def schedule_ac_display(self, event=None):
+        self.updates.mark("armor_class", self.update_ac_display)
+
     def update_ac_display(self, event=None):
         armor_type = self.armor_type_combobox.get()
         armor_name = self.armor_options_combobox.get() if armor_type != "No Armor" else ""
-        dex_modifier = self.calculate_ability_modifier(self.current_ability_scores[1])  # Use the stored ability scores
         shield_bonus = int(self.shield_combobox.get())
-        total_ac = gl.calculate_ac(armor_type, armor_name, dex_modifier, shield_bonus)
+        self.stats.set_armor(armor_type, armor_name, shield_bonus)
+        total_ac = self.stats.get("armor_class")
         self.armor_class_label.configure(text=f"Armor Class: {total_ac}")
 
     def update_armor_options(self, event):
@@ -1197,7 +1651,7 @@ class MainWindowUI:
         options = gl.get_armor_options().get(selected_type, [""])
         self.armor_options_combobox['values'] = options
         self.armor_options_combobox.current(0)
-        self.update_ac_display()
+        self.schedule_ac_display()
 
 class AdminUI:
     def __init__(self, root, admin_user, go_back_function, main_window_ui):
@@ -1206,6 +1660,13 @@ class AdminUI:
         self.go_back_function = go_back_function
         self.main_window_ui = main_window_ui
         self.character_frame = None
+        self.character_list = None
+        self.user_id = None
+        self.selected_users = set()
+        self.selected_characters = set()
+        self.jobs = admin_jobs.get_job_queue()
+        self.job_rows = {}
+        self.poll_id = None
 
     def initialize_ui(self):
         self.main_frame = customtkinter.CTkFrame(master=self.root)
@@ -1234,6 +1695,24 @@ class AdminUI:
 
         self. display_users()
 
+        # Bulk actions on the checked users/characters. They run as background jobs.
+        actions_frame = customtkinter.CTkFrame(master=self.footer_frame, fg_color="transparent")
+        actions_frame.pack(pady=(10, 0))
+        actions = [
+            ("Delete Selected Users", self.delete_selected_users),
+            ("Delete Selected Characters", self.delete_selected_characters),
+            ("Export Characters", self.export_characters),
+            ("Re-validate Characters", self.revalidate_characters),
+            ("Clear Finished Jobs", self.clear_finished_jobs),
+        ]
+        for column, (text, command) in enumerate(actions):
+            button = customtkinter.CTkButton(master=actions_frame, text=text, fg_color="#186A3B", hover_color="green", command=command)
+            button.grid(row=0, column=column, padx=5)
+
+        self.jobs_frame = customtkinter.CTkScrollableFrame(master=self.footer_frame, height=100, label_text="Jobs")
+        self.jobs_frame.pack(fill="x", padx=10, pady=10)
+        self.poll_jobs()
+
         back_button = customtkinter.CTkButton(
             master=self.footer_frame,
             text="Back",
@@ -1243,9 +1722,22 @@ class AdminUI:
         back_button.pack(pady=10)
 
     def display_users(self):
+        for widget in self.users_frame.winfo_children():
+            widget.destroy()
         users = db.get_all_users()
+        user_ids = {user[0] for user in users}
+        self.selected_users &= user_ids
         for idx, user in enumerate(users):
             user_id, username, email, is_admin = user
+            select_checkbox = customtkinter.CTkCheckBox(
+                self.users_frame,
+                text="",
+                width=24,
+                border_width=1,
+                command=lambda u=user_id: self.toggle_selection(self.selected_users, u))
+            if user_id in self.selected_users:
+                select_checkbox.select()
+            select_checkbox.grid(row=idx, column=0, pady=2, padx=(10, 0))
             user_btn_text = f"{username} - {email}" + (" - Admin" if is_admin else "")
             user_button = customtkinter.CTkButton(
                 self.users_frame,
@@ -1253,15 +1745,20 @@ class AdminUI:
                 fg_color="transparent",
                 hover_color="green",
                 command=lambda u=user_id: self.user_action(u))  # u=user_id captures the current value
-            user_button.grid(row=idx, column=0, pady=2, padx=10, sticky="nsw")
+            user_button.grid(row=idx, column=1, pady=2, padx=10, sticky="nsw")
             delete_button = customtkinter.CTkButton(
                 self.users_frame,
                 text="Delete",
                 fg_color="#186A3B",
                 hover_color="red",
-                command=lambda u=username: db.remove_user(u))  # u=username captures the current value
-            delete_button.grid(row=idx, column=1, pady=2, padx=10)
+                command=lambda u=user_id, n=username: self.delete_users([u], n))  # u=user_id captures the current value
+            delete_button.grid(row=idx, column=2, pady=2, padx=10)
 
+    def toggle_selection(self, selected, item_id):
+        if item_id in selected:
+            selected.remove(item_id)
+        else:
+            selected.add(item_id)
 
     def user_action(self, user_id):
         self.user_id = user_id
@@ -1272,23 +1769,128 @@ class AdminUI:
             print(f"No user found with UserID: {user_id}")
 
     def display_user_characters(self, user_data):
-        characters = db.get_user_characters(user_data)
-
-        if self.character_frame:
-            self.character_frame.destroy()
-
-        self.character_frame = customtkinter.CTkFrame(master=self.body_frame, fg_color="transparent")
-        self.character_frame.pack(side="left", fill="both", expand=True, padx=10, pady=10)
+        user_id = user_data[0]
+        source = virtual_list.PagedSource(lambda: db.count_characters(user_id),
+                                          lambda offset, limit: db.get_character_name_page(user_id, offset, limit))
+        if len(source) == 0:
+            print("No characters found for the user.")
 
-        if characters:
-            for character_id, character_name in characters:
-                character_button = customtkinter.CTkButton(
-                    self.character_frame,
-                    text=character_name,
-                    fg_color="transparent",
-                    hover_color="red",
-                    command=lambda cid=character_id: self.main_window_ui.delete_character(cid)  # cid=character_id captures the current value
-                )
-                character_button.pack(pady=2, padx=10)
+        # One list is reused for every user; only its source changes
+        if self.character_list is None:
+            self.character_list = virtual_list.VirtualList(self.character_frame, source, self.create_character_row,
+                                                           self.update_character_row, fg_color="transparent")
+            self.character_list.pack(fill="both", expand=True)
         else:
-            print("No characters found for the user.")
+            self.character_list.set_source(source)
+
+    def create_character_row(self, parent):
+        row = customtkinter.CTkFrame(master=parent, fg_color="transparent")
+        row.character_id = None
+        row.select_checkbox = customtkinter.CTkCheckBox(
+            row,
+            text="",
+            width=24,
+            border_width=1,
+            command=lambda: self.toggle_selection(self.selected_characters, row.character_id))
+        row.select_checkbox.pack(side="left", padx=(10, 0))
+        row.character_button = customtkinter.CTkButton(
+            row,
+            text="",
+            fg_color="transparent",
+            hover_color="red")
+        row.character_button.pack(side="left", pady=2, padx=10)
+        return row
+
+    def update_character_row(self, row, item, index):
+        character_id, character_name = item
+        # Rows are recycled while scrolling, so the checkbox follows the selection set rather than the widget
+        row.character_id = character_id
+        if character_id in self.selected_characters:
+            row.select_checkbox.select()
+        else:
+            row.select_checkbox.deselect()
+        row.character_button.configure(text=character_name,
+                                       command=lambda cid=character_id: self.main_window_ui.delete_character(cid))  # cid=character_id captures the current value
+
+    # Bulk jobs
+    def delete_users(self, user_ids, username=None):
+        if self.admin_user.user_id in user_ids:
+            messagebox.showwarning("Delete Users", "You can't delete your own account from the admin panel.")
+            return
+        who = username if username else f"{len(user_ids)} users"
+        if messagebox.askyesno("Delete Users", f"Delete {who} and all their characters? This action cannot be undone."):
+            self.jobs.submit(admin_jobs.delete_users_job(user_ids))
+            self.selected_users.difference_update(user_ids)
+            self.poll_jobs()
+
+    def delete_selected_users(self):
+        if not self.selected_users:
+            messagebox.showinfo("Delete Users", "Check the users to delete first.")
+            return
+        self.delete_users(sorted(self.selected_users))
+
+    def delete_selected_characters(self):
+        if not self.selected_characters:
+            messagebox.showinfo("Delete Characters", "Check the characters to delete first.")
+            return
+        if messagebox.askyesno("Delete Characters", f"Delete {len(self.selected_characters)} characters? This action cannot be undone."):
+            self.jobs.submit(admin_jobs.delete_characters_job(sorted(self.selected_characters)))
+            self.selected_characters.clear()
+            self.poll_jobs()
+
+    def export_characters(self):
+        """Export the checked users' characters, or everyone's when no user is checked."""
+        path = filedialog.asksaveasfilename(title="Export Characters", defaultextension=".jsonl",
+                                            filetypes=[("JSON Lines", "*.jsonl"), ("All files", "*.*")])
+        if path:
+            self.jobs.submit(admin_jobs.export_characters_job(path, sorted(self.selected_users)))
+            self.poll_jobs()
+
+    def revalidate_characters(self):
+        """Re-validate the checked users' characters, or everyone's when no user is checked."""
+        self.jobs.submit(admin_jobs.revalidate_job(sorted(self.selected_users)))
+        self.poll_jobs()
+
+    def clear_finished_jobs(self):
+        self.jobs.clear_finished()
+        self.poll_jobs()
+
+    def poll_jobs(self):
+        """Show every job's progress. Polls while jobs are running, since the worker thread can't touch Tk."""
+        if not self.jobs_frame.winfo_exists():
+            return
+        if self.poll_id:
+            self.root.after_cancel(self.poll_id)
+            self.poll_id = None
+
+        refresh_needed = False
+        for job in list(self.job_rows):
+            if job not in self.jobs.jobs:
+                for widget in self.job_rows.pop(job)[:3]:
+                    widget.destroy()
+        for index, job in enumerate(self.jobs.jobs):
+            if job not in self.job_rows:
+                label = customtkinter.CTkLabel(master=self.jobs_frame, text="", anchor="w")
+                progress_bar = customtkinter.CTkProgressBar(master=self.jobs_frame, width=200)
+                cancel_button = customtkinter.CTkButton(master=self.jobs_frame, text="Cancel", width=70, hover_color="red", command=job.cancel)
+                self.job_rows[job] = [label, progress_bar, cancel_button, job.finished_running]
+            label, progress_bar, cancel_button, was_finished = self.job_rows[job]
+            label.grid(row=index, column=0, padx=5, sticky="w")
+            progress_bar.grid(row=index, column=1, padx=5)
+            cancel_button.grid(row=index, column=2, padx=5)
+
+            done, total = job.progress()
+            label.configure(text=job.summary())
+            progress_bar.set(done / total if total else (1.0 if job.finished_running else 0.0))
+            cancel_button.configure(state="disabled" if job.finished_running else "normal")
+            if job.finished_running and not was_finished:
+                self.job_rows[job][3] = True
+                refresh_needed = refresh_needed or job.kind.startswith("delete")
+
+        if refresh_needed:
+            self.display_users()
+            if self.character_list is not None:
+                self.character_list.source.invalidate()
+                self.character_list.refresh()
+        if self.jobs.active():
+            self.poll_id = self.root.after(JOB_POLL_MILLISECONDS, self.poll_jobs)
@@ -11,42 +11,63 @@ Usage:
     It manages all database interactions for the application.
 
 Dependencies:
-    Requires sqlite3 for database operations.
+    Requires sqlite3 for database operations. tkinter.messagebox is only imported when a warning is shown.
 """
 import os, sys
 import sqlite3
-import tkinter.messagebox
 MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
-DB_PATH = os.path.join(MODULE_DIR, "../database/users.db")
+# TTRPG_DATABASE points the app (or a benchmark) at another database file
+DB_PATH = os.environ.get("TTRPG_DATABASE") or os.path.join(MODULE_DIR, "../database/users.db")
+# sql_audit.install() swaps in a connection class that times every statement
+connection_factory = sqlite3.Connection
 
-def create_connection(db_file=DB_PATH):
-    """Create a database connection to the SQLite database specified by db_file."""
+def create_connection(db_file=None):
+    """Create a database connection to the SQLite database specified by db_file (default DB_PATH)."""
+    db_file = db_file or DB_PATH
     # Determine the directory of the executable or script
     base_dir = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
     db_path = os.path.join(base_dir, db_file)
     try:
-        return sqlite3.connect(db_path)
+        return sqlite3.connect(db_path, factory=connection_factory)
     except sqlite3.Error as e:
         print(e)
         return None
 
+def show_warning(message):
+    print(message)
+    # Imported here so the database layer doesn't load Tk for scripts and workers that never warn
+    import tkinter.messagebox
+    tkinter.messagebox.showwarning("Warning", message)
+
+# Schema
+def create_users_schema(c):
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS Users (
+            UserID INTEGER PRIMARY KEY,
+            Username TEXT UNIQUE NOT NULL,
+            PasswordHash TEXT NOT NULL,
+            Salt TEXT NOT NULL,
+            Email TEXT UNIQUE NOT NULL,
+            IsAdmin INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+
 def create_users_table():
     """Create the Users table in the database if it doesn't exist."""
-    conn = create_connection()
+    run_schema_steps([create_users_schema])
+
+def run_schema_steps(steps, conn=None):
+    """Run schema steps (functions taking a cursor) in one transaction, on conn or a new connection."""
+    own_connection = conn is None
+    if own_connection:
+        conn = create_connection()
     if conn is not None:
         c = conn.cursor()
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS Users (
-                UserID INTEGER PRIMARY KEY,
-                Username TEXT UNIQUE NOT NULL,
-                PasswordHash TEXT NOT NULL,
-                Salt TEXT NOT NULL,
-                Email TEXT UNIQUE NOT NULL,
-                IsAdmin INTEGER NOT NULL DEFAULT 0
-            )
-        ''')
+        for step in steps:
+            step(c)
         conn.commit()
-        conn.close()
+        if own_connection:
+            conn.close()
     else:
         print("Error! Cannot create database connection.")
 
@@ -59,15 +80,13 @@ def register_user(username, password_hash, salt, email):
             # Check if the email already exists
             c.execute("SELECT * FROM Users WHERE Email = ?", (email,))
             if c.fetchone() is not None:
-                print("Email already exists")
-                tkinter.messagebox.showwarning("Warning", "Email already exists.")
+                show_warning("Email already exists.")
                 return False
 
             # Check if the username already exists
             c.execute("SELECT * FROM Users WHERE Username = ?", (username,))
             if c.fetchone() is not None:
-                print("Username already exists")
-                tkinter.messagebox.showwarning("Warning", "Username already exists.")
+                show_warning("Username already exists.")
                 return False
 
             # Insert the new user as both username and email are unique
@@ -133,7 +152,7 @@ def get_user_by_id(user_id):
         return None
 
 def remove_user(username):
-    """Remove a user and all associated characters from the database."""
+    """Remove a user, their characters and their dice rolls from the database."""
     conn = create_connection()
     if conn is not None:
         print("attempting to delete user and associated characters", username)
@@ -155,6 +174,9 @@ def remove_user(username):
                 c.execute("DELETE FROM CharacterSkills WHERE CharacterID = ?", (character_id,))
                 c.execute("DELETE FROM Characters WHERE CharacterID = ?", (character_id,))
 
+            # Delete the user's saved dice rolls
+            c.execute("DELETE FROM DiceRolls WHERE UserID = ?", (user_id,))
+
         else:
             print("User not found, no characters deleted.")
 
@@ -167,6 +189,30 @@ def remove_user(username):
     else:
         print("Error! Cannot create database connection.")
 
+def row_to_character_data(row, strict=True):
+    """
+    Convert a Characters row into a character_data dict (without classes or skills). With strict=False, a
+    malformed AbilityScores column doesn't raise: ability_scores is None and the problem is listed in
+    'load_errors', so a validation run can report the row and carry on.
+    """
+    character_data = {
+        'character_id': row[0],
+        'user_id': row[1],
+        'name': row[2],
+        'race': row[3],
+        'background': row[4],
+        'feats': row[6].split(',') if row[6] else [],
+        'is_jack_of_all_trades': bool(row[7])
+    }
+    try:
+        character_data['ability_scores'] = list(map(int, row[5].split(',')))
+    except (AttributeError, ValueError):
+        if strict:
+            raise
+        character_data['ability_scores'] = None
+        character_data['load_errors'] = [f"AbilityScores: not six integers ({row[5]!r})"]
+    return character_data
+
 def get_character(character_id):
     conn = create_connection()
     character_data = {}
@@ -176,21 +222,13 @@ def get_character(character_id):
         c.execute("SELECT * FROM Characters WHERE CharacterID = ?", (character_id,))
         row = c.fetchone()
         if row:
-            character_data = {
-                'character_id': row[0],
-                'user_id': row[1],
-                'name': row[2],
-                'race': row[3],
-                'background': row[4],
-                'ability_scores': list(map(int, row[5].split(','))),
-                'feats': row[6].split(',') if row[6] else [],
-                'is_jack_of_all_trades': bool(row[7])
-            }
+            character_data = row_to_character_data(row)
 
             # Get the character's classes
-            c.execute("SELECT ClassName, Level FROM Classes WHERE CharacterID = ?", (character_id,))
+            c.execute("SELECT ClassName, Level, Subclass FROM Classes WHERE CharacterID = ?", (character_id,))
             classes = c.fetchall()
-            character_data['classes'] = {class_name: level for class_name, level in classes}
+            character_data['classes'] = {class_name: level for class_name, level, _ in classes}
+            character_data['subclasses'] = {class_name: subclass for class_name, _, subclass in classes if subclass}
 
             # Get the character's skill proficiencies
             c.execute("SELECT SkillName FROM CharacterSkills WHERE CharacterID = ?", (character_id,))
@@ -200,92 +238,363 @@ def get_character(character_id):
         conn.close()
     return character_data
 
-def create_characters_table():
-    """Create the Characters, Classes, and CharacterSkills tables in the database if they don't exist."""
-    print("Creating character tables...")
+def get_character_ids(user_id=None):
+    """Retrieve the IDs of all characters belonging to a user (or every user), oldest first."""
     conn = create_connection()
     if conn is not None:
         c = conn.cursor()
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS Characters (
-                CharacterID INTEGER PRIMARY KEY AUTOINCREMENT,
-                UserID INTEGER,
-                CharacterName TEXT NOT NULL,
-                Race TEXT NOT NULL,
-                Background TEXT,
-                AbilityScores TEXT NOT NULL,
-                Feats TEXT,
-                IsJackOfAllTrades INTEGER NOT NULL DEFAULT 0,
-                FOREIGN KEY (UserID) REFERENCES Users(UserID)
-            )
-        ''')
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS Classes (
-                ClassID INTEGER PRIMARY KEY AUTOINCREMENT,
-                CharacterID INTEGER,
-                ClassName TEXT NOT NULL,
-                Level INTEGER NOT NULL,
-                FOREIGN KEY (CharacterID) REFERENCES Characters(CharacterID)
-            )
-        ''')
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS CharacterSkills (
-                SkillID INTEGER PRIMARY KEY AUTOINCREMENT,
-                CharacterID INTEGER,
-                SkillName TEXT NOT NULL,
-                FOREIGN KEY (CharacterID) REFERENCES Characters(CharacterID)
-            )
-        ''')
-        conn.commit()
+        if user_id is None:
+            c.execute("SELECT CharacterID FROM Characters ORDER BY CharacterID")
+        else:
+            c.execute("SELECT CharacterID FROM Characters WHERE UserID = ? ORDER BY CharacterID", (user_id,))
+        character_ids = [row[0] for row in c.fetchall()]
         conn.close()
+        return character_ids
     else:
-        print("Error! Cannot create database connection.")
+        print("Error creating database connection.")
+        return []
+
+def count_characters(user_id=None):
+    """Count the characters of one user, or of every user."""
+    conn = create_connection()
+    if conn is not None:
+        c = conn.cursor()
+        if user_id is None:
+            c.execute("SELECT COUNT(*) FROM Characters")
+        else:
+            c.execute("SELECT COUNT(*) FROM Characters WHERE UserID = ?", (user_id,))
+        count = c.fetchone()[0]
+        conn.close()
+        return count
+    else:
+        print("Error creating database connection.")
+        return 0
+
+def get_character_page(user_id, offset, limit):
+    """Retrieve one page of a user's characters as character_data dicts, oldest first."""
+    page_filter = "IN (SELECT CharacterID FROM Characters WHERE UserID = ? ORDER BY CharacterID LIMIT ? OFFSET ?)"
+    return list(iter_characters_where(page_filter, [user_id, limit, offset]))
+
+def get_character_name_page(user_id, offset, limit):
+    """Retrieve one page of a user's (CharacterID, CharacterName) pairs, oldest first."""
+    conn = create_connection()
+    if conn is not None:
+        c = conn.cursor()
+        c.execute("SELECT CharacterID, CharacterName FROM Characters WHERE UserID = ? ORDER BY CharacterID LIMIT ? OFFSET ?",
+                  (user_id, limit, offset))
+        characters = c.fetchall()
+        conn.close()
+        return characters
+    else:
+        print("Error creating database connection.")
+        return []
+
+def iter_characters(user_id=None, character_ids=None, strict=True):
+    """
+    Yield character_data dicts ordered by CharacterID, optionally only for one user or a list of IDs.
+
+    Characters, Classes, and CharacterSkills are each read in a single ordered pass and merged, so memory
+    use stays flat however many characters there are. With strict=False, malformed rows are yielded with
+    'load_errors' instead of stopping the stream (see row_to_character_data).
+    """
+    if character_ids is not None:
+        # Keep each IN (...) list under SQLite's parameter limit
+        character_ids = sorted(character_ids)
+        for start in range(0, len(character_ids), 500):
+            yield from iter_characters_where("IN ({})".format(", ".join("?" * len(character_ids[start:start + 500]))),
+                                             character_ids[start:start + 500], strict)
+    elif user_id is not None:
+        yield from iter_characters_where("IN (SELECT CharacterID FROM Characters WHERE UserID = ?)", [user_id], strict)
+    else:
+        yield from iter_characters_where(None, [], strict)
+
+def iter_characters_where(id_filter, params, strict=True):
+    conn = create_connection()
+    if conn is None:
+        print("Error creating database connection.")
+        return
+    try:
+        where = f"WHERE CharacterID {id_filter}" if id_filter else ""
+        characters = conn.execute(f"SELECT * FROM Characters {where} ORDER BY CharacterID", params)
+        classes = conn.execute(f"SELECT CharacterID, ClassName, Level, Subclass FROM Classes {where} ORDER BY CharacterID", params)
+        skills = conn.execute(f"SELECT CharacterID, SkillName FROM CharacterSkills {where} ORDER BY CharacterID", params)
+        class_row = classes.fetchone()
+        skill_row = skills.fetchone()
+
+        for row in characters:
+            character_data = row_to_character_data(row, strict)
+            character_id = character_data['character_id']
+            character_data['classes'] = {}
+            character_data['subclasses'] = {}
+            character_data['skill_proficiencies'] = []
+
+            # Skip rows left behind by deleted characters, then take this character's rows
+            while class_row is not None and class_row[0] < character_id:
+                class_row = classes.fetchone()
+            while class_row is not None and class_row[0] == character_id:
+                character_data['classes'][class_row[1]] = class_row[2]
+                if class_row[3]:
+                    character_data['subclasses'][class_row[1]] = class_row[3]
+                class_row = classes.fetchone()
+
+            while skill_row is not None and skill_row[0] < character_id:
+                skill_row = skills.fetchone()
+            while skill_row is not None and skill_row[0] == character_id:
+                character_data['skill_proficiencies'].append(skill_row[1])
+                skill_row = skills.fetchone()
+
+            yield character_data
+    finally:
+        conn.close()
+
+def create_characters_schema(c):
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS Characters (
+            CharacterID INTEGER PRIMARY KEY AUTOINCREMENT,
+            UserID INTEGER,
+            CharacterName TEXT NOT NULL,
+            Race TEXT NOT NULL,
+            Background TEXT,
+            AbilityScores TEXT NOT NULL,
+            Feats TEXT,
+            IsJackOfAllTrades INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (UserID) REFERENCES Users(UserID)
+        )
+    ''')
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS Classes (
+            ClassID INTEGER PRIMARY KEY AUTOINCREMENT,
+            CharacterID INTEGER,
+            ClassName TEXT NOT NULL,
+            Level INTEGER NOT NULL,
+            Subclass TEXT,
+            FOREIGN KEY (CharacterID) REFERENCES Characters(CharacterID)
+        )
+    ''')
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS CharacterSkills (
+            SkillID INTEGER PRIMARY KEY AUTOINCREMENT,
+            CharacterID INTEGER,
+            SkillName TEXT NOT NULL,
+            FOREIGN KEY (CharacterID) REFERENCES Characters(CharacterID)
+        )
+    ''')
+
+    # Databases created before subclasses were saved need the new column
+    c.execute("PRAGMA table_info(Classes)")
+    if "Subclass" not in [column[1] for column in c.fetchall()]:
+        c.execute("ALTER TABLE Classes ADD COLUMN Subclass TEXT")
+
+def create_characters_table():
+    """Create the Characters, Classes, and CharacterSkills tables in the database if they don't exist."""
+    print("Creating character tables...")
+    run_schema_steps([create_characters_schema])
+
+def insert_character(cursor, user_id, character_data):
+    """Insert one character and its classes and skills using an open cursor. Returns the new CharacterID."""
+    cursor.execute(
+        "INSERT INTO Characters (UserID, CharacterName, Race, Background, AbilityScores, Feats, IsJackOfAllTrades) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            user_id,
+            character_data['name'],
+            character_data['race'],
+            character_data['background'],
+            ','.join(map(str, character_data['ability_scores'])),
+            ','.join(map(str, character_data.get('feats', []))),
+            int(character_data.get('is_jack_of_all_trades', False))
+        )
+    )
+
+    character_id = cursor.lastrowid
+    subclasses = character_data.get('subclasses', {})
+    cursor.executemany(
+        "INSERT INTO Classes (CharacterID, ClassName, Level, Subclass) VALUES (?, ?, ?, ?)",
+        [(character_id, class_name, level, subclasses.get(class_name)) for class_name, level in character_data['classes'].items()]
+    )
+    cursor.executemany(
+        "INSERT INTO CharacterSkills (CharacterID, SkillName) VALUES (?, ?)",
+        [(character_id, skill) for skill in character_data.get('skill_proficiencies', [])]
+    )
+    return character_id
 
 def add_character_to_db(user_id, character_data):
+    """Save one character. Returns its new CharacterID, or None if it couldn't be saved."""
+    conn = create_connection()
+    if conn is not None:
+        try:
+            cursor = conn.cursor()
+            character_id = insert_character(cursor, user_id, character_data)
+            conn.commit()
+            return character_id
+        except sqlite3.Error as e:
+            print(f"An error occurred: {e}")
+        finally:
+            conn.close()
+    else:
+        print("Failed to create database connection.")
+    return None
+
+def update_character(character_id, character_data):
+    """Replace a saved character's details, classes, and skills in one transaction. Returns True if it existed."""
     conn = create_connection()
     if conn is not None:
         try:
             cursor = conn.cursor()
             cursor.execute(
-                "INSERT INTO Characters (UserID, CharacterName, Race, Background, AbilityScores, Feats, IsJackOfAllTrades) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                "UPDATE Characters SET CharacterName = ?, Race = ?, Background = ?, AbilityScores = ?, Feats = ?, IsJackOfAllTrades = ? WHERE CharacterID = ?",
                 (
-                    user_id,
                     character_data['name'],
                     character_data['race'],
                     character_data['background'],
                     ','.join(map(str, character_data['ability_scores'])),
                     ','.join(map(str, character_data.get('feats', []))),
-                    int(character_data.get('is_jack_of_all_trades', False))
+                    int(character_data.get('is_jack_of_all_trades', False)),
+                    character_id
                 )
             )
+            if cursor.rowcount == 0:
+                return False
+            subclasses = character_data.get('subclasses', {})
+            cursor.execute("DELETE FROM Classes WHERE CharacterID = ?", (character_id,))
+            cursor.executemany(
+                "INSERT INTO Classes (CharacterID, ClassName, Level, Subclass) VALUES (?, ?, ?, ?)",
+                [(character_id, class_name, level, subclasses.get(class_name)) for class_name, level in character_data['classes'].items()]
+            )
+            cursor.execute("DELETE FROM CharacterSkills WHERE CharacterID = ?", (character_id,))
+            cursor.executemany(
+                "INSERT INTO CharacterSkills (CharacterID, SkillName) VALUES (?, ?)",
+                [(character_id, skill) for skill in character_data.get('skill_proficiencies', [])]
+            )
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            conn.rollback()
+            print(f"An error occurred: {e}")
+            return False
+        finally:
+            conn.close()
+    else:
+        print("Failed to create database connection.")
+        return False
 
-            character_id = cursor.lastrowid
-            for class_name, level in character_data['classes'].items():
-                cursor.execute(
-                    "INSERT INTO Classes (CharacterID, ClassName, Level) VALUES (?, ?, ?)",
-                    (character_id, class_name, level)
-                )
+def add_characters_to_db(user_id, characters):
+    """Insert many characters for one user in a single transaction. Returns how many were saved."""
+    conn = create_connection()
+    if conn is not None:
+        try:
+            cursor = conn.cursor()
+            for character_data in characters:
+                insert_character(cursor, user_id, character_data)
+            conn.commit()
+            return len(characters)
+        except sqlite3.Error as e:
+            conn.rollback()
+            print(f"An error occurred: {e}")
+            return 0
+        finally:
+            conn.close()
+    else:
+        print("Failed to create database connection.")
+        return 0
 
-            for skill in character_data.get('skill_proficiencies', []):
-                cursor.execute(
-                    "INSERT INTO CharacterSkills (CharacterID, SkillName) VALUES (?, ?)",
-                    (character_id, skill)
-                )
+# Dice roll history
+def create_dice_rolls_schema(c):
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS DiceRolls (
+            RollID INTEGER PRIMARY KEY AUTOINCREMENT,
+            UserID INTEGER,
+            RolledAt REAL NOT NULL,
+            Label TEXT,
+            Sides INTEGER NOT NULL,
+            Results TEXT NOT NULL,
+            Modifier INTEGER NOT NULL DEFAULT 0,
+            Total INTEGER NOT NULL,
+            FOREIGN KEY (UserID) REFERENCES Users(UserID)
+        )
+    ''')
 
+def create_dice_rolls_table():
+    """Create the DiceRolls table in the database if it doesn't exist."""
+    run_schema_steps([create_dice_rolls_schema])
+
+def add_rolls_to_db(rolls):
+    """Insert a batch of (user_id, rolled_at, label, sides, results, modifier, total) rolls in one transaction."""
+    conn = create_connection()
+    if conn is not None:
+        try:
+            conn.executemany(
+                "INSERT INTO DiceRolls (UserID, RolledAt, Label, Sides, Results, Modifier, Total) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(user_id, rolled_at, label, sides, ','.join(map(str, results)), modifier, total)
+                 for user_id, rolled_at, label, sides, results, modifier, total in rolls])
             conn.commit()
+            return len(rolls)
         except sqlite3.Error as e:
+            conn.rollback()
             print(f"An error occurred: {e}")
+            return 0
         finally:
             conn.close()
     else:
         print("Failed to create database connection.")
+        return 0
 
 def delete_character_from_db(character_id):
+    delete_characters([character_id])
+
+def delete_characters(character_ids):
+    """Delete characters with their classes and skills in one transaction. Returns how many were deleted."""
     conn = create_connection()
-    if conn is not None:
+    if conn is None:
+        print("Error! Cannot create database connection.")
+        return 0
+    try:
+        c = conn.cursor()
+        deleted = 0
+        character_ids = list(character_ids)
+        # Keep each IN (...) list under SQLite's parameter limit
+        for start in range(0, len(character_ids), 500):
+            batch = character_ids[start:start + 500]
+            placeholders = ", ".join("?" * len(batch))
+            c.execute(f"DELETE FROM Classes WHERE CharacterID IN ({placeholders})", batch)
+            c.execute(f"DELETE FROM CharacterSkills WHERE CharacterID IN ({placeholders})", batch)
+            c.execute(f"DELETE FROM Characters WHERE CharacterID IN ({placeholders})", batch)
+            deleted += c.rowcount
+        conn.commit()
+        return deleted
+    except sqlite3.Error as e:
+        conn.rollback()
+        print(f"An error occurred: {e}")
+        return 0
+    finally:
+        conn.close()
+
+def delete_users(user_ids):
+    """Delete users with any characters and dice rolls they still have, in one transaction. Returns how many users were deleted."""
+    conn = create_connection()
+    if conn is None:
+        print("Error! Cannot create database connection.")
+        return 0
+    try:
         c = conn.cursor()
-        c.execute("DELETE FROM Characters WHERE CharacterID = ?", (character_id,))
+        deleted = 0
+        user_ids = list(user_ids)
+        for start in range(0, len(user_ids), 500):
+            batch = user_ids[start:start + 500]
+            placeholders = ", ".join("?" * len(batch))
+            owned = f"SELECT CharacterID FROM Characters WHERE UserID IN ({placeholders})"
+            c.execute(f"DELETE FROM Classes WHERE CharacterID IN ({owned})", batch)
+            c.execute(f"DELETE FROM CharacterSkills WHERE CharacterID IN ({owned})", batch)
+            c.execute(f"DELETE FROM Characters WHERE UserID IN ({placeholders})", batch)
+            c.execute(f"DELETE FROM DiceRolls WHERE UserID IN ({placeholders})", batch)
+            c.execute(f"DELETE FROM Users WHERE UserID IN ({placeholders})", batch)
+            deleted += c.rowcount
         conn.commit()
+        return deleted
+    except sqlite3.Error as e:
+        conn.rollback()
+        print(f"An error occurred: {e}")
+        return 0
+    finally:
         conn.close()
 
 # admin stuff
@@ -301,3 +610,35 @@ def get_all_users():
     else:
         print("Error creating database connection.")
         return []
+
+def create_lookup_indexes_schema(c):
+    """Index the columns characters, classes, skills, and rolls are looked up by (found by sql_audit.py)."""
+    c.execute("CREATE INDEX IF NOT EXISTS CharactersByUser ON Characters (UserID)")
+    c.execute("CREATE INDEX IF NOT EXISTS ClassesByCharacter ON Classes (CharacterID)")
+    c.execute("CREATE INDEX IF NOT EXISTS CharacterSkillsByCharacter ON CharacterSkills (CharacterID)")
+    c.execute("CREATE INDEX IF NOT EXISTS DiceRollsByUser ON DiceRolls (UserID)")
+
+# Schema versions. Each entry brings the schema from the previous version to the next one; append new steps
+# rather than changing old ones. PRAGMA user_version records the version a database is at.
+SCHEMA_STEPS = [
+    [create_users_schema, create_characters_schema, create_dice_rolls_schema],
+    [create_lookup_indexes_schema],
+]
+SCHEMA_VERSION = len(SCHEMA_STEPS)
+
+def ensure_schema(db_file=None):
+    """Bring the database up to SCHEMA_VERSION over one connection. Returns how many versions were applied."""
+    conn = create_connection(db_file)
+    if conn is None:
+        print("Error! Cannot create database connection.")
+        return 0
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        pending = SCHEMA_STEPS[version:]
+        if pending:
+            run_schema_steps([step for steps in pending for step in steps], conn)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.commit()
+        return len(pending)
+    finally:
+        conn.close()
@@ -0,0 +1,257 @@
+"""
+Module: validator.py
+
+Description:
+    Checks characters against the rules: known race, background, classes, skills, and feats; total level
+    1-20; subclasses only at 3rd level or higher; skill counts and skill lists from the classes' choices (plus
+    the two skills every background grants); feats only up to the Ability Score Improvements reached; ability
+    scores between 1 and 30; and Jack of All Trades matching Bard levels. Rows too malformed to read (ability
+    scores that aren't integers, non-integer levels) are reported as violations rather than stopping the run.
+
+    The rule set is compiled once into lookup tables (sets of valid names, per class ASI counts by level,
+    skill lists, and so on) so checking a character is a handful of set and dict lookups. The whole database
+    is validated by streaming characters straight from the merged cursors in user_database.iter_characters,
+    so memory stays flat however many characters there are.
+
+Dependencies:
+    - collections: For counting violations per rule.
+    - game_logic.py: For races, classes, subclasses, skills, feats, and class tables.
+    - user_database.py: For streaming saved characters.
+
+Usage:
+    validate_character(character_data) returns a list of violation messages (empty when valid).
+    validate_database() yields (character_data, violations) for every invalid character.
+    From the command line:
+        python validator.py [--user <username>]
+"""
+import argparse
+from collections import Counter
+import game_logic as gl
+import user_database as db
+
+MAX_TOTAL_LEVEL = 20
+SUBCLASS_LEVEL = 3
+ABILITY_SCORE_RANGE = range(1, 31)
+BACKGROUND_SKILLS = 2
+JACK_OF_ALL_TRADES_LEVEL = 2
+ASI_FEAT = "Ability Score Increase"
+
+# Skills gained when taking a class as a second or later class
+MULTICLASS_SKILL_CHOICES = {"Bard": 1, "Ranger": 1, "Rogue": 1}
+
+_rule_set = None
+
+class RuleSet:
+    """Lookup tables for every rule, built once from the catalog and class definitions."""
+    def __init__(self):
+        self.races = frozenset(gl.get_race_options())
+        self.backgrounds = frozenset(gl.get_background_options())
+        self.classes = frozenset(gl.get_class_options())
+        self.skills = frozenset(gl.get_skills())
+        self.feats = frozenset(feat for feat in gl.get_feats() if feat)
+        self.subclasses = {class_name: frozenset(options) for class_name, options in gl.get_subclass_options().items()}
+        self.ability_count = len(gl.get_ability_scores())
+
+        # Per implemented class: skill list, number of skill choices, and ASIs reached at each level
+        self.class_skills = {}
+        self.skill_choices = {}
+        self.asi_counts = {}
+        for class_name in self.classes:
+            class_object = gl.get_class_by_name(class_name)
+            if class_object is None:
+                continue
+            self.class_skills[class_name] = frozenset(class_object.skill_options)
+            self.skill_choices[class_name] = class_object.skill_choices
+            asi_levels = class_object.get_asi_levels()
+            self.asi_counts[class_name] = [sum(1 for asi_level in asi_levels if asi_level <= level) for level in range(MAX_TOTAL_LEVEL + 1)]
+
+        self.rules = [
+            ("data", self.check_data),
+            ("identity", self.check_identity),
+            ("levels", self.check_levels),
+            ("subclasses", self.check_subclasses),
+            ("ability_scores", self.check_ability_scores),
+            ("skills", self.check_skills),
+            ("feats", self.check_feats),
+            ("jack_of_all_trades", self.check_jack_of_all_trades),
+        ]
+
+    # Rules. Each one yields a message for every violation it finds.
+    def check_data(self, character_data):
+        """Columns that couldn't be read (from imports or manual DB edits), which the other rules can't check."""
+        yield from character_data.get('load_errors', [])
+        for class_name, level in (character_data.get('classes') or {}).items():
+            if not isinstance(level, int):
+                yield f"Level: {class_name} level {level!r} is not an integer"
+
+    def check_identity(self, character_data):
+        if not (character_data.get('name') or "").strip():
+            yield "Character has no name"
+        if character_data.get('race') not in self.races:
+            yield f"Unknown race: {character_data.get('race')}"
+        if character_data.get('background') and character_data['background'] not in self.backgrounds:
+            yield f"Unknown background: {character_data['background']}"
+
+    def check_levels(self, character_data):
+        classes = character_data.get('classes') or {}
+        if not classes:
+            yield "Character has no classes"
+        levels = []
+        for class_name, level in classes.items():
+            if class_name not in self.classes:
+                yield f"Unknown class: {class_name}"
+            if not isinstance(level, int):
+                continue  # Reported by the data rule
+            levels.append(level)
+            if not 1 <= level <= MAX_TOTAL_LEVEL:
+                yield f"{class_name} level must be between 1 and {MAX_TOTAL_LEVEL}, not {level}"
+        total_level = sum(levels)
+        if total_level > MAX_TOTAL_LEVEL:
+            yield f"Total level {total_level} is above {MAX_TOTAL_LEVEL}"
+
+    def check_subclasses(self, character_data):
+        classes = character_data.get('classes') or {}
+        for class_name, subclass in (character_data.get('subclasses') or {}).items():
+            if class_name not in classes:
+                yield f"Subclass {subclass} is for {class_name}, which the character doesn't have"
+            elif classes[class_name] < SUBCLASS_LEVEL:
+                yield f"Subclass {subclass} needs {class_name} level {SUBCLASS_LEVEL}, not {classes[class_name]}"
+            if class_name in self.subclasses and subclass not in self.subclasses[class_name]:
+                yield f"Unknown {class_name} subclass: {subclass}"
+
+    def check_ability_scores(self, character_data):
+        if character_data.get('ability_scores') is None and character_data.get('load_errors'):
+            return  # Reported by the data rule
+        scores = character_data.get('ability_scores') or []
+        if len(scores) != self.ability_count:
+            yield f"Expected {self.ability_count} ability scores, found {len(scores)}"
+        for ability, score in zip(gl.get_ability_scores(), scores):
+            if score not in ABILITY_SCORE_RANGE:
+                yield f"{ability} score {score} is outside {ABILITY_SCORE_RANGE.start}-{ABILITY_SCORE_RANGE.stop - 1}"
+
+    def check_skills(self, character_data):
+        skills = character_data.get('skill_proficiencies') or []
+        for skill in set(skills):
+            if skill not in self.skills:
+                yield f"Unknown skill: {skill}"
+            if skills.count(skill) > 1:
+                yield f"Skill listed more than once: {skill}"
+
+        class_names = [class_name for class_name in character_data.get('classes') or {} if class_name in self.class_skills]
+        if not class_names:
+            return
+        # The first class gives its full skill choices, later classes only their multiclass skill
+        starting_class = class_names[0]
+        granting_classes = [starting_class] + [class_name for class_name in class_names[1:] if class_name in MULTICLASS_SKILL_CHOICES]
+        allowed_count = (self.skill_choices[starting_class] + BACKGROUND_SKILLS
+                         + sum(MULTICLASS_SKILL_CHOICES[class_name] for class_name in granting_classes[1:]))
+        if len(set(skills)) > allowed_count:
+            yield f"{len(set(skills))} skill proficiencies, at most {allowed_count} allowed"
+        class_skill_list = frozenset().union(*(self.class_skills[class_name] for class_name in granting_classes))
+        off_list = sorted(skill for skill in set(skills) if skill in self.skills and skill not in class_skill_list)
+        if len(off_list) > BACKGROUND_SKILLS:
+            yield f"Skills not offered by the character's classes: {', '.join(off_list)}"
+
+    def check_feats(self, character_data):
+        feats = [feat for feat in character_data.get('feats') or [] if feat]
+        for feat in set(feats):
+            if feat not in self.feats:
+                yield f"Unknown feat: {feat}"
+            elif feat != ASI_FEAT and feats.count(feat) > 1:
+                yield f"Feat taken more than once: {feat}"
+        classes = character_data.get('classes') or {}
+        if all(class_name in self.asi_counts for class_name in classes):
+            asi_count = sum(self.asi_counts[class_name][min(level, MAX_TOTAL_LEVEL)] for class_name, level in classes.items() if level > 0)
+            if len(feats) > asi_count:
+                yield f"{len(feats)} feats, but only {asi_count} Ability Score Improvements reached"
+
+    def check_jack_of_all_trades(self, character_data):
+        has_feature = (character_data.get('classes') or {}).get("Bard", 0) >= JACK_OF_ALL_TRADES_LEVEL
+        if bool(character_data.get('is_jack_of_all_trades')) != has_feature:
+            yield "Jack of All Trades doesn't match the character's Bard level"
+
+    def run_rule(self, name, check, character_data, malformed):
+        """Run one rule. Data too malformed for it is reported instead of aborting the whole validation run."""
+        try:
+            return list(check(character_data))
+        except (TypeError, ValueError, AttributeError) as e:
+            # Nothing more to say when the data rule has already reported what's malformed
+            return [] if malformed else [f"Could not check {name}: {e}"]
+
+    def validate(self, character_data):
+        violations = []
+        malformed = False
+        for name, check in self.rules:
+            messages = self.run_rule(name, check, character_data, malformed)
+            if name == "data" and messages:
+                malformed = True
+            violations.extend(messages)
+        return violations
+
+    def violations_by_rule(self, character_data):
+        violations = {}
+        for name, check in self.rules:
+            messages = self.run_rule(name, check, character_data, "data" in violations)
+            if messages:
+                violations[name] = messages
+        return violations
+
+def get_rule_set():
+    global _rule_set
+    if _rule_set is None:
+        _rule_set = RuleSet()
+    return _rule_set
+
+def validate_character(character_data):
+    """Return a list of rule violations for one character_data dict. An empty list means it's valid."""
+    return get_rule_set().validate(character_data)
+
+def validate_database(user_id=None):
+    """Stream every saved character (or one user's) and yield (character_data, violations) for invalid ones."""
+    rule_set = get_rule_set()
+    for character_data in db.iter_characters(user_id=user_id, strict=False):
+        violations = rule_set.validate(character_data)
+        if violations:
+            yield character_data, violations
+
+def summarize_database(user_id=None, on_invalid=None):
+    """Validate the database and return counts: characters checked, invalid characters, and violations per rule."""
+    rule_set = get_rule_set()
+    checked = 0
+    invalid = 0
+    rule_counts = Counter()
+    for character_data in db.iter_characters(user_id=user_id, strict=False):
+        checked += 1
+        violations = rule_set.violations_by_rule(character_data)
+        if violations:
+            invalid += 1
+            rule_counts.update(violations.keys())
+            if on_invalid:
+                on_invalid(character_data, [message for messages in violations.values() for message in messages])
+    return {"checked": checked, "invalid": invalid, "rules": dict(rule_counts)}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check saved characters against the rules.")
+    parser.add_argument("--user", default=None, help="Only check this user's characters")
+    parser.add_argument("--quiet", action="store_true", help="Only print the summary")
+    args = parser.parse_args(argv)
+
+    user_id = None
+    if args.user:
+        user_data = db.get_user(args.user)
+        if not user_data:
+            parser.error(f"No user found with username: {args.user}")
+        user_id = user_data[0]
+
+    def print_violations(character_data, violations):
+        print(f"Character {character_data['character_id']} ({character_data['name']}):")
+        for violation in violations:
+            print(f"    {violation}")
+
+    summary = summarize_database(user_id, None if args.quiet else print_violations)
+    print(f"Checked {summary['checked']} characters, {summary['invalid']} with rule violations")
+    for rule, count in sorted(summary["rules"].items()):
+        print(f"    {rule}: {count}")
+
+if __name__ == "__main__":
+    main()
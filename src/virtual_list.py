@@ -0,0 +1,157 @@
+"""
+Module: virtual_list.py
+
+Description:
+    A scrolling list that only creates enough row widgets to fill its viewport. Scrolling doesn't move or
+    create widgets; it reconfigures the existing rows to show the items now in view. Items come from a
+    PagedSource, which fetches fixed size pages on demand and keeps the most recent ones, so showing a list
+    takes the same time whether it holds ten items or a hundred thousand.
+
+Dependencies:
+    - customtkinter: For the list frame, rows, and scrollbar.
+    - collections: For the page cache.
+
+Usage:
+    source = PagedSource(lambda: db.count_characters(user_id), lambda offset, limit: db.get_character_name_page(user_id, offset, limit))
+    character_list = VirtualList(parent, source, create_row, update_row, row_height=70)
+    create_row(parent) builds and returns one row frame; update_row(row, item, index) shows an item in it.
+"""
+from collections import OrderedDict
+import tkinter
+import customtkinter
+
+PAGE_SIZE = 50
+MAX_CACHED_PAGES = 8
+ROW_HEIGHT = 40
+# Windows and macOS send <MouseWheel>, X11 sends buttons 4 and 5
+MOUSE_WHEEL_SEQUENCES = ("<MouseWheel>", "<Button-4>", "<Button-5>")
+
+class PagedSource:
+    """Random access to a list that is fetched one page at a time."""
+    def __init__(self, count, fetch_page, page_size=PAGE_SIZE, max_pages=MAX_CACHED_PAGES):
+        self.count = count
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.pages = OrderedDict()
+        self.length = None
+        self.pages_fetched = 0
+
+    def __len__(self):
+        if self.length is None:
+            self.length = self.count()
+        return self.length
+
+    def get(self, index):
+        page_number, position = divmod(index, self.page_size)
+        page = self.pages.get(page_number)
+        if page is None:
+            page = self.fetch_page(page_number * self.page_size, self.page_size)
+            self.pages_fetched += 1
+            self.pages[page_number] = page
+            if len(self.pages) > self.max_pages:
+                self.pages.popitem(last=False)
+        else:
+            self.pages.move_to_end(page_number)
+        return page[position] if position < len(page) else None
+
+    def invalidate(self):
+        """Forget the cached count and pages, e.g. after items were added or deleted."""
+        self.pages.clear()
+        self.length = None
+
+class VirtualList(customtkinter.CTkFrame):
+    def __init__(self, master, source, create_row, update_row, row_height=ROW_HEIGHT, **kwargs):
+        super().__init__(master, **kwargs)
+        self.source = source
+        self.create_row = create_row
+        self.update_row = update_row
+        self.row_height = row_height
+        self.rows = []
+        self.visible_rows = 1
+        self.first = 0
+
+        self.grid_columnconfigure(0, weight=1)
+        self.rows_frame = customtkinter.CTkFrame(master=self, fg_color="transparent")
+        self.rows_frame.grid(row=0, column=0, sticky="nsew")
+        self.rows_frame.grid_columnconfigure(0, weight=1)
+        self.scrollbar = customtkinter.CTkScrollbar(master=self, command=self.on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.grid_rowconfigure(0, weight=1)
+
+        self.bind("<Configure>", self.on_resize)
+        self.bind_mouse_wheel(self)
+
+    def set_source(self, source):
+        self.source = source
+        self.first = 0
+        self.render()
+
+    def refresh(self):
+        """Re-read the source (after it was invalidated) and redraw, keeping the scroll position if possible."""
+        self.render()
+
+    def on_resize(self, event):
+        visible_rows = max(1, event.height // self.row_height + 1)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.render()
+
+    def on_scrollbar(self, action, amount, unit=None):
+        length = len(self.source)
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * length))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll_to(self.first + int(amount) * step)
+
+    def bind_mouse_wheel(self, widget):
+        """
+        Scroll the list with the wheel while the pointer is over widget or any widget inside it. Bound on the
+        widgets themselves, not with bind_all, so the app-wide wheel bindings of scrollable frames are kept.
+        """
+        for sequence in MOUSE_WHEEL_SEQUENCES:
+            # tkinter's bind, since customtkinter widgets redirect bind to their canvas
+            tkinter.Misc.bind(widget, sequence, self.on_mouse_wheel, add="+")
+        for child in widget.winfo_children():
+            self.bind_mouse_wheel(child)
+
+    def on_mouse_wheel(self, event):
+        if getattr(event, "num", None) == 4:
+            direction = -1
+        elif getattr(event, "num", None) == 5:
+            direction = 1
+        else:
+            direction = -1 if event.delta > 0 else 1
+        self.scroll_to(self.first + direction * 3)
+        return "break"
+
+    def scroll_to(self, first):
+        first = max(0, min(first, len(self.source) - self.visible_rows + 1))
+        if first != self.first:
+            self.first = first
+            self.render()
+
+    def render(self):
+        """Show the items from self.first on, creating rows only when the viewport has grown."""
+        length = len(self.source)
+        self.first = max(0, min(self.first, length - self.visible_rows + 1))
+        while len(self.rows) < min(self.visible_rows, length):
+            row = self.create_row(self.rows_frame)
+            row.grid(row=len(self.rows), column=0, sticky="ew")
+            self.bind_mouse_wheel(row)
+            self.rows.append(row)
+
+        for offset, row in enumerate(self.rows):
+            index = self.first + offset
+            item = self.source.get(index) if index < length and offset < self.visible_rows else None
+            if item is None:
+                row.grid_remove()
+            else:
+                self.update_row(row, item, index)
+                row.grid()
+
+        if length:
+            self.scrollbar.set(self.first / length, min(1.0, (self.first + self.visible_rows) / length))
+        else:
+            self.scrollbar.set(0.0, 1.0)